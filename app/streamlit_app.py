@@ -1,7 +1,10 @@
+import os
 import sys
+import time
 from pathlib import Path
 
-positions = None
+# início deste rerun (tempo até à 1.ª página / 1.º gráfico)
+SCRIPT_START = time.perf_counter()
 
 
 # --------------------------------------------------
@@ -11,30 +14,15 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
 import streamlit as st
-import pandas as pd
 
-@st.cache_data
-def infer_game_context_cached(X):
-    return infer_game_context(X)
+# Só módulos leves antes das páginas iniciais: pandas, KPIs e gráficos
+# (~1.5 s de imports) são importados no dashboard ou, antes disso, pela
+# thread de aquecimento (src/warmup.py)
+from src import instrumentation
+from src.instrumentation import mark_cache, stage
+from src.warmup import Warmup, preload
 
-from src.data_loading import load_datasets
-from src.preprocessing import infer_game_context
 
-from src.kpis import (
-    pi1_positional_distribution,
-    pi2_distance_travelled,
-    pi3_threat_frequency_by_zone,
-    pi4_reaction_intensity,
-    pi5_threat_progression_channels
-)
-
-from src.visualizations import (
-    plot_pi1_positional_distribution_plotly,
-    plot_pi2_distance_travelled,
-    plot_pi3_threat_frequency_interactive,
-    plot_pi4_reaction_intensity,
-    plot_pi5_threat_progression_channels
-)
 def apply_abc_braga_theme():
     st.markdown(
         """
@@ -113,6 +101,273 @@ if "authenticated" not in st.session_state:
     st.session_state.authenticated = False
 
 
+def log_startup(name, start):
+    """Regista uma vez por sessão o tempo desde `start` até `name`."""
+
+    logged = st.session_state.setdefault("startup", {})
+    if name not in logged:
+        logged[name] = instrumentation.log_elapsed(name, start)["wall_s"]
+
+
+# --------------------------------------------------
+# DADOS E KPIs — PARTILHADOS PELO DASHBOARD E PELO AQUECIMENTO
+# --------------------------------------------------
+FRAME_STEPS = [1, 5, 10, 20, 50]
+DEFAULT_STEP = 5
+DEFAULT_CONTEXT = "Jogo"
+
+
+# cache_resource: o mesmo DataFrame é partilhado entre reruns e
+# sessões (st.cache_data copiá-lo-ia via pickle a cada rerun)
+@st.cache_resource(show_spinner=False)
+def load_data():
+    from src.data_loading import load_datasets
+
+    # Apenas X_train e apenas as colunas usadas pelos PI 1–5
+    data = load_datasets(
+        lazy=True,
+        kpis=["pi1", "pi2", "pi3", "pi4", "pi5"]
+    )
+    return data["X_train"]
+
+
+@st.cache_resource(show_spinner=False)
+def kpi_cache():
+    from src.cache import LRUCache
+
+    # LRU partilhada, limitada a 256 MB de resultados
+    return LRUCache(max_bytes=256 * 2**20)
+
+
+@st.cache_resource(show_spinner=False)
+def kpi_store():
+    from src.kpi_store import KPIStore
+
+    # Resultados em disco (data/processed/kpis): sobrevivem a reinícios
+    # e deploys, partilhados entre processos e jobs batch; até 2 GB.
+    # Sem compressão: a leitura fica ~5x mais rápida do que recalcular
+    # (benchmarks/bench_kpi_store.py), com ~1/3 mais disco
+    return KPIStore(max_bytes=2 * 2**30, compress=False)
+
+
+@st.cache_data(show_spinner=False)
+def dataset_source():
+    from src.data_loading import (
+        DATA_RAW_PATH,
+        DATASET_FILES,
+        source_fingerprint,
+    )
+
+    return source_fingerprint(DATA_RAW_PATH / DATASET_FILES["X_train"])
+
+
+@st.cache_resource(show_spinner=False)
+def kpi_cube(source, step):
+    from src.kpi_cube import open_kpi_cube
+
+    # Cubo de KPIs construído offline (python -m src.kpi_cube) ou None;
+    # `source` (hash do CSV) reabre-o quando os dados mudam
+    return open_kpi_cube("X_train", step)
+
+
+@st.cache_resource(show_spinner=False)
+def court_grid(_X, source):
+    from src.heatmap import grid_from_data
+    from src.kpis import column_array
+
+    # Arestas do PI 3 fixas para o dataset (as do cubo e do índice de
+    # intervalos): o heatmap e as células do drill-down não mudam com o
+    # caminho que responde à seleção
+    return grid_from_data(
+        column_array(_X, "#ball_x"), column_array(_X, "#ball_y")
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def load_label_index():
+    from src.data_loading import load_datasets
+    from src.labels import LabelIndex
+
+    # labels de y_train alinhadas aos frames de X_train uma única vez:
+    # (índice, None), ou (None, motivo) sem ficheiro de labels ou com
+    # um ficheiro que não se alinha com X_train — o filtro fica oculto
+    # em vez de a página falhar (exceções não ficam em cache)
+    try:
+        y = load_datasets(lazy=True)["y_train"]
+    except FileNotFoundError:
+        return None, None
+
+    try:
+        return LabelIndex.build(y, n_frames=len(load_data())), None
+    except ValueError as exc:
+        return None, f"Labels de y_train ignoradas: {exc}"
+
+
+def label_index():
+    """LabelIndex de y_train, ou None (ver load_label_index)."""
+    return load_label_index()[0]
+
+
+def label_frames(fingerprint, X):
+    """Frames da seleção com o filtro por label, já no contexto."""
+
+    frames = label_index().select(
+        fingerprint.label,
+        before=fingerprint.before,
+        start=fingerprint.frame_start,
+        end=fingerprint.frame_end,
+        step=fingerprint.step
+    )
+
+    # mesmo critério de infer_game_context: sem coluna, tudo é 'Jogo'
+    if "contexto" in X.columns:
+        contexts = X["contexto"].to_numpy()
+        return frames[contexts[frames] == fingerprint.context]
+
+    return frames if fingerprint.context == "Jogo" else frames[:0]
+
+
+def selection_frames(fingerprint, X):
+    """
+    Posições de X na seleção (intervalo, step, contexto, label): um
+    slice quando não há filtro, senão um array de índices. Os KPIs
+    leem só essas linhas de cada coluna, sem copiar X.
+    """
+
+    import numpy as np
+
+    if fingerprint.label is not None:
+        return label_frames(fingerprint, X)
+
+    start, end, step = (
+        fingerprint.frame_start, fingerprint.frame_end, fingerprint.step
+    )
+
+    # mesmo critério de infer_game_context: sem coluna, tudo é 'Jogo'
+    if "contexto" in X.columns:
+        contexts = X["contexto"].to_numpy()[start:end:step]
+        positions = np.flatnonzero(contexts == fingerprint.context)
+        return (positions * step + start).astype(np.int32)
+
+    if fingerprint.context == "Jogo":
+        return slice(start, end, step)
+
+    return np.zeros(0, dtype=np.int32)
+
+
+def compute_kpis(fingerprint, X):
+    from src.kpis import compute_all_kpis
+    from src.labels import gap_starts
+
+    frames = selection_frames(fingerprint, X)
+    grid = court_grid(X, fingerprint.source)
+
+    # filtro por label: só as linhas selecionadas são lidas de cada
+    # coluna (fancy indexing), sem merge com y nem cópia de X
+    if fingerprint.label is not None:
+        return compute_all_kpis(
+            X, grid=grid, frames=frames,
+            segment_starts=gap_starts(frames, fingerprint.step)
+        )
+
+    # PI 1–5 numa só passagem; os resultados dos PI 1, 2 e 4 guardam
+    # só o resumo e referem as colunas de X (sem cópia da seleção)
+    return compute_all_kpis(X, grid=grid, frames=frames)
+
+
+def compute_geometry(fingerprint, X):
+    from src.geometry import geometry_summary, goalkeeper_geometry
+
+    # métricas GR–bola por frame, só o resumo fica em cache
+    return geometry_summary(
+        goalkeeper_geometry(X, frames=selection_frames(fingerprint, X))
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def build_range_index(_X, n_rows):
+    from src.range_index import KPIRangeIndex
+
+    # Agregados pré-calculados: o slider de frames deixa de
+    # recalcular os KPIs a partir das linhas
+    return KPIRangeIndex(_X, grid=court_grid(_X, dataset_source()))
+
+
+def selection_fingerprint(
+    frame_start, frame_end, step, data_context, label=None, before=0
+):
+    from src.cache import DatasetFingerprint
+
+    # Chave barata: identidade da seleção, não o conteúdo do DataFrame
+    return DatasetFingerprint(
+        dataset_source(), frame_start, frame_end, step, data_context,
+        label, before
+    )
+
+
+def selection_kpis(
+    X, frame_start, frame_end, step, data_context, label=None, before=0
+):
+    """(fingerprint, KPIs) da seleção da sidebar."""
+
+    fingerprint = selection_fingerprint(
+        frame_start, frame_end, step, data_context, label, before
+    )
+
+    # Com o cubo materializado, qualquer intervalo e contexto é
+    # respondido somando células (só as pontas tocam nas linhas)
+    if label is None and frame_start % step == 0:
+        cube = kpi_cube(dataset_source(), step)
+        if cube is not None and cube.grid == court_grid(X, dataset_source()):
+            with stage("dashboard.kpi_cube"):
+                kpis = cube.query(frame_start, frame_end, data_context, X=X)
+            return fingerprint, kpis
+
+    # Sem coluna 'contexto' todo o dataset é 'Jogo' (infer_game_context):
+    # o intervalo pode ser respondido diretamente pelo índice
+    if (
+        label is None
+        and "contexto" not in X.columns
+        and data_context == "Jogo"
+    ):
+        range_index = build_range_index(X, len(X))
+        return fingerprint, range_index.query(frame_start, frame_end, step)
+
+    def stored_kpis():
+        # 2.º nível (disco): evita recalcular após um reinício
+        with stage("dashboard.kpi_store"):
+            mark_cache(fingerprint in kpi_store())
+            return kpi_store().get_or_compute(
+                fingerprint, lambda: compute_kpis(fingerprint, X)
+            )
+
+    with stage("dashboard.kpis"):
+        mark_cache(fingerprint in kpi_cache())
+        kpis = kpi_cache().get_or_compute(fingerprint, stored_kpis)
+
+    return fingerprint, kpis
+
+
+def default_kpis():
+    """KPIs da seleção por defeito (todos os frames, passo 5, Jogo)."""
+
+    X = load_data()
+    return selection_kpis(X, 0, len(X), DEFAULT_STEP, DEFAULT_CONTEXT)
+
+
+@st.cache_resource(show_spinner=False)
+def warmup():
+    # uma thread por processo; DG_WARMUP=0 desativa (ex.: pouca memória)
+    if os.environ.get("DG_WARMUP") == "0":
+        return Warmup([])
+
+    return Warmup([
+        ("imports", preload),
+        ("data", load_data),
+        ("kpis", default_kpis),
+    ]).start()
+
+
 # ==================================================
 # PÁGINA 1 — BOAS-VINDAS
 # ==================================================
@@ -153,6 +408,11 @@ if st.session_state.page == "welcome":
 
     if st.button(" Continuar"):
         st.session_state.page = "persona"
+
+    log_startup("startup.first_page", SCRIPT_START)
+
+    # página já enviada: dados e KPIs carregam enquanto o utilizador lê
+    warmup()
     st.stop()
 
 
@@ -184,6 +444,7 @@ elif st.session_state.page == "persona":
     if st.button(" Continuar para Login"):
         st.session_state.persona = persona
         st.session_state.page = "login"
+    warmup()
     st.stop()
 
 
@@ -204,6 +465,7 @@ elif st.session_state.page == "login" and not st.session_state.authenticated:
             st.rerun()
         else:
             st.error("Credenciais inválidas.")
+    warmup()
     st.stop()
 
 
@@ -218,13 +480,24 @@ elif st.session_state.page == "dashboard" and st.session_state.authenticated:
         st.warning("Persona não definida. Volte à seleção de persona.")
         st.stop()
 
+    st.session_state.setdefault("dashboard_start", SCRIPT_START)
+
+    from src.figure_cache import FigureCache
+    from src.visualizations import (
+        plot_pi1_positional_distribution,
+        plot_pi2_distance_travelled,
+        plot_pi3_threat_frequency_interactive,
+        plot_pi4_reaction_intensity,
+        plot_pi5_threat_progression_channels
+    )
+
     # --------------------------------------------------
     # CARREGAMENTO DE DADOS
     # --------------------------------------------------
-    @st.cache_data
-    def load_data():
-        data = load_datasets()
-        return data["X_train"]
+    # Normalmente já feito pelo aquecimento; se ainda estiver a correr,
+    # esperar em vez de repetir o mesmo trabalho
+    with stage("dashboard.warmup_wait"):
+        warmup().wait()
 
     X_train = load_data()
 
@@ -241,6 +514,13 @@ elif st.session_state.page == "dashboard" and st.session_state.authenticated:
         0.5, 1.5, 1.0, 0.1
     )
 
+    # Séries temporais (PI 2 / PI 4) em Plotly WebGL em vez de imagem
+    interactive_series = st.sidebar.toggle(
+        "Séries interativas (WebGL)",
+        value=False
+    )
+    series_renderer = "plotly" if interactive_series else "matplotlib"
+
     # Intervalo temporal
     frame_start, frame_end = st.sidebar.slider(
         "Selecionar frames",
@@ -249,39 +529,195 @@ elif st.session_state.page == "dashboard" and st.session_state.authenticated:
 
     step = st.sidebar.selectbox(
         "Subamostragem (frames)",
-        [1, 5, 10, 20, 50],
-        index=1
+        FRAME_STEPS,
+        index=FRAME_STEPS.index(DEFAULT_STEP)
     )
 
     context = st.sidebar.selectbox(
         "Contexto de análise",
-        ["Pós-Jogo", "Treino"]
+        ["Pós-Jogo", "Treino", "Ao Vivo"]
     )
 
     data_context = "Jogo" if context == "Pós-Jogo" else context
 
-    X_filtered = X_train.iloc[frame_start:frame_end:step]
-    X_contextual = infer_game_context_cached(X_filtered)
-    X_persona = (
-    X_contextual[X_contextual["contexto"] == data_context]
-    if "contexto" in X_contextual.columns
-    else X_contextual
-)
+    # --------------------------------------------------
+    # MODO AO VIVO — SNAPSHOT DO FEED, SEM RECÁLCULO
+    # --------------------------------------------------
+    if context == "Ao Vivo":
+        from src.live import LiveMatch
+
+        feed_source = st.sidebar.text_input(
+            "Feed de tracking (CSV ou host:porta)",
+            os.environ.get("DG_LIVE_FEED", "data/live/feed.csv")
+        )
+
+        @st.cache_resource
+        def live_match(source):
+            # uma thread de ingestão por feed, partilhada entre sessões
+            if ":" not in source and not Path(source).is_absolute():
+                source = str(PROJECT_ROOT / source)
+            return LiveMatch(source).start()
+
+        live = live_match(feed_source)
+
+        @st.fragment(run_every=1.0)
+        def live_panel():
+            # thread terminada (ligação recusada ou fechada): volta a
+            # ligar ao feed a cada atualização do painel
+            if not live.running:
+                live.restart()
+
+            snapshot = live.snapshot()
+
+            if live.error is not None:
+                st.error(f"Feed interrompido: {live.error}")
+            if snapshot["frames"] == 0:
+                st.info(f"À espera de frames em {feed_source}…")
+                return
+
+            mean_x, mean_y = snapshot["pi1"]["mean_position"]
+            pi4 = snapshot["pi4"]
+
+            cols = st.columns(4)
+            cols[0].metric("Frames", f"{snapshot['frames']:,}")
+            cols[1].metric("Posição média", f"({mean_x:.2f}, {mean_y:.2f})")
+            cols[2].metric(
+                "Distância", f"{snapshot['pi2']['total_distance']:.1f}"
+            )
+            cols[3].metric(
+                "Velocidade média / máx.",
+                f"{pi4['mean_speed']:.2f} / {pi4['max_speed']:.2f}"
+            )
+
+            st.plotly_chart(
+                plot_pi4_reaction_intensity(
+                    pi4["speed_series"],
+                    pi4["mean_speed"],
+                    pi4["max_speed"],
+                    renderer="plotly"
+                ),
+                width="stretch"
+            )
+            st.plotly_chart(
+                plot_pi5_threat_progression_channels(snapshot["pi5"]),
+                width="stretch"
+            )
+
+        st.header("🔴 Jogo ao Vivo")
+        st.caption("PI 1, 2, 4 e 5 atualizados a cada segundo")
+        live_panel()
+        st.stop()
+
+    # --------------------------------------------------
+    # FILTRO POR LABEL (handball_y)
+    # --------------------------------------------------
+    label, before = None, 0
+
+    labels_problem = load_label_index()[1]
+    if labels_problem is not None:
+        st.sidebar.warning(labels_problem)
 
+    if label_index() is not None:
+        choice = st.sidebar.selectbox(
+            "Label (handball_y)",
+            ["Todas"] + label_index().labels
+        )
+        if choice != "Todas":
+            label = choice
+            before = st.sidebar.number_input(
+                "Frames antes de cada label", 0, 10_000, 0, step=25
+            )
 
     # --------------------------------------------------
     # KPIs
     # --------------------------------------------------
-    @st.cache_data
-    def compute_kpis(X):
-        return {
-            "pi1": pi1_positional_distribution(X),
-            "pi2": pi2_distance_travelled(X),
-            "pi3": pi3_threat_frequency_by_zone(X),
-            "pi4": pi4_reaction_intensity(X),
-        }
+    if label is not None:
+        selected = label_frames(
+            selection_fingerprint(
+                frame_start, frame_end, step, data_context, label, before
+            ),
+            X_train
+        )
+        if len(selected) == 0:
+            st.warning(f"Sem frames com a label '{label}' na seleção.")
+            st.stop()
+
+    fingerprint, kpis = selection_kpis(
+        X_train, frame_start, frame_end, step, data_context, label, before
+    )
+
+    # --------------------------------------------------
+    # FIGURAS (SERIALIZADAS EM CACHE)
+    # --------------------------------------------------
+    @st.cache_resource
+    def figure_cache():
+        # PNG / Plotly JSON por (KPIs, figura, escala), até 64 MB
+        return FigureCache(max_bytes=64 * 2**20)
+
+    def show_figure(figure, build, interactive=False, **chart_kwargs):
+        """
+        Mostra `figure` a partir da cache; build() corre só se faltar.
+        chart_kwargs (ex.: on_select) seguem para st.plotly_chart, cujo
+        resultado é devolvido.
+        """
+
+        cache = figure_cache()
+        kind = "plotly" if interactive else "png"
+        event = None
+
+        with stage(f"dashboard.figure.{figure}"):
+            key = FigureCache.key(fingerprint, figure, fig_scale, kind)
+            mark_cache(key in cache)
+
+            if interactive:
+                spec = cache.plotly(fingerprint, figure, fig_scale, build)
+                event = st.plotly_chart(spec, width="stretch", **chart_kwargs)
+            else:
+                st.image(cache.png(fingerprint, figure, fig_scale, build))
+
+        log_startup("startup.first_chart", st.session_state.dashboard_start)
+        return event
+
+    @st.cache_resource(show_spinner=False)
+    def zone_index(obj):
+        from src.zone_index import open_zone_index
+
+        # frames por zona (CSR), gravado ao lado da cache colunar
+        return open_zone_index("X_train", obj)
 
-    kpis = compute_kpis(X_persona)
+    def show_zone_frames(pi3, ix, iy):
+        """Frames e sequências da bola na célula (ix, iy) do PI 3."""
+
+        import numpy as np
+
+        from src.heatmap import CourtGrid
+        from src.zone_index import frame_sequences
+
+        grid = CourtGrid.from_edges(pi3["x_edges"], pi3["y_edges"])
+
+        with stage("dashboard.zone_frames") as record:
+            frames = zone_index("ball").heatmap_cell(
+                grid, ix, iy, frame_start, frame_end
+            )
+            # mesma seleção dos KPIs: subamostragem e contexto
+            frames = frames[(frames - frame_start) % step == 0]
+            if "contexto" in X_train.columns:
+                contexts = X_train["contexto"].to_numpy()
+                frames = frames[contexts[frames] == data_context]
+            if label is not None:
+                frames = frames[np.isin(frames, selected)]
+            record["rows"] = len(frames)
+
+        sequences = frame_sequences(frames, max_gap=step)
+
+        st.markdown(
+            f"**Zona ({ix}, {iy})** — {len(frames):,} frames em "
+            f"{len(sequences):,} sequências"
+        )
+        st.dataframe(
+            sequences.sort_values("n_frames", ascending=False).head(100),
+            hide_index=True
+        )
 
   
 # ==================================================
@@ -302,15 +738,38 @@ if st.session_state.persona == "Treinador Principal":
     )
 
     if selected_pi == "PI 3 — Origem Espacial das Ameaças":
-        heatmap = kpis["pi3"]["heatmap"]
-        fig = plot_pi3_threat_frequency_interactive(heatmap)
-        fig.update_layout(height=int(500 * fig_scale))
-        st.plotly_chart(fig, width="stretch")
+
+        def build_pi3():
+            fig = plot_pi3_threat_frequency_interactive(kpis["pi3"]["heatmap"])
+            fig.update_layout(height=int(500 * fig_scale))
+            return fig
+
+        event = show_figure(
+            "pi3", build_pi3, interactive=True,
+            key="pi3_chart", on_select="rerun", selection_mode="points"
+        )
+
+        # drill-down: linhas do heatmap (Y{i}) são as zonas em x do
+        # PI 3 e colunas (X{j}) as zonas em y
+        points = event["selection"]["points"] if event else []
+        if points:
+            show_zone_frames(
+                kpis["pi3"],
+                int(str(points[0]["y"])[1:]),
+                int(str(points[0]["x"])[1:])
+            )
+        else:
+            st.caption(
+                "Clique numa célula para ver os frames e as sequências "
+                "da bola nessa zona."
+            )
 
     elif selected_pi == "PI 5 — Canal de Progressão das Ameaças":
-        pi5 = pi5_threat_progression_channels(X_persona)
-        fig = plot_pi5_threat_progression_channels(pi5)
-        st.plotly_chart(fig, width="stretch")
+        show_figure(
+            "pi5",
+            lambda: plot_pi5_threat_progression_channels(kpis["pi5"]),
+            interactive=True
+        )
 
 
 # ==================================================
@@ -326,7 +785,8 @@ elif st.session_state.persona == "Treinador de Guarda-Redes":
         [
             "PI 1 — Distribuição Posicional",
             "PI 2 — Distância Percorrida",
-            "PI 4 — Intensidade de Reação"
+            "PI 4 — Intensidade de Reação",
+            "Geometria GR–Bola (bissetriz)"
         ],
         key="pi_gr"
     )
@@ -338,46 +798,148 @@ elif st.session_state.persona == "Treinador de Guarda-Redes":
 
         pi1 = kpis["pi1"]
 
-        if pi1["positions"].empty:
+        if pi1.n_frames == 0:
             st.warning("Dados insuficientes para análise posicional.")
             st.stop()
 
-        fig = plot_pi1_positional_distribution_plotly(
-              positions,
-              kpis["pi1"]["mean_position"],
-              kpis["pi1"]["tactical_reading"]
-)
+        def build_pi1():
+            # Grelha de densidade memorizada no resultado (None: a
+            # figura recorre ao scatter de uma amostra das posições)
+            return plot_pi1_positional_distribution(
+                pi1.sample(),
+                pi1["mean_position"],
+                pi1.density()
+            )
 
-        st.pyplot(fig)
+        show_figure("pi1", build_pi1)
 
     # --------------------------------------------------
     # PI 2 — Distância Percorrida
     # --------------------------------------------------
     elif selected_pi == "PI 2 — Distância Percorrida":
 
-        distances = kpis["pi2"]["instant_distances"]
+        pi2 = kpis["pi2"]
 
-        if distances is None or len(distances) == 0:
+        if pi2.n_frames < 2:
             st.warning("Sem dados de deslocamento.")
             st.stop()
 
-        fig = plot_pi2_distance_travelled(distances)
-        st.pyplot(fig)
+        # série reduzida a ~2000 pontos (LTTB), memorizada no resultado
+        show_figure(
+            f"pi2_{series_renderer}",
+            lambda: plot_pi2_distance_travelled(
+                None, renderer=series_renderer, points=pi2.decimated()
+            ),
+            interactive=interactive_series
+        )
 
     # --------------------------------------------------
     # PI 4 — Intensidade de Reação
     # --------------------------------------------------
     elif selected_pi == "PI 4 — Intensidade de Reação":
 
-        speeds = kpis["pi4"]["speed_series"]
+        pi4 = kpis["pi4"]
 
-        if speeds is None or len(speeds) == 0:
+        if pi4.n_frames == 0:
             st.warning("Sem dados de velocidade.")
             st.stop()
 
-        fig = plot_pi4_reaction_intensity(
-            speeds,
-            pi1["mean_speed"],
-            pi1["max_speed"]
+        # envelope mín/máx + LTTB: os picos de velocidade mantêm-se
+        show_figure(
+            f"pi4_{series_renderer}",
+            lambda: plot_pi4_reaction_intensity(
+                None,
+                pi4["mean_speed"],
+                pi4["max_speed"],
+                renderer=series_renderer,
+                points=pi4.decimated(),
+                envelope=pi4.envelope()
+            ),
+            interactive=interactive_series
+        )
+
+    # --------------------------------------------------
+    # Geometria GR–Bola (bissetriz)
+    # --------------------------------------------------
+    elif selected_pi == "Geometria GR–Bola (bissetriz)":
+        import pandas as pd
+
+        with stage("dashboard.geometry"):
+            key = ("geometry", fingerprint)
+            mark_cache(key in kpi_cache())
+            geometry = kpi_cache().get_or_compute(
+                key, lambda: compute_geometry(fingerprint, X_train)
+            )
+
+        if geometry["valid_frames"] == 0:
+            st.warning("Sem frames com guarda-redes e bola.")
+            st.stop()
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric(
+            "Na bissetriz (±0.5 m)", f"{geometry['on_bisector_pct']:.1f} %"
+        )
+        col2.metric(
+            "Desvio médio", f"{geometry['mean_abs_deviation']:.2f} m"
+        )
+        col3.metric(
+            "Cobertura 1.º poste",
+            f"{geometry['mean_near_post_coverage'] * 100:.0f} %"
+        )
+        col4.metric(
+            "Cobertura 2.º poste",
+            f"{geometry['mean_far_post_coverage'] * 100:.0f} %"
+        )
+
+        st.caption(
+            f"Distância média à bola: {geometry['mean_distance']:.1f} m · "
+            f"ângulo de remate médio: "
+            f"{geometry['mean_shooting_angle']:.1f}° · desvio < 0 = "
+            f"lado do poste mais próximo da bola"
+        )
+
+        edges = geometry["deviation_edges"]
+        labels = (
+            [f"< {edges[0]:.1f}"]
+            + [f"{a:.1f} a {b:.1f}" for a, b in zip(edges[:-1], edges[1:])]
+            + [f"> {edges[-1]:.1f}"]
+        )
+        st.bar_chart(
+            pd.DataFrame(
+                {"frames": geometry["deviation_histogram"]},
+                index=pd.Index(labels, name="desvio à bissetriz (m)")
+            ),
+            sort=False
+        )
+
+
+# ==================================================
+# PAINEL OCULTO — DESEMPENHO (?debug=1)
+# ==================================================
+if (
+    st.session_state.authenticated
+    and st.query_params.get("debug") == "1"
+):
+    import pandas as pd
+
+    with st.sidebar.expander("⏱️ Desempenho", expanded=False):
+        startup = st.session_state.get("startup", {})
+        st.caption(
+            "Arranque: "
+            + " · ".join(f"{k} {v:.2f} s" for k, v in startup.items())
+        )
+
+        st.caption("Tempo, linhas, memória e cache por etapa")
+        st.dataframe(instrumentation.summary())
+
+        st.caption("Últimas etapas")
+        st.dataframe(pd.DataFrame(instrumentation.records()[-50:][::-1]))
+
+        st.caption(
+            f"Cache de KPIs: {kpi_cache().hits} hits / "
+            f"{kpi_cache().misses} misses · "
+            f"Disco: {kpi_store().hits} hits / "
+            f"{kpi_store().misses} misses · "
+            f"Figuras: {figure_cache().hits} hits / "
+            f"{figure_cache().misses} misses"
         )
-        st.pyplot(fig)
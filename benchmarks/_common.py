@@ -0,0 +1,39 @@
+# =====================================================
+# UTILITÁRIOS COMUNS DOS BENCHMARKS
+# =====================================================
+
+import resource
+import sys
+import time
+from pathlib import Path
+
+# permitir "python benchmarks/bench_x.py" a partir da raiz do projeto
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# gerador determinístico com movimento limitado ao campo (src/synthetic.py)
+from src.synthetic import synthetic_tracking  # noqa: E402
+
+
+def peak_rss_mb() -> float:
+    """Pico de memória residente do processo atual (MB, Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def current_rss_mb() -> float:
+    """Memória residente atual do processo (MB, Linux)."""
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * resource.getpagesize() / 1e6
+
+
+def timeit(fn, repeat: int = 3) -> float:
+    """Melhor tempo (s) de `repeat` execuções de fn()."""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    return best
@@ -0,0 +1,48 @@
+# =====================================================
+# BENCHMARK — BATCH MULTI-JOGO (ESCALABILIDADE COM CORES)
+# =====================================================
+# Uso: python benchmarks/bench_batch.py [n_jogos] [frames_por_jogo]
+#
+# O speedup ideal é linear até min(n_jogos, nº de cores).
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import synthetic_tracking
+
+from src.batch import run_batch
+
+
+def main(n_matches: int, n_frames: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(n_matches):
+            path = Path(tmp) / f"jogo_{i:03d}.csv"
+            synthetic_tracking(n_frames, seed=i).to_csv(path, index=False)
+            paths.append(path)
+
+        cores = os.cpu_count() or 1
+        print(f"{n_matches} jogos × {n_frames} frames, {cores} cores\n")
+        print(f"{'workers':>8}{'tempo':>12}{'speedup':>10}")
+
+        baseline = None
+        for workers in sorted({1, 2, 4, 8, cores}):
+            if workers > cores:
+                continue
+
+            start = time.perf_counter()
+            run_batch(paths, workers=workers)
+            elapsed = time.perf_counter() - start
+
+            baseline = baseline or elapsed
+            print(f"{workers:>8}{elapsed:>10.2f} s{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 16,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    )
@@ -0,0 +1,72 @@
+# =====================================================
+# BENCHMARK — COLUMN STORE (MEMMAP) vs DATAFRAME
+# =====================================================
+# Uso: python benchmarks/bench_column_store.py [n_frames]
+#
+# Mede o tempo de abertura e o crescimento de RSS ao abrir o dataset
+# e ao calcular PI 2 / PI 4 do guarda-redes (#x0, #y0, #vx0, #vy0).
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import PROJECT_ROOT, current_rss_mb, synthetic_tracking
+
+from src.column_store import open_column_store
+from src.data_loading import DATASET_FILES, read_csv_cached
+from src.kpis import pi2_distance_travelled, pi4_reaction_intensity
+
+
+def _run_mode(mode: str, raw_path: Path) -> None:
+    cache_root = raw_path / "cache"
+    rss_before = current_rss_mb()
+
+    start = time.perf_counter()
+    if mode == "dataframe":
+        X = read_csv_cached(raw_path / DATASET_FILES["X_train"], cache_root)
+    else:
+        X = open_column_store("X_train", raw_path, cache_root)
+    opened = time.perf_counter() - start
+    rss_open = current_rss_mb()
+
+    start = time.perf_counter()
+    pi2_distance_travelled(X)
+    pi4_reaction_intensity(X)
+    computed = time.perf_counter() - start
+
+    print(
+        f"{mode:<12}{opened:>10.3f} s{rss_open - rss_before:>10.1f} MB"
+        f"{computed:>10.3f} s{current_rss_mb() - rss_before:>10.1f} MB"
+    )
+
+
+def main(n_frames: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = Path(tmp)
+
+        # gerar CSV e cache antes das medições (cada modo corre à parte)
+        csv_path = raw_path / DATASET_FILES["X_train"]
+        synthetic_tracking(n_frames).to_csv(csv_path, index=False)
+        read_csv_cached(csv_path, raw_path / "cache")
+
+        print(f"{n_frames} frames\n")
+        print(
+            f"{'modo':<12}{'abrir':>12}{'ΔRSS':>12}"
+            f"{'PI 2+4':>12}{'ΔRSS':>12}"
+        )
+
+        for mode in ["dataframe", "memmap"]:
+            subprocess.run(
+                [sys.executable, __file__, "--mode", mode, str(raw_path)],
+                check=True,
+                cwd=PROJECT_ROOT
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--mode":
+        _run_mode(sys.argv[2], Path(sys.argv[3]))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
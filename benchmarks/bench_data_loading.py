@@ -0,0 +1,76 @@
+# =====================================================
+# BENCHMARK — CSV vs CACHE COLUNAR
+# =====================================================
+# Uso: python benchmarks/bench_data_loading.py [n_frames]
+#
+# A geração do CSV e cada modo correm num subprocesso próprio para que
+# o pico de RSS medido seja apenas o da leitura (no Linux o ru_maxrss
+# do processo pai é herdado através do exec).
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import PROJECT_ROOT, peak_rss_mb, synthetic_tracking
+
+from src.data_loading import read_csv_cached
+from src.kpis import required_columns
+
+
+def _run_mode(mode: str, csv_path: Path, arg: str) -> None:
+    if mode == "generate":
+        synthetic_tracking(int(arg)).to_csv(csv_path, index=False)
+        return
+
+    cache_root = Path(arg)
+
+    start = time.perf_counter()
+
+    if mode == "csv":
+        read_csv_cached(csv_path, use_cache=False)
+    elif mode == "csv_pi3":
+        read_csv_cached(
+            csv_path, use_cache=False, usecols=required_columns(["pi3"])
+        )
+    elif mode == "warm_pi3":
+        read_csv_cached(
+            csv_path, cache_root=cache_root, usecols=required_columns(["pi3"])
+        )
+    else:
+        read_csv_cached(csv_path, cache_root=cache_root)
+
+    elapsed = time.perf_counter() - start
+    print(f"{mode:<12}{elapsed:>10.3f} s{peak_rss_mb():>12.1f} MB")
+
+
+def main(n_frames: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path = tmp / "handball_X_train.csv"
+        cache_root = tmp / "cache"
+
+        def run(mode, arg):
+            subprocess.run(
+                [sys.executable, __file__, "--mode", mode, str(csv_path), arg],
+                check=True,
+                cwd=PROJECT_ROOT
+            )
+
+        run("generate", str(n_frames))
+        size_mb = csv_path.stat().st_size / 1e6
+        print(f"{n_frames} frames, CSV com {size_mb:.1f} MB\n")
+        print(f"{'modo':<12}{'tempo':>12}{'pico RSS':>15}")
+
+        # cold_cache = 1.ª leitura (CSV + escrita da cache)
+        # *_pi3 = projeção apenas das colunas do PI 3 (#ball_x, #ball_y)
+        for mode in ["csv", "csv_pi3", "cold_cache", "warm_cache", "warm_pi3"]:
+            run(mode, str(cache_root))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--mode":
+        _run_mode(sys.argv[2], Path(sys.argv[3]), sys.argv[4])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
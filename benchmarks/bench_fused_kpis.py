@@ -0,0 +1,43 @@
+# =====================================================
+# BENCHMARK — MOTOR FUNDIDO vs PI 1–5 EM SEPARADO
+# =====================================================
+# Uso: python benchmarks/bench_fused_kpis.py [n_frames]
+
+import sys
+
+from _common import synthetic_tracking, timeit
+
+from src.kpis import (
+    compute_all_kpis,
+    pi1_positional_distribution,
+    pi2_distance_travelled,
+    pi3_threat_frequency_by_zone,
+    pi4_reaction_intensity,
+    pi5_threat_progression_channels,
+)
+
+
+def separate(X):
+    return {
+        "pi1": pi1_positional_distribution(X),
+        "pi2": pi2_distance_travelled(X),
+        "pi3": pi3_threat_frequency_by_zone(X),
+        "pi4": pi4_reaction_intensity(X),
+        "pi5": pi5_threat_progression_channels(X),
+    }
+
+
+def main(n_frames: int) -> None:
+    X = synthetic_tracking(n_frames).astype("float32")
+
+    t_separate = timeit(lambda: separate(X))
+    t_fused = timeit(lambda: compute_all_kpis(X))
+
+    print(f"{n_frames} frames")
+    print(f"PI 1–5 em separado: {t_separate:.3f} s")
+    print(f"Motor fundido:      {t_fused:.3f} s")
+    print(f"Speedup:            {t_separate / t_fused:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,103 @@
+# =====================================================
+# BENCHMARK — GEOMETRIA GUARDA-REDES–BOLA (MOTOR VETORIZADO)
+# =====================================================
+# Uso: python benchmarks/bench_geometry.py [n_frames]
+#
+# Distância, ângulo de remate, desvio à bissetriz e cobertura dos
+# postes por frame: ciclo Python linha a linha (numa amostra,
+# extrapolado) vs src.geometry, em memória, por blocos de leitura e
+# por intervalos de frames (GeometryRangeIndex).
+
+import math
+import sys
+import time
+
+import numpy as np
+
+from _common import synthetic_tracking, timeit
+
+from src.geometry import (
+    DEFAULT_GOAL,
+    KEEPER_REACH,
+    GeometryRangeIndex,
+    geometry_summary,
+    goalkeeper_geometry,
+    stream_geometry,
+)
+
+PYTHON_SAMPLE = 100_000
+
+
+def python_loop(X, n: int) -> list:
+    """Referência linha a linha (trigonometria com math)."""
+
+    (x_goal, y1), (_, y2) = DEFAULT_GOAL.posts
+    sx, sy = DEFAULT_GOAL.scale
+    rows = zip(
+        X["#x0"].to_numpy()[:n], X["#y0"].to_numpy()[:n],
+        X["#ball_x"].to_numpy()[:n], X["#ball_y"].to_numpy()[:n]
+    )
+    out = []
+
+    for kx, ky, bx, by in rows:
+        kx, ky, bx, by = kx * sx, ky * sy, bx * sx, by * sy
+        t1 = math.atan2(y1 - by, x_goal - bx)
+        t2 = math.atan2(y2 - by, x_goal - bx)
+        angle = abs(t2 - t1)
+        bisector = (t1 + t2) / 2
+        distance = math.hypot(kx - bx, ky - by)
+        phi = math.atan2(ky - by, kx - bx) - bisector
+        beta = math.asin(min(KEEPER_REACH / distance, 1))
+        covered = max(0, min(phi + beta, angle / 2)
+                      - max(phi - beta, -angle / 2))
+        out.append((
+            distance, math.degrees(angle), distance * math.sin(phi),
+            covered / angle
+        ))
+
+    return out
+
+
+def main(n_frames: int) -> None:
+    X = synthetic_tracking(n_frames, n_players=1)
+    print(f"{n_frames} frames\n")
+
+    n_sample = min(PYTHON_SAMPLE, n_frames)
+    t_loop = timeit(lambda: python_loop(X, n_sample), repeat=1)
+    t_loop *= n_frames / n_sample
+
+    t_frames = timeit(lambda: goalkeeper_geometry(X))
+    geometry = goalkeeper_geometry(X)
+    t_summary = timeit(lambda: geometry_summary(geometry))
+    t_stream = timeit(lambda: stream_geometry(X), repeat=1)
+
+    start = time.perf_counter()
+    index = GeometryRangeIndex(X)
+    t_build = time.perf_counter() - start
+
+    a, b = n_frames // 4 + 123, 3 * n_frames // 4 - 45
+    assert np.isclose(
+        index.query(a, b)["on_bisector_pct"],
+        geometry_summary(
+            {k: v[a:b] for k, v in geometry.items()}
+        )["on_bisector_pct"]
+    )
+    t_query = timeit(lambda: index.query(a, b), repeat=10)
+
+    print(f"{'etapa':<34}{'tempo':>12}")
+    rows = [
+        ("ciclo Python (extrapolado)", t_loop),
+        ("goalkeeper_geometry", t_frames),
+        ("geometry_summary", t_summary),
+        ("stream_geometry (blocos de 1M)", t_stream),
+        ("GeometryRangeIndex (construção)", t_build),
+    ]
+    for name, seconds in rows:
+        print(f"{name:<34}{seconds:>10.2f} s")
+    print(f"{'GeometryRangeIndex.query':<34}{t_query * 1e3:>9.2f} ms")
+
+    print(f"\nspeedup vs ciclo Python: {t_loop / t_frames:.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
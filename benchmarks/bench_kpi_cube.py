@@ -0,0 +1,77 @@
+# =====================================================
+# BENCHMARK — CUBO DE KPIs vs RECÁLCULO A PARTIR DAS LINHAS
+# =====================================================
+# Uso: python benchmarks/bench_kpi_cube.py [n_frames]
+#
+# Seleções (intervalo + contexto, step 5) respondidas como o dashboard
+# fazia (compute_all_kpis sobre os frames do contexto) vs somando as
+# células do KPICube: alinhadas aos buckets (sem tocar nas linhas) e
+# com pontas calculadas. Inclui o tempo de construção e a verificação.
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from _common import synthetic_tracking, timeit
+
+from src.kpi_cube import KPICube, context_frames, verify_cube
+from src.kpis import compute_all_kpis
+
+STEP = 5
+
+
+def main(n_frames: int) -> None:
+    X = synthetic_tracking(n_frames, n_players=1)
+    # treinos e jogos alternados em blocos de 20 minutos
+    X["contexto"] = pd.Categorical(np.where(
+        np.arange(n_frames) // 30_000 % 4 == 0, "Treino", "Jogo"
+    ))
+
+    start = time.perf_counter()
+    cube = KPICube.build(X, step=STEP)
+    print(f"{n_frames} frames, step {STEP}")
+    print(
+        f"Construção do cubo ({cube.n_buckets} buckets × "
+        f"{len(cube.contexts)} contextos): "
+        f"{time.perf_counter() - start:.2f} s\n"
+    )
+
+    bucket = cube.bucket_frames
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'intervalo':<12}{'contexto':<10}{'recálculo':>12}"
+        f"{'cubo':>12}{'cubo+pontas':>14}"
+    )
+    for fraction in [0.1, 0.5, 1.0]:
+        length = int(n_frames * fraction) // bucket * bucket
+        a = int(rng.integers(0, n_frames - length + 1)) // bucket * bucket
+        b = a + length
+
+        for context in cube.contexts:
+            def direct():
+                frames = context_frames(X, a, b, STEP, context)
+                return compute_all_kpis(X, grid=cube.grid, frames=frames)
+
+            t_direct = timeit(direct)
+            t_cube = timeit(lambda: cube.query(a, b, context), repeat=20)
+            t_edges = timeit(
+                lambda: cube.query(a + 7 * STEP, b - 3, context, X=X),
+                repeat=20
+            )
+            print(
+                f"{fraction:<12.0%}{context:<10}{t_direct * 1e3:>9.1f} ms"
+                f"{t_cube * 1e3:>9.2f} ms{t_edges * 1e3:>11.2f} ms"
+            )
+
+    report = verify_cube(cube, X, n_checks=20)
+    print(
+        f"\nVerificação: {int(report['ok'].sum())}/{len(report)} "
+        f"seleções, erro relativo máx. {report['max_rel_error'].max():.1e}"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
@@ -0,0 +1,84 @@
+# =====================================================
+# BENCHMARK — MEMÓRIA DOS RESULTADOS DOS PI 1, 2 E 4 EM CACHE
+# =====================================================
+# Uso: python benchmarks/bench_kpi_results.py [n_frames]
+#
+# Bytes que cada seleção ocupa na LRU de KPIs (estimate_nbytes): os
+# dicionários com as séries frame a frame (posições, distâncias,
+# velocidades) vs os resultados compactos de src.results, já com as
+# versões reduzidas usadas pelos gráficos (densidade, amostra, LTTB,
+# envelope) memorizadas.
+
+import sys
+
+import numpy as np
+
+from _common import synthetic_tracking, timeit
+
+from src.cache import estimate_nbytes
+from src.kpis import compute_all_kpis
+from src.labels import LabelIndex, gap_starts
+from src.synthetic import synthetic_labels
+
+SERIES_PI = ("pi1", "pi2", "pi4")
+
+
+def as_dicts(kpis: dict) -> dict:
+    """O formato anterior: cada PI como dicionário com as séries."""
+    return {
+        name: dict(result) if name in SERIES_PI else result
+        for name, result in kpis.items()
+    }
+
+
+def render(kpis: dict) -> None:
+    """O que os gráficos do dashboard pedem a cada resultado."""
+
+    kpis["pi1"].density()
+    kpis["pi1"].sample()
+    kpis["pi2"].decimated()
+    kpis["pi4"].decimated()
+    kpis["pi4"].envelope()
+
+
+def main(n_frames: int) -> None:
+    X = synthetic_tracking(n_frames, n_players=1)
+    labels = LabelIndex.build(synthetic_labels(n_frames), n_frames)
+    print(f"{n_frames} frames\n")
+
+    defense = labels.select("Defesa", before=50, step=5)
+    selections = {
+        "todos os frames": {},
+        "metade, step 5": {"frames": slice(0, n_frames // 2, 5)},
+        "Defesa (-50), step 5": {
+            "frames": defense, "segment_starts": gap_starts(defense, 5)
+        },
+    }
+
+    print(
+        f"{'seleção':<22}{'frames':>10}{'dicionários':>14}"
+        f"{'compacto':>12}{'redução':>10}{'séries':>10}"
+    )
+    for name, kwargs in selections.items():
+        kpis = compute_all_kpis(X, **kwargs)
+        render(kpis)
+
+        full = estimate_nbytes(as_dicts(kpis))
+        compact = estimate_nbytes(kpis)
+        # custo de rematerializar as séries completas quando pedidas
+        t_series = timeit(lambda: as_dicts(kpis))
+
+        print(
+            f"{name:<22}{kpis['pi1'].n_frames:>10}"
+            f"{full / 2**20:>11.1f} MB{compact / 2**20:>9.2f} MB"
+            f"{full / compact:>9.0f}x{t_series * 1e3:>7.0f} ms"
+        )
+
+    assert np.isclose(
+        kpis["pi2"]["total_distance"],
+        kpis["pi2"]["instant_distances"].sum()
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
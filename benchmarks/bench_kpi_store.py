@@ -0,0 +1,67 @@
+# =====================================================
+# BENCHMARK — KPI STORE EM DISCO vs RECÁLCULO APÓS REINÍCIO
+# =====================================================
+# Uso: python benchmarks/bench_kpi_store.py [n_frames]
+#
+# Caminho do dashboard com coluna 'contexto' (infer_game_context +
+# compute_all_kpis) comparado com ler o resultado do KPIStore, como
+# acontece no 1.º pedido depois de um reinício do servidor.
+
+import sys
+import tempfile
+
+import numpy as np
+
+from _common import synthetic_tracking, timeit
+
+from src.cache import DatasetFingerprint
+from src.kpi_store import KPIStore
+from src.kpis import compute_all_kpis
+from src.preprocessing import infer_game_context
+
+
+def compute(X, step: int, context: str) -> dict:
+    X_contextual = infer_game_context(X.iloc[::step])
+    return compute_all_kpis(
+        X_contextual[X_contextual["contexto"] == context]
+    )
+
+
+def run(store: KPIStore, X, n_frames: int) -> None:
+    for step in [1, 5, 20]:
+        fingerprint = DatasetFingerprint("bench", 0, n_frames, step)
+        kpis = compute(X, step, "Jogo")
+
+        t_compute = timeit(lambda: compute(X, step, "Jogo"))
+        t_put = timeit(lambda: store.put(fingerprint, kpis))
+        t_get = timeit(lambda: store.get(fingerprint))
+        size = store.nbytes()
+        store.clear()
+
+        print(
+            f"{step:>6}{t_compute * 1e3:>11.1f} ms"
+            f"{t_put * 1e3:>9.1f} ms{t_get * 1e3:>9.1f} ms"
+            f"{size / 1e6:>9.1f} MB"
+        )
+
+
+def main(n_frames: int) -> None:
+    X = synthetic_tracking(n_frames, n_players=1)
+    X["contexto"] = np.where(
+        (np.arange(n_frames) // 25_000) % 2 == 0, "Jogo", "Treino"
+    )
+
+    print(f"{n_frames} frames (metade 'Jogo')")
+    print(
+        f"{'step':>6}{'recálculo':>14}{'put':>12}{'get':>12}"
+        f"{'disco':>12}"
+    )
+
+    for compress in [True, False]:
+        print(f"compress={compress}")
+        with tempfile.TemporaryDirectory() as root:
+            run(KPIStore(root, compress=compress), X, n_frames)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
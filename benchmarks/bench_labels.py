@@ -0,0 +1,71 @@
+# =====================================================
+# BENCHMARK — KPIs FILTRADOS POR LABEL (handball_y_*)
+# =====================================================
+# Uso: python benchmarks/bench_labels.py [n_frames]
+#
+# KPIs dos frames com uma label (e dos N frames antes de cada um):
+# merge X ⨝ y + filtro a cada pedido vs LabelIndex (frames por label
+# alinhados uma vez) + fancy indexing em compute_all_kpis(frames=...),
+# comparados com o mesmo pedido sem filtro.
+
+import sys
+import time
+
+from _common import synthetic_tracking, timeit
+
+from src.kpis import compute_all_kpis
+from src.labels import LabelIndex, gap_starts
+from src.synthetic import synthetic_labels
+
+STEP = 5
+
+
+def merge_filter(X, y, label: str):
+    X_labelled = X.merge(y, left_index=True, right_index=True)
+    return compute_all_kpis(
+        X_labelled[X_labelled["label"] == label].iloc[::STEP]
+    )
+
+
+def main(n_frames: int) -> None:
+    X = synthetic_tracking(n_frames, n_players=1)
+    y = synthetic_labels(n_frames)
+
+    start = time.perf_counter()
+    index = LabelIndex.build(y, n_frames=n_frames)
+    print(f"{n_frames} frames, step {STEP}")
+    print(f"Construção do índice: {time.perf_counter() - start:.3f} s\n")
+
+    t_all = timeit(lambda: compute_all_kpis(X.iloc[::STEP]))
+
+    print(
+        f"{'filtro':<22}{'frames':>10}{'sem filtro':>13}"
+        f"{'merge':>11}{'índice':>11}"
+    )
+    for label in index.labels:
+        for before in [0, 50]:
+            def indexed():
+                frames = index.select(label, before=before, step=STEP)
+                return compute_all_kpis(
+                    X, frames=frames, segment_starts=gap_starts(frames, STEP)
+                )
+
+            n = len(index.select(label, before=before, step=STEP))
+            t_index = timeit(indexed)
+            name = f"{label} (-{before})" if before else label
+
+            # a janela "antes de cada label" não tem equivalente direto
+            # num merge; só o filtro simples é comparado
+            merge = "—"
+            if not before:
+                t_merge = timeit(lambda: merge_filter(X, y, label))
+                merge = f"{t_merge * 1e3:.0f} ms"
+
+            print(
+                f"{name:<22}{n:>10}{t_all * 1e3:>10.0f} ms"
+                f"{merge:>11}{t_index * 1e3:>8.0f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
@@ -0,0 +1,53 @@
+# =====================================================
+# BENCHMARK — MODO AO VIVO (CUSTO POR FRAME NUM SÓ CORE)
+# =====================================================
+# Uso: python benchmarks/bench_live.py [n_frames]
+#
+# Cada frame é processado isoladamente (pior caso: um frame por
+# leitura do feed), incluindo o parsing da linha CSV.
+
+import sys
+import time
+
+from _common import synthetic_tracking
+
+from src.live import FPS, LIVE_COLUMNS, LiveKPIs, LiveMatch, _parse_lines
+
+
+def per_frame(fn, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items)
+
+
+def main(n_frames: int) -> None:
+    X = synthetic_tracking(n_frames)
+    header = list(X.columns)
+    lines = X.to_csv(index=False, header=False).splitlines()
+    values = X[LIVE_COLUMNS].to_numpy()
+
+    kpis = LiveKPIs()
+    frames = [values[i:i + 1] for i in range(n_frames)]
+    t_update = per_frame(kpis.update, frames)
+
+    live = LiveMatch(source=None)
+    t_ingest = per_frame(
+        lambda line: live.ingest(_parse_lines([line], header)), lines
+    )
+
+    t_snapshot = per_frame(lambda _: live.snapshot(), range(50))
+
+    budget = 1 / FPS
+    print(
+        f"{n_frames} frames, orçamento a {FPS} Hz: "
+        f"{budget * 1e3:.0f} ms/frame"
+    )
+    print(f"LiveKPIs.update:          {t_update * 1e6:>8.1f} µs/frame")
+    print(f"parse CSV + ingest:       {t_ingest * 1e6:>8.1f} µs/frame")
+    print(f"snapshot (janela cheia):  {t_snapshot * 1e3:>8.2f} ms")
+    print(f"Frequência máxima:        {1 / t_ingest:>8.0f} Hz")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,53 @@
+# =====================================================
+# BENCHMARK — KDE BINNED vs scipy gaussian_kde (PI 1)
+# =====================================================
+# Uso: python benchmarks/bench_pi1_density.py
+#
+# gaussian_kde é O(pontos × grelha): só é medido até 100k pontos.
+# A coluna "kde 3000" reproduz a versão anterior (subamostra de 3000).
+
+import numpy as np
+from scipy.stats import gaussian_kde
+
+from _common import timeit
+
+from src.density import binned_kde
+
+
+def scipy_kde(x, y, gridsize=120):
+    kde = gaussian_kde(np.vstack([x, y]), bw_method=0.25)
+    xi, yi = np.mgrid[
+        x.min():x.max():gridsize * 1j,
+        y.min():y.max():gridsize * 1j
+    ]
+    return kde(np.vstack([xi.ravel(), yi.ravel()])).reshape(xi.shape)
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'pontos':>10}{'binned':>12}{'kde todos':>12}"
+        f"{'kde 3000':>12}{'erro máx':>11}"
+    )
+    for n in [10_000, 100_000, 1_000_000, 10_000_000]:
+        x = rng.normal(0.5, 0.1, n)
+        y = 0.5 * x + rng.normal(0, 0.05, n)
+
+        t_binned = timeit(lambda: binned_kde(x, y), repeat=2)
+        t_sub = timeit(lambda: scipy_kde(x[:3000], y[:3000]), repeat=2)
+
+        if n <= 100_000:
+            t_full = timeit(lambda: scipy_kde(x, y), repeat=1)
+            exact = scipy_kde(x, y)
+            binned = binned_kde(x, y)["density"]
+            error = np.abs(binned - exact).max() / exact.max()
+            full, err = f"{t_full:>10.3f} s", f"{error:>10.2%}"
+        else:
+            full, err = f"{'—':>12}", f"{'—':>11}"
+
+        print(f"{n:>10}{t_binned:>10.3f} s{full}{t_sub:>10.3f} s{err}")
+
+
+if __name__ == "__main__":
+    main()
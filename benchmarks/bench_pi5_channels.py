@@ -0,0 +1,56 @@
+# =====================================================
+# BENCHMARK — PI 5 VETORIZADO vs CLASSIFICAÇÃO POR LINHA
+# =====================================================
+# Uso: python benchmarks/bench_pi5_channels.py [n_frames]
+
+import sys
+
+import pandas as pd
+
+from _common import synthetic_tracking, timeit
+
+from src.kpis import pi5_threat_progression_channels
+
+
+def pi5_apply(X: pd.DataFrame) -> dict:
+    """Implementação anterior (Series.apply + value_counts), como referência."""
+
+    def classify_channel(x):
+        if x < 0.33:
+            return "Esquerdo"
+        elif x < 0.66:
+            return "Central"
+        else:
+            return "Direito"
+
+    channels = X["#x0"].apply(classify_channel)
+    counts = channels.value_counts().reindex(
+        ["Esquerdo", "Central", "Direito"],
+        fill_value=0
+    )
+    total = counts.sum()
+    percentages = (counts / total * 100) if total > 0 else counts
+
+    return {
+        "counts": counts.to_dict(),
+        "percentages": percentages.to_dict(),
+        "total_threats": int(total)
+    }
+
+
+def main(n_frames: int) -> None:
+    X = synthetic_tracking(n_frames, n_players=1).astype("float32")
+
+    assert pi5_apply(X) == pi5_threat_progression_channels(X)
+
+    t_apply = timeit(lambda: pi5_apply(X))
+    t_vector = timeit(lambda: pi5_threat_progression_channels(X))
+
+    print(f"{n_frames} frames")
+    print(f"apply + value_counts:  {t_apply:.3f} s")
+    print(f"digitize + bincount:   {t_vector:.4f} s")
+    print(f"Speedup:               {t_apply / t_vector:.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,61 @@
+# =====================================================
+# BENCHMARK — TODOS OS JOGADORES vs GUARDA-REDES SÓ
+# =====================================================
+# Uso: python benchmarks/bench_players.py [n_frames]
+
+import sys
+
+import numpy as np
+
+from _common import synthetic_tracking, timeit
+
+from src.kpis import (
+    pi1_positional_distribution,
+    pi2_distance_travelled,
+    pi4_reaction_intensity,
+)
+from src.players import all_player_kpis, player_ids
+
+
+def goalkeeper_only(X) -> None:
+    pi1_positional_distribution(X)
+    pi2_distance_travelled(X)
+    pi4_reaction_intensity(X)
+
+
+def per_player_columns(X) -> None:
+    """Referência: as funções PI repetidas jogador a jogador."""
+
+    for i in player_ids(X.columns):
+        cols = {f"#{c}{i}": f"#{c}0" for c in ("x", "y", "vx", "vy")}
+        goalkeeper_only(X[list(cols)].rename(columns=cols))
+
+
+def main(n_frames: int) -> None:
+    X = synthetic_tracking(n_frames).astype("float32")
+    n_players = len(player_ids(X.columns))
+
+    result = all_player_kpis(X)
+    assert np.isclose(
+        result["pi2"]["total_distance"][0],
+        pi2_distance_travelled(X)["total_distance"]
+    )
+    assert np.isclose(
+        result["pi4"]["mean_speed"][0],
+        pi4_reaction_intensity(X)["mean_speed"]
+    )
+
+    t_one = timeit(lambda: goalkeeper_only(X))
+    t_loop = timeit(lambda: per_player_columns(X))
+    t_all = timeit(lambda: all_player_kpis(X))
+
+    print(f"{n_frames} frames, {n_players} jogadores")
+    print(f"1 jogador (funções PI):        {t_one:.3f} s")
+    print(f"{n_players} jogadores, um a um:        {t_loop:.3f} s")
+    print(f"{n_players} jogadores, all_player_kpis: {t_all:.3f} s")
+    print(f"Custo por jogador:             {t_all / n_players:.4f} s")
+    print(f"speedup vs um a um:            {t_loop / t_all:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,42 @@
+# =====================================================
+# BENCHMARK — ÍNDICE DE INTERVALOS vs RECÁLCULO DO INTERVALO
+# =====================================================
+# Uso: python benchmarks/bench_range_index.py [n_frames]
+
+import sys
+import time
+
+import numpy as np
+
+from _common import synthetic_tracking, timeit
+
+from src.kpis import compute_all_kpis
+from src.range_index import KPIRangeIndex
+
+
+def main(n_frames: int) -> None:
+    X = synthetic_tracking(n_frames, n_players=1).astype("float32")
+    rng = np.random.default_rng(0)
+
+    start = time.perf_counter()
+    index = KPIRangeIndex(X)
+    for step in [1, 5, 10, 20, 50]:
+        index.query(0, n_frames, step)
+    print(f"{n_frames} frames")
+    print(f"Construção do índice (steps 1–50): {time.perf_counter() - start:.2f} s\n")
+
+    print(f"{'intervalo':<12}{'step':>6}{'recálculo':>14}{'índice':>14}")
+    for fraction in [0.01, 0.1, 0.5, 1.0]:
+        length = int(n_frames * fraction)
+        a = int(rng.integers(0, n_frames - length + 1))
+        for step in [1, 5]:
+            t_full = timeit(lambda: compute_all_kpis(X.iloc[a:a + length:step]))
+            t_index = timeit(lambda: index.query(a, a + length, step), repeat=20)
+            print(
+                f"{fraction:<12.0%}{step:>6}{t_full * 1e3:>11.1f} ms"
+                f"{t_index * 1e3:>11.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
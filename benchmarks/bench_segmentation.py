@@ -0,0 +1,65 @@
+# =====================================================
+# BENCHMARK — KPIs POR SEGMENTO: reduceat vs GROUPBY EM CICLO
+# =====================================================
+# Uso: python benchmarks/bench_segmentation.py [n_frames] [frames_por_segmento]
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from _common import synthetic_tracking, timeit
+
+from src.kpis import (
+    pi1_positional_distribution,
+    pi2_distance_travelled,
+    pi4_reaction_intensity,
+    pi5_threat_progression_channels,
+)
+from src.segmentation import segment_kpis, segment_starts
+
+
+def segment_loop(X: pd.DataFrame) -> list[dict]:
+    """Referência: funções por KPI aplicadas a cada grupo de groupby."""
+
+    rows = []
+    for _, S in X.groupby("sequence", sort=False):
+        speed = pi4_reaction_intensity(S)
+        rows.append({
+            "mean_position": pi1_positional_distribution(S)["mean_position"],
+            "total_distance": pi2_distance_travelled(S)["total_distance"],
+            "max_speed": speed["max_speed"],
+            "channels": pi5_threat_progression_channels(S)["counts"]
+        })
+
+    return rows
+
+
+def main(n_frames: int, segment_length: int) -> None:
+    X = synthetic_tracking(n_frames, n_players=1).astype("float32")
+    X["sequence"] = np.arange(n_frames) // segment_length
+
+    starts = segment_starts(X, sequence_column="sequence")
+    table = segment_kpis(X, starts)
+    loop = segment_loop(X)
+
+    assert len(table) == len(loop)
+    assert np.allclose(
+        table["total_distance"], [r["total_distance"] for r in loop],
+        rtol=1e-4
+    )
+
+    t_loop = timeit(lambda: segment_loop(X), repeat=1)
+    t_reduce = timeit(lambda: segment_kpis(X, starts))
+
+    print(f"{n_frames} frames, {len(starts)} segmentos")
+    print(f"groupby + funções PI:  {t_loop:.3f} s")
+    print(f"reduceat:              {t_reduce:.4f} s")
+    print(f"Speedup:               {t_loop / t_reduce:.0f}x")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    )
@@ -0,0 +1,45 @@
+# =====================================================
+# BENCHMARK — GRÁFICOS PI 4 COM E SEM DECIMAÇÃO
+# =====================================================
+# Uso: python benchmarks/bench_series_plots.py
+#
+# Tempo de construir e rasterizar a figura (PNG), como no st.pyplot.
+
+import io
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from _common import timeit
+
+from src.visualizations import plot_pi4_reaction_intensity
+
+
+def render(speeds, **kwargs) -> None:
+    fig = plot_pi4_reaction_intensity(
+        speeds, speeds.mean(), speeds.max(), **kwargs
+    )
+    fig.savefig(io.BytesIO(), format="png")
+    plt.close(fig)
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+
+    print(f"{'frames':>10}{'todos os pontos':>18}{'decimado':>12}")
+
+    for n_frames in (10_000, 100_000, 1_000_000):
+        speeds = np.abs(rng.normal(0, 1, n_frames)).astype(np.float32)
+
+        t_full = timeit(lambda: render(speeds, max_points=n_frames), 1)
+        t_decimated = timeit(lambda: render(speeds))
+
+        print(f"{n_frames:>10}{t_full:>16.2f} s{t_decimated:>10.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# =====================================================
+# BENCHMARK — ARRANQUE DA APP (1.ª PÁGINA E 1.º GRÁFICO)
+# =====================================================
+# Uso:
+#   python benchmarks/bench_startup.py [n_frames] [--think 3]
+#
+# Copia app/ e src/ para uma pasta temporária com um dataset sintético
+# em data/raw e corre o dashboard com streamlit.testing (AppTest), num
+# processo novo por cenário (imports a frio):
+# - 1.ª página: primeiro rerun (boas-vindas)
+# - 1.º gráfico: primeiro rerun do dashboard (persona GR, PI 1), depois
+#   de `think` segundos nas páginas iniciais
+# com e sem a thread de aquecimento (DG_WARMUP=0).
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from _common import PROJECT_ROOT
+
+# corre dentro do processo filho, com a árvore temporária no sys.path
+CHILD = r"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+tree, think = sys.argv[1], float(sys.argv[2])
+sys.path.insert(0, tree)
+
+at = AppTest.from_file(f"{tree}/app/streamlit_app.py", default_timeout=600)
+
+start = time.perf_counter()
+at.run()
+first_page = time.perf_counter() - start
+
+time.sleep(think)
+
+at.session_state["persona"] = "Treinador de Guarda-Redes"
+at.session_state["authenticated"] = True
+at.session_state["page"] = "dashboard"
+
+start = time.perf_counter()
+at.run()
+first_chart = time.perf_counter() - start
+
+assert not at.exception, at.exception
+print(json.dumps({"first_page": first_page, "first_chart": first_chart}))
+"""
+
+
+def prepare_tree(tmp: Path, n_frames: int) -> Path:
+    from src.synthetic import write_synthetic_dataset
+
+    for name in ["app", "src"]:
+        shutil.copytree(
+            PROJECT_ROOT / name, tmp / name,
+            ignore=shutil.ignore_patterns("__pycache__")
+        )
+
+    write_synthetic_dataset(tmp / "data" / "raw", n_frames, splits=["train"])
+    return tmp
+
+
+def run(tree: Path, think: float, warmup: bool) -> dict:
+    env = dict(os.environ, DG_WARMUP="1" if warmup else "0")
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, str(tree), str(think)],
+        capture_output=True, text=True, env=env, check=True
+    ).stdout
+
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("n_frames", type=int, nargs="?", default=500_000)
+    parser.add_argument("--think", type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = prepare_tree(Path(tmp), args.n_frames)
+
+        # 1.ª execução grava a cache colunar; as medições usam-na quente
+        run(tree, 0, warmup=False)
+
+        print(f"{args.n_frames} frames, {args.think:.0f} s nas páginas "
+              f"iniciais")
+        print(f"{'':<18}{'1.ª página (s)':>16}{'1.º gráfico (s)':>17}")
+
+        for warmup in [False, True]:
+            times = run(tree, args.think, warmup)
+            label = "com aquecimento" if warmup else "sem aquecimento"
+            print(
+                f"{label:<18}{times['first_page']:>16.3f}"
+                f"{times['first_chart']:>17.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# =====================================================
+# BENCHMARK — ÍNDICE ESPACIAL vs VARRIMENTO BOOLEANO
+# =====================================================
+# Uso: python benchmarks/bench_zone_index.py [n_frames]
+#
+# "Frames em que a bola esteve na zona Z (num intervalo de frames)":
+# máscara booleana sobre #ball_x/#ball_y vs consultas ao ZoneIndex.
+
+import sys
+import time
+
+import numpy as np
+
+from _common import synthetic_tracking, timeit
+
+from src.heatmap import grid_from_data
+from src.zone_index import ZoneIndex, points_in_polygon
+
+POLYGON = np.array([
+    (0.20, 0.20), (0.50, 0.10), (0.45, 0.50), (0.30, 0.35), (0.15, 0.45)
+])
+
+
+def main(n_frames: int) -> None:
+    X = synthetic_tracking(n_frames, n_players=1)
+    x = X["#ball_x"].to_numpy()
+    y = X["#ball_y"].to_numpy()
+
+    start = time.perf_counter()
+    index = ZoneIndex.build(x, y)
+    print(f"{n_frames} frames")
+    print(f"Construção do índice: {time.perf_counter() - start:.2f} s\n")
+
+    heatmap_grid = grid_from_data(x, y, 10, 10)
+    a, b = n_frames // 4, 3 * n_frames // 4
+    frames = np.arange(n_frames)
+    in_range = (frames >= a) & (frames < b)
+
+    cases = {
+        "célula PI 3": (
+            lambda: np.flatnonzero(
+                (heatmap_grid.cell_ids(x, y) == 37) & in_range
+            ),
+            lambda: index.heatmap_cell(heatmap_grid, 3, 7, a, b)
+        ),
+        "retângulo": (
+            lambda: np.flatnonzero(
+                (x >= 0.3) & (x < 0.37) & (y >= 0.6) & (y < 0.7) & in_range
+            ),
+            lambda: index.rectangle((0.3, 0.37), (0.6, 0.7), a, b)
+        ),
+        "raio": (
+            lambda: np.flatnonzero(
+                ((x - 0.5) ** 2 + (y - 0.5) ** 2 <= 0.05**2) & in_range
+            ),
+            lambda: index.radius((0.5, 0.5), 0.05, a, b)
+        ),
+        "polígono": (
+            lambda: np.flatnonzero(
+                points_in_polygon(x, y, POLYGON) & in_range
+            ),
+            lambda: index.polygon(POLYGON, a, b)
+        ),
+    }
+
+    print(f"{'consulta':<14}{'frames':>10}{'varrimento':>14}{'índice':>12}")
+    for name, (scan, query) in cases.items():
+        assert np.array_equal(scan(), query())
+        t_scan = timeit(scan)
+        t_index = timeit(query, repeat=10)
+        print(
+            f"{name:<14}{len(query()):>10}{t_scan * 1e3:>11.1f} ms"
+            f"{t_index * 1e3:>9.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
@@ -0,0 +1,376 @@
+# =====================================================
+# SUITE DE BENCHMARKS — KPIs, CARREGAMENTO E FIGURAS
+# =====================================================
+# Uso:
+#   python benchmarks/run_suite.py                         # 10k, 100k, 1M
+#   python benchmarks/run_suite.py --sizes 10000 50000000 --group kpis
+#   python benchmarks/run_suite.py --compare benchmarks/results/antigo.json
+#
+# Cada caso é medido em dados sintéticos (src/synthetic.py) para cada
+# tamanho; os resultados são gravados em JSON (benchmarks/results/) com
+# a versão do código e do ambiente, para comparar execuções ao longo do
+# tempo (--compare mostra a razão face a um JSON anterior).
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from _common import PROJECT_ROOT, synthetic_tracking
+
+from src import kpis
+from src import visualizations
+from src.column_store import ColumnStore
+from src.data_loading import ensure_cache, read_csv_cached
+from src.density import binned_kde
+from src.geometry import goalkeeper_geometry
+from src.heatmap import CourtGrid
+
+RESULTS_PATH = PROJECT_ROOT / "benchmarks" / "results"
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+# acima deste tamanho só o guarda-redes e a bola são gerados
+# (50M frames × 14 jogadores não cabem em memória)
+ALL_PLAYERS_MAX_FRAMES = 5_000_000
+
+# o carregamento escreve um CSV; limitado por defeito
+LOAD_MAX_FRAMES = 1_000_000
+
+
+# ==================================================
+# REGISTO DE CASOS
+# ==================================================
+CASES = []
+
+
+def case(group: str, name: str):
+    """Regista setup(ctx) -> função a medir, no grupo `group`."""
+
+    def decorator(setup):
+        CASES.append((group, name, setup))
+        return setup
+
+    return decorator
+
+
+# ---------- src/kpis.py ----------
+@case("kpis", "required_columns")
+def _(ctx):
+    return lambda: kpis.required_columns(list(kpis.KPI_COLUMNS))
+
+
+@case("kpis", "column_array")
+def _(ctx):
+    return lambda: kpis.column_array(ctx["X"], "#x0")
+
+
+@case("kpis", "pi1_positional_distribution")
+def _(ctx):
+    return lambda: kpis.pi1_positional_distribution(ctx["X"])
+
+
+@case("kpis", "pi2_distance_travelled")
+def _(ctx):
+    return lambda: kpis.pi2_distance_travelled(ctx["X"])
+
+
+@case("kpis", "pi3_threat_frequency_by_zone")
+def _(ctx):
+    return lambda: kpis.pi3_threat_frequency_by_zone(ctx["X"])
+
+
+@case("kpis", "pi3_threat_frequency_by_zone[grid]")
+def _(ctx):
+    grid = CourtGrid.normalized()
+    return lambda: kpis.pi3_threat_frequency_by_zone(ctx["X"], grid=grid)
+
+
+@case("kpis", "pi4_reaction_intensity")
+def _(ctx):
+    return lambda: kpis.pi4_reaction_intensity(ctx["X"])
+
+
+@case("kpis", "pi5_threat_origin_zones")
+def _(ctx):
+    return lambda: kpis.pi5_threat_origin_zones(ctx["X"])
+
+
+@case("kpis", "channel_labels")
+def _(ctx):
+    return lambda: kpis.channel_labels(5)
+
+
+@case("kpis", "channel_summary")
+def _(ctx):
+    counts = np.array([10, 20, 30])
+    return lambda: kpis.channel_summary(counts, kpis.PI5_CHANNELS)
+
+
+@case("kpis", "channel_counts")
+def _(ctx):
+    x = kpis.column_array(ctx["X"], "#x0")
+    return lambda: kpis.channel_counts(x)
+
+
+@case("kpis", "pi5_threat_progression_channels")
+def _(ctx):
+    return lambda: kpis.pi5_threat_progression_channels(ctx["X"])
+
+
+@case("kpis", "compute_all_kpis")
+def _(ctx):
+    return lambda: kpis.compute_all_kpis(ctx["X"])
+
+
+@case("kpis", "goalkeeper_geometry")
+def _(ctx):
+    return lambda: goalkeeper_geometry(ctx["X"])
+
+
+# ---------- carregamento ----------
+@case("loading", "read_csv")
+def _(ctx):
+    return lambda: read_csv_cached(ctx["csv"], use_cache=False)
+
+
+@case("loading", "read_csv_cached[cold]")
+def _(ctx):
+    def cold():
+        with tempfile.TemporaryDirectory() as cache_root:
+            read_csv_cached(ctx["csv"], cache_root=Path(cache_root))
+
+    return cold
+
+
+@case("loading", "read_csv_cached[warm]")
+def _(ctx):
+    return lambda: read_csv_cached(ctx["csv"], cache_root=ctx["cache_root"])
+
+
+@case("loading", "read_csv_cached[warm, pi3]")
+def _(ctx):
+    usecols = kpis.required_columns(["pi3"])
+    return lambda: read_csv_cached(
+        ctx["csv"], cache_root=ctx["cache_root"], usecols=usecols
+    )
+
+
+@case("loading", "column_store[open + pi1..pi5]")
+def _(ctx):
+    def open_and_compute():
+        cache_dir, meta = ensure_cache(ctx["csv"], ctx["cache_root"])
+        kpis.compute_all_kpis(ColumnStore.from_cache(cache_dir, meta))
+
+    return open_and_compute
+
+
+# ---------- figuras ----------
+def _figure(build):
+    def run():
+        fig = build()
+        if isinstance(fig, plt.Figure):
+            plt.close(fig)
+
+    return run
+
+
+@case("figures", "plot_pi1_positional_distribution")
+def _(ctx):
+    pi1 = ctx["kpis"]["pi1"]
+    return _figure(lambda: visualizations.plot_pi1_positional_distribution(
+        pi1["positions"], pi1["mean_position"]
+    ))
+
+
+@case("figures", "plot_pi1_positional_distribution[density]")
+def _(ctx):
+    pi1 = ctx["kpis"]["pi1"]
+    positions = pi1["positions"]
+    density = binned_kde(positions["#x0"], positions["#y0"])
+    return _figure(lambda: visualizations.plot_pi1_positional_distribution(
+        positions, pi1["mean_position"], density
+    ))
+
+
+@case("figures", "plot_pi2_distance_travelled")
+def _(ctx):
+    distances = ctx["kpis"]["pi2"]["instant_distances"]
+    return _figure(
+        lambda: visualizations.plot_pi2_distance_travelled(distances)
+    )
+
+
+@case("figures", "plot_pi3_threat_frequency")
+def _(ctx):
+    heatmap = ctx["kpis"]["pi3"]["heatmap"]
+    return _figure(lambda: visualizations.plot_pi3_threat_frequency(heatmap))
+
+
+@case("figures", "plot_pi3_threat_frequency_interactive")
+def _(ctx):
+    heatmap = ctx["kpis"]["pi3"]["heatmap"]
+    return _figure(
+        lambda: visualizations.plot_pi3_threat_frequency_interactive(heatmap)
+    )
+
+
+@case("figures", "plot_pi4_reaction_intensity")
+def _(ctx):
+    pi4 = ctx["kpis"]["pi4"]
+    speeds = pi4["speed_series"]
+    return _figure(lambda: visualizations.plot_pi4_reaction_intensity(
+        speeds, pi4["mean_speed"], pi4["max_speed"]
+    ))
+
+
+@case("figures", "plot_pi5_threat_progression_channels")
+def _(ctx):
+    pi5 = ctx["kpis"]["pi5"]
+    return _figure(
+        lambda: visualizations.plot_pi5_threat_progression_channels(pi5)
+    )
+
+
+# ==================================================
+# EXECUÇÃO
+# ==================================================
+def measure(fn, min_time: float = 0.2, max_repeat: int = 10) -> list[float]:
+    """
+    Tempos (s) de execuções repetidas de fn(): pelo menos 1 e até
+    max_repeat, parando quando o total excede min_time.
+    """
+
+    times = []
+    while len(times) < max_repeat and sum(times) < min_time:
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    return times
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=PROJECT_ROOT, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_size(n_frames: int, groups, players: int, tmp: Path) -> list[dict]:
+    n_players = players if n_frames <= ALL_PLAYERS_MAX_FRAMES else 1
+    X = synthetic_tracking(n_frames, n_players=n_players)
+
+    ctx = {"X": X}
+    if "figures" in groups:
+        ctx["kpis"] = kpis.compute_all_kpis(X)
+
+    if "loading" in groups and n_frames <= LOAD_MAX_FRAMES:
+        ctx["csv"] = tmp / f"handball_X_{n_frames}.csv"
+        ctx["cache_root"] = tmp / "cache"
+        X.to_csv(ctx["csv"], index=False)
+        ensure_cache(ctx["csv"], ctx["cache_root"])
+
+    results = []
+    for group, name, setup in CASES:
+        if group not in groups or (group == "loading" and "csv" not in ctx):
+            continue
+
+        times = measure(setup(ctx))
+        results.append({
+            "group": group,
+            "case": name,
+            "n_frames": n_frames,
+            "n_players": n_players,
+            "best_s": min(times),
+            "median_s": statistics.median(times),
+            "repeat": len(times),
+        })
+        print(
+            f"{group:<8}{name:<46}{n_frames:>11}"
+            f"{min(times) * 1e3:>12.3f} ms"
+        )
+
+    return results
+
+
+def compare(results: list[dict], baseline_path: Path) -> None:
+    """Razão atual / baseline por caso e tamanho (< 1 = mais rápido)."""
+
+    baseline = {
+        (r["case"], r["n_frames"]): r["best_s"]
+        for r in json.loads(Path(baseline_path).read_text())["results"]
+    }
+
+    print(f"\nComparação com {baseline_path}:")
+    for r in results:
+        old = baseline.get((r["case"], r["n_frames"]))
+        if old:
+            print(
+                f"{r['case']:<46}{r['n_frames']:>11}"
+                f"{r['best_s'] / old:>10.2f}x"
+            )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmarks de KPIs, carregamento e figuras."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--group", nargs="+", default=["kpis", "loading", "figures"],
+        choices=["kpis", "loading", "figures"]
+    )
+    parser.add_argument("--players", type=int, default=14)
+    parser.add_argument("-o", "--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_frames in args.sizes:
+            results += run_size(n_frames, args.group, args.players, Path(tmp))
+
+    env = environment()
+    output = args.output or RESULTS_PATH / (
+        f"{datetime.now():%Y%m%d-%H%M%S}-{env['commit'] or 'local'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps({"environment": env, "results": results}, indent=2)
+    )
+    print(f"\n>>> Resultados gravados em {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# =====================================================
+# BATCH — PI 1–5 SOBRE MUITOS JOGOS (PROCESS POOL)
+# =====================================================
+#
+# Uso (CLI):
+#   python -m src.batch data/raw/jogos/*.csv --workers 8 -o epoca.json
+#
+# Cada worker recebe apenas o caminho do ficheiro (nunca um DataFrame
+# serializado), lê-o por blocos e devolve os acumuladores de
+# src.streaming, que são pequenos e somáveis. O processo principal junta
+# os acumuladores de todos os jogos nos agregados da época.
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from src.heatmap import CourtGrid
+from src.streaming import ALL_KPIS, stream_accumulators
+
+
+def process_match(
+    path,
+    kpis=ALL_KPIS,
+    grid: CourtGrid | None = None,
+    chunksize: int = 200_000,
+    context: str | None = None
+) -> dict:
+    """Acumuladores dos KPIs de um jogo (executado num worker)."""
+
+    return stream_accumulators(
+        Path(path),
+        kpis,
+        chunksize=chunksize,
+        grid=grid,
+        context=context
+    )
+
+
+def merge_accumulators(per_match: list[dict]) -> dict:
+    """Junta os acumuladores de vários jogos, KPI a KPI."""
+
+    merged = {}
+    for accumulators in per_match:
+        for kpi, accumulator in accumulators.items():
+            if kpi not in merged:
+                merged[kpi] = accumulator
+            else:
+                merged[kpi].merge(accumulator)
+
+    return merged
+
+
+def run_batch(
+    paths,
+    kpis=ALL_KPIS,
+    workers: int | None = None,
+    grid: CourtGrid | None = None,
+    chunksize: int = 200_000,
+    context: str | None = None
+) -> dict:
+    """
+    Calcula os KPIs de cada jogo em paralelo e os agregados da época.
+
+    - paths: ficheiros CSV de tracking (um por jogo)
+    - workers: nº de processos (por defeito os.cpu_count())
+    - grid: grelha fixa do PI 3, comum a todos os jogos para que os
+      heatmaps sejam somáveis (por defeito coordenadas normalizadas)
+
+    Devolve {"matches": {caminho: {...}}, "season": {...}}, com os
+    resultados no formato de src.kpis.
+    """
+
+    paths = [str(p) for p in paths]
+    grid = grid or CourtGrid.normalized()
+    workers = workers or os.cpu_count() or 1
+
+    args = (kpis, grid, chunksize, context)
+
+    if workers == 1:
+        per_match = [process_match(p, *args) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(process_match, p, *args) for p in paths]
+            per_match = [f.result() for f in futures]
+
+    matches = {
+        path: {kpi: acc.result() for kpi, acc in accumulators.items()}
+        for path, accumulators in zip(paths, per_match)
+    }
+    season = merge_accumulators(per_match)
+
+    return {
+        "matches": matches,
+        "season": {kpi: acc.result() for kpi, acc in season.items()}
+    }
+
+
+def to_json(obj):
+    """Converte resultados (arrays/escalares NumPy, tuplos) para JSON."""
+
+    if isinstance(obj, dict):
+        return {str(k): to_json(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_json(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+
+    return obj
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Calcula os PI 1–5 para vários jogos em paralelo."
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="CSVs de tracking (um por jogo)"
+    )
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("-o", "--output", help="ficheiro JSON de saída")
+    parser.add_argument("--kpis", nargs="+", default=list(ALL_KPIS))
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    parser.add_argument("--context", default=None, help="ex.: Jogo, Treino")
+    parser.add_argument(
+        "--bins", type=int, nargs=2, default=[10, 10],
+        metavar=("X", "Y"), help="resolução do heatmap do PI 3"
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run_batch(
+        args.paths,
+        kpis=args.kpis,
+        workers=args.workers,
+        grid=CourtGrid.normalized(*args.bins),
+        chunksize=args.chunksize,
+        context=args.context
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f">>> {len(args.paths)} jogos processados em {elapsed:.1f} s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(to_json(results), f, ensure_ascii=False, indent=2)
+    else:
+        season = to_json(results["season"])
+        print(json.dumps(season, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# =====================================================
+# CACHE — IDENTIDADE DOS DADOS E LRU LIMITADA EM MEMÓRIA
+# =====================================================
+
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.results import KPIResult
+
+
+# ==================================================
+# IDENTIDADE (FINGERPRINT) DE UMA SELEÇÃO DE DADOS
+# ==================================================
+@dataclass(frozen=True)
+class DatasetFingerprint:
+    """
+    Identifica uma seleção de dados sem olhar para o seu conteúdo:
+    hash do ficheiro fonte + intervalo de frames + step + contexto
+    (+ filtro por label e janela de frames antes de cada label).
+
+    É barato de calcular e de comparar, pelo que serve de chave de
+    cache em vez de hashing do DataFrame inteiro.
+    """
+
+    source: str
+    frame_start: int
+    frame_end: int
+    step: int = 1
+    context: str = "Jogo"
+    label: str | None = None
+    before: int = 0
+
+    def key(self) -> str:
+        key = (
+            f"{self.source}:{self.frame_start}-{self.frame_end}"
+            f":{self.step}:{self.context}"
+        )
+        if self.label is not None:
+            key += f":{self.label}-{self.before}"
+        return key
+
+
+# ==================================================
+# ESTIMATIVA DE MEMÓRIA DE UM RESULTADO
+# ==================================================
+def estimate_nbytes(obj, seen: set | None = None) -> int:
+    """
+    Estimativa (em bytes) da memória ocupada por um resultado de KPI:
+    dicionários/listas de arrays NumPy, DataFrames e escalares.
+    Dos resultados compactos (src.results) conta só a memória própria;
+    arrays partilhados (ex.: os frames selecionados) contam uma vez.
+    """
+
+    if seen is None:
+        seen = set()
+
+    if isinstance(obj, KPIResult):
+        return obj.nbytes(seen)
+    if isinstance(obj, np.ndarray):
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        return obj.nbytes
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(np.sum(obj.memory_usage(deep=True)))
+    if isinstance(obj, dict):
+        return sum(
+            estimate_nbytes(k, seen) + estimate_nbytes(v, seen)
+            for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple)):
+        return sum(estimate_nbytes(v, seen) for v in obj)
+
+    return sys.getsizeof(obj)
+
+
+# ==================================================
+# LRU LIMITADA POR MEMÓRIA
+# ==================================================
+class LRUCache:
+    """
+    Cache LRU com limite de memória total (e opcionalmente de entradas).
+
+    Partilhável entre sessões Streamlit (st.cache_resource): as
+    operações são protegidas por um lock.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 2**20,
+        max_entries: int | None = None
+    ):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value) -> None:
+        size = estimate_nbytes(value)
+
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+
+            # resultados maiores do que a cache inteira não são guardados
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            self._evict()
+
+    def get_or_compute(self, key, compute):
+        """Devolve o valor em cache ou calcula-o com compute() e guarda-o."""
+
+        sentinel = object()
+        value = self.get(key, sentinel)
+
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _over_limit(self) -> bool:
+        if self.nbytes > self.max_bytes:
+            return True
+        return self.max_entries is not None and len(self) > self.max_entries
+
+    def _evict(self) -> None:
+        while self._entries and self._over_limit():
+            _, (_, size) = self._entries.popitem(last=False)
+            self.nbytes -= size
@@ -0,0 +1,168 @@
+# =====================================================
+# COLUMN STORE — ACESSO MEMORY-MAPPED ÀS COLUNAS DE TRACKING
+# =====================================================
+
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data_loading import (
+    DATA_CACHE_PATH,
+    DATA_RAW_PATH,
+    DATASET_FILES,
+    ensure_cache,
+)
+
+
+class ColumnStore(Mapping):
+    """
+    Vista colunar sobre a cache .npy de um dataset de tracking.
+
+    Cada coluna é um array contíguo (float32 para posições/velocidades)
+    aberto com np.memmap: nada é lido do disco até ser usado, pelo que
+    abrir um arquivo de vários GB é praticamente instantâneo.
+
+    Acesso compatível com os KPIs de src.kpis:
+    - store["#x0"]  -> array NumPy (memmap, sem cópia)
+    - store.columns -> lista de colunas
+
+    Colunas categóricas (ex.: 'contexto') são devolvidas como
+    pd.Categorical sobre os códigos inteiros da cache.
+    """
+
+    def __init__(
+        self,
+        columns: dict,
+        n_rows: int,
+        rows=None,
+        extra: dict | None = None
+    ):
+        self._columns = columns
+        self._n_rows = n_rows
+        self._rows = rows
+        # colunas já alinhadas com a seleção atual (ver with_column)
+        self._extra = extra or {}
+
+    # --------------------------------------------------
+    # CONSTRUÇÃO
+    # --------------------------------------------------
+    @classmethod
+    def from_cache(cls, cache_dir: Path, meta: dict) -> "ColumnStore":
+        columns = {}
+
+        for entry in meta["columns"]:
+            values = np.load(
+                Path(cache_dir) / entry["file"],
+                mmap_mode="r",
+                allow_pickle=False
+            )
+
+            if "categories" in entry:
+                # convertido em pd.Categorical apenas no acesso
+                values = (values, entry["categories"])
+
+            columns[entry["name"]] = values
+
+        return cls(columns, meta["n_rows"])
+
+    # --------------------------------------------------
+    # INTERFACE MAPPING
+    # --------------------------------------------------
+    def __getitem__(self, name: str):
+        if name in self._extra:
+            return self._extra[name]
+
+        values = self._columns[name]
+
+        if isinstance(values, tuple):
+            codes, categories = values
+            return pd.Categorical.from_codes(
+                self._apply_rows(codes), categories=categories
+            )
+
+        return self._apply_rows(values)
+
+    def __iter__(self):
+        yield from self._columns
+        yield from (c for c in self._extra if c not in self._columns)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    @property
+    def columns(self) -> list[str]:
+        return list(iter(self))
+
+    @property
+    def n_rows(self) -> int:
+        if self._rows is None:
+            return self._n_rows
+        if isinstance(self._rows, slice):
+            return len(range(self._n_rows)[self._rows])
+        return len(self._rows)
+
+    # --------------------------------------------------
+    # SELEÇÃO DE LINHAS E NOVAS COLUNAS
+    # --------------------------------------------------
+    def _apply_rows(self, values: np.ndarray) -> np.ndarray:
+        if self._rows is None:
+            return values
+        return values[self._rows]
+
+    def select(self, rows) -> "ColumnStore":
+        """
+        Restringe as linhas (slice, máscara booleana ou índices).
+
+        A seleção só é aplicada quando uma coluna é pedida: slices
+        continuam a ser vistas sobre o memmap (zero-cópia); máscaras e
+        índices copiam apenas as colunas efetivamente usadas.
+        """
+
+        if not isinstance(rows, slice):
+            rows = np.asarray(rows)
+            if rows.dtype == bool:
+                rows = np.flatnonzero(rows)
+
+        extra = {name: values[rows] for name, values in self._extra.items()}
+
+        if self._rows is not None:
+            rows = np.arange(self._n_rows)[self._rows][rows]
+
+        return ColumnStore(self._columns, self._n_rows, rows, extra)
+
+    def with_column(self, name: str, values) -> "ColumnStore":
+        """
+        Devolve um novo store com uma coluna adicional, alinhada com as
+        linhas já selecionadas. As restantes colunas são partilhadas.
+        """
+
+        if len(values) != self.n_rows:
+            raise ValueError(
+                f"Coluna '{name}' com {len(values)} linhas; "
+                f"esperadas {self.n_rows}."
+            )
+
+        return ColumnStore(
+            self._columns,
+            self._n_rows,
+            self._rows,
+            {**self._extra, name: values}
+        )
+
+
+def open_column_store(
+    name: str = "X_train",
+    raw_path: Path = DATA_RAW_PATH,
+    cache_root: Path = DATA_CACHE_PATH
+) -> ColumnStore:
+    """
+    Abre um split (X_train, X_test, ...) como ColumnStore memory-mapped.
+    Constrói a cache colunar na primeira utilização.
+    """
+
+    cache_dir, meta = ensure_cache(
+        Path(raw_path) / DATASET_FILES[name], cache_root
+    )
+    return ColumnStore.from_cache(cache_dir, meta)
@@ -1,23 +1,404 @@
+import hashlib
+import json
+import os
+import re
+from collections.abc import Mapping
+
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
+from src.instrumentation import instrument, mark_cache
+
 # raiz do projeto (independente do local de execução)
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_RAW_PATH = PROJECT_ROOT / "data" / "raw"
+DATA_CACHE_PATH = PROJECT_ROOT / "data" / "processed" / "cache"
+
+DATASET_FILES = {
+    "X_train": "handball_X_train.csv",
+    "X_test": "handball_X_test.csv",
+    "y_train": "handball_y_train.csv",
+    "y_test": "handball_y_test.csv",
+}
+
+# Colunas de tracking convertidas para float32 (#x0, #vy3, #ball_x, ...)
+FLOAT32_COLUMNS = re.compile(r"^#(x|y|vx|vy)\d+$|^#ball_")
+
+# Incrementar sempre que o formato da cache mudar
+CACHE_FORMAT_VERSION = 2
+
+# Coluna de contexto (Treino/Jogo), mantida em qualquer projeção
+CONTEXT_COLUMN = "contexto"
+
+
+# ==================================================
+# IDENTIFICAÇÃO DO FICHEIRO FONTE
+# ==================================================
+def file_hash(path: Path, block_size: int = 1 << 20) -> str:
+    """
+    Hash SHA-1 do conteúdo de um ficheiro, lido em blocos.
+    """
+
+    digest = hashlib.sha1()
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def _source_signature(path: Path) -> dict:
+    stat = path.stat()
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+# ==================================================
+# CACHE COLUNAR (.npy POR COLUNA)
+# ==================================================
+def source_key(path: Path) -> str:
+    """
+    Nome da pasta de um CSV nas caches: <nome>-<8 hex do SHA-1 do
+    caminho absoluto>. CSVs com o mesmo nome em pastas diferentes (ex.:
+    jogos/*/handball_X_train.csv) ficam em pastas distintas.
+    """
+
+    path = Path(path)
+    digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()
+
+    return f"{path.stem}-{digest[:8]}"
+
+
+def _cache_dir(path: Path, cache_root: Path) -> Path:
+    return Path(cache_root) / source_key(path)
+
+
+def _read_cache_meta(cache_dir: Path) -> dict | None:
+    try:
+        with open(cache_dir / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get("version") != CACHE_FORMAT_VERSION:
+        return None
+
+    return meta
+
+
+def _write_cache_meta(cache_dir: Path, meta: dict) -> None:
+    """meta.json escrito de forma atómica (ficheiro temporário + rename)."""
+
+    tmp = cache_dir / "meta.json.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, cache_dir / "meta.json")
 
 
-def load_datasets():
+def _cache_is_valid(path: Path, cache_dir: Path, meta: dict | None) -> bool:
+    """
+    A cache é válida se tamanho e mtime coincidirem com o ficheiro fonte.
+    Se apenas o mtime mudou (ex.: ficheiro copiado, git checkout),
+    confirma pelo hash e guarda o novo mtime no meta.json, para que as
+    aberturas seguintes não voltem a ler o CSV inteiro.
+    """
+
+    if meta is None:
+        return False
+
+    signature = _source_signature(path)
+    source = meta["source"]
+
+    if source["size"] != signature["size"]:
+        return False
+
+    if source["mtime_ns"] == signature["mtime_ns"]:
+        return True
+
+    if source["sha1"] != file_hash(path):
+        return False
+
+    source["mtime_ns"] = signature["mtime_ns"]
+    try:
+        _write_cache_meta(cache_dir, meta)
+    except OSError:
+        # cache só de leitura: continua válida, volta a confirmar depois
+        pass
+
+    return True
+
+
+def _downcast(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte as colunas de posição, velocidade e bola para float32.
+    """
+
+    columns = [
+        c for c in df.columns
+        if FLOAT32_COLUMNS.match(c) and pd.api.types.is_numeric_dtype(df[c])
+    ]
+
+    if columns:
+        df[columns] = df[columns].astype(np.float32)
+
+    return df
+
+
+def _write_cache(df: pd.DataFrame, path: Path, cache_dir: Path) -> None:
+    """
+    Escreve um ficheiro .npy por coluna e um meta.json descritivo.
+
+    Colunas não numéricas são guardadas como códigos inteiros
+    (categorias no meta.json), evitando arrays de objetos Python.
+    """
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        entry = {"name": name, "file": f"{i}.npy"}
+
+        if pd.api.types.is_numeric_dtype(series):
+            values = series.to_numpy()
+        else:
+            codes, categories = pd.factorize(series)
+            values = codes.astype(np.int32)
+            entry["categories"] = [str(c) for c in categories]
+
+        np.save(cache_dir / entry["file"], values, allow_pickle=False)
+        entry["dtype"] = str(values.dtype)
+        columns.append(entry)
+
+    meta = {
+        "version": CACHE_FORMAT_VERSION,
+        "source": {**_source_signature(path), "sha1": file_hash(path)},
+        "n_rows": len(df),
+        "columns": columns,
+    }
+
+    # meta.json escrito por último: só marca a cache como válida no fim
+    _write_cache_meta(cache_dir, meta)
+
+
+def _read_cache(
+    cache_dir: Path,
+    meta: dict,
+    usecols: list[str] | None = None
+) -> pd.DataFrame:
+    data = {}
+
+    for entry in meta["columns"]:
+        if usecols is not None and entry["name"] not in usecols:
+            continue
+
+        values = np.load(cache_dir / entry["file"], allow_pickle=False)
+
+        if "categories" in entry:
+            values = pd.Categorical.from_codes(
+                values, categories=entry["categories"]
+            )
+
+        data[entry["name"]] = values
+
+    return pd.DataFrame(data, copy=False)
+
+
+def _project(df: pd.DataFrame, usecols: list[str] | None) -> pd.DataFrame:
+    if usecols is None:
+        return df
+    return df[[c for c in df.columns if c in usecols]]
+
+
+@instrument("data_loading.read_csv_cached")
+def read_csv_cached(
+    path: Path,
+    cache_root: Path = DATA_CACHE_PATH,
+    use_cache: bool = True,
+    usecols: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Lê um CSV de tracking através da cache colunar.
+
+    - 1.ª leitura: pd.read_csv, downcast para float32 e escrita da cache
+    - Leituras seguintes: carrega os .npy (sem parsing de texto)
+    - A cache é invalidada quando tamanho/mtime/hash do CSV mudam
+
+    `usecols` limita as colunas devolvidas (a coluna 'contexto' é
+    sempre mantida, se existir). Com cache válida só são lidos os
+    .npy dessas colunas.
+    """
+
+    path = Path(path)
+
+    if usecols is not None:
+        usecols = list(usecols) + [CONTEXT_COLUMN]
+
+    if not use_cache:
+        df = pd.read_csv(
+            path,
+            usecols=(lambda c: c in usecols) if usecols is not None else None
+        )
+        return _downcast(df)
+
+    cache_dir = _cache_dir(path, cache_root)
+    meta = _read_cache_meta(cache_dir)
+
+    if _cache_is_valid(path, cache_dir, meta):
+        mark_cache(hit=True)
+        return _read_cache(cache_dir, meta, usecols)
+
+    mark_cache(hit=False)
+
+    # A cache guarda sempre o ficheiro completo, para servir
+    # projeções futuras diferentes
+    df = _downcast(pd.read_csv(path))
+    _write_cache(df, path, cache_dir)
+
+    return _project(df, usecols)
+
+
+def source_fingerprint(
+    path: Path,
+    cache_root: Path = DATA_CACHE_PATH
+) -> str:
+    """
+    Identificador estável do conteúdo de um CSV (SHA-1).
+
+    Reutiliza o hash guardado na cache colunar quando esta é válida,
+    evitando reler o ficheiro a cada pedido.
+    """
+
+    path = Path(path)
+    cache_dir = _cache_dir(path, cache_root)
+    meta = _read_cache_meta(cache_dir)
+
+    if _cache_is_valid(path, cache_dir, meta):
+        return meta["source"]["sha1"]
+
+    return file_hash(path)
+
+
+def ensure_cache(
+    path: Path,
+    cache_root: Path = DATA_CACHE_PATH
+) -> tuple[Path, dict]:
+    """
+    Garante que existe uma cache colunar válida para o CSV e devolve
+    (pasta da cache, meta). Não carrega o DataFrame se a cache já existir.
+    """
+
+    path = Path(path)
+    cache_dir = _cache_dir(path, cache_root)
+    meta = _read_cache_meta(cache_dir)
+
+    if not _cache_is_valid(path, cache_dir, meta):
+        _write_cache(_downcast(pd.read_csv(path)), path, cache_dir)
+        meta = _read_cache_meta(cache_dir)
+
+    return cache_dir, meta
+
+
+def read_csv_chunks(
+    path: Path,
+    chunksize: int = 100_000,
+    usecols: list[str] | None = None
+):
+    """
+    Lê um CSV de tracking por blocos de `chunksize` linhas, com o mesmo
+    downcast para float32 da cache (resultados idênticos à leitura
+    completa). Não usa nem escreve a cache.
+    """
+
+    if usecols is not None:
+        usecols = list(usecols) + [CONTEXT_COLUMN]
+
+    reader = pd.read_csv(
+        path,
+        chunksize=chunksize,
+        usecols=(lambda c: c in usecols) if usecols is not None else None
+    )
+
+    with reader:
+        for chunk in reader:
+            yield _downcast(chunk)
+
+
+# ==================================================
+# CARREGAMENTO PREGUIÇOSO (LAZY) DOS DATASETS
+# ==================================================
+class LazyDatasets(Mapping):
+    """
+    Dicionário de datasets que só lê cada ficheiro no primeiro acesso.
+
+    `usecols` aplica-se apenas aos splits de tracking (X_*);
+    os splits de labels (y_*) são sempre lidos por inteiro.
+    """
+
+    def __init__(
+        self,
+        raw_path: Path = DATA_RAW_PATH,
+        use_cache: bool = True,
+        usecols: list[str] | None = None
+    ):
+        self.raw_path = Path(raw_path)
+        self.use_cache = use_cache
+        self.usecols = usecols
+        self._loaded = {}
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        if name not in DATASET_FILES:
+            raise KeyError(name)
+
+        if name not in self._loaded:
+            self._loaded[name] = read_csv_cached(
+                self.raw_path / DATASET_FILES[name],
+                use_cache=self.use_cache,
+                usecols=self.usecols if name.startswith("X_") else None
+            )
+
+        return self._loaded[name]
+
+    def __iter__(self):
+        return iter(DATASET_FILES)
+
+    def __len__(self) -> int:
+        return len(DATASET_FILES)
+
+    def loaded(self) -> list[str]:
+        """Splits já carregados em memória."""
+        return list(self._loaded)
+
+
+@instrument("data_loading.load_datasets")
+def load_datasets(
+    use_cache: bool = True,
+    lazy: bool = False,
+    kpis: list[str] | None = None
+):
     """
     Carrega os datasets de andebol a partir da pasta data/raw.
     Retorna um dicionário com os DataFrames.
+
+    Por defeito usa a cache colunar em data/processed/cache.
+
+    - lazy=True: devolve um LazyDatasets (cada split lido no 1.º acesso)
+    - kpis=["pi3", ...]: lê apenas as colunas de tracking necessárias
+      para esses indicadores (ver src.kpis.KPI_COLUMNS)
     """
-    print(">>> DATA_RAW_PATH:", DATA_RAW_PATH)
 
-    datasets = {}
+    usecols = None
+    if kpis is not None:
+        from src.kpis import required_columns
+        usecols = required_columns(kpis)
+
+    datasets = LazyDatasets(use_cache=use_cache, usecols=usecols)
 
-    datasets["X_train"] = pd.read_csv(DATA_RAW_PATH / "handball_X_train.csv")
-    datasets["X_test"] = pd.read_csv(DATA_RAW_PATH / "handball_X_test.csv")
-    datasets["y_train"] = pd.read_csv(DATA_RAW_PATH / "handball_y_train.csv")
-    datasets["y_test"] = pd.read_csv(DATA_RAW_PATH / "handball_y_test.csv")
+    if lazy:
+        return datasets
 
-    return datasets
+    return {name: datasets[name] for name in datasets}
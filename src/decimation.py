@@ -0,0 +1,93 @@
+# =====================================================
+# DECIMAÇÃO DE SÉRIES TEMPORAIS (PI 2 / PI 4)
+# =====================================================
+#
+# Um jogo completo tem centenas de milhares de frames, mas um gráfico
+# só mostra ~1–2 mil pontos distintos na horizontal. As séries são
+# reduzidas a esse orçamento antes de desenhar: LTTB para a linha e um
+# envelope mín/máx por bucket para que nenhum pico desapareça.
+#
+# Só depende de NumPy: os resultados dos KPIs (src.results) reduzem as
+# séries sem importar o módulo de visualizações.
+
+import numpy as np
+
+
+MAX_POINTS = 2000
+
+
+def _bucket_edges(n: int, n_buckets: int, start: int = 0) -> np.ndarray:
+    return np.linspace(start, n, n_buckets + 1).astype(np.int64)
+
+
+def lttb_indices(y, max_points: int = MAX_POINTS) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: índices de até max_points pontos de
+    `y` (x = índice do frame) que preservam a forma visual da série.
+    O primeiro, o último e o máximo global são sempre mantidos.
+    """
+
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+
+    y = np.nan_to_num(y, nan=0.0)
+
+    # buckets interiores (o primeiro e o último ponto são fixos)
+    edges = _bucket_edges(n - 1, max_points - 2, start=1)
+    lengths = np.diff(edges)
+    bucket_x = (edges[:-1] + edges[1:] - 1) / 2
+    bucket_y = np.add.reduceat(y, edges[:-1]) / lengths
+
+    # média do bucket seguinte (o último é o ponto final)
+    next_x = np.append(bucket_x[1:], n - 1)
+    next_y = np.append(bucket_y[1:], y[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        xs = np.arange(lo, hi)
+        area = np.abs(
+            (a - next_x[i]) * (y[lo:hi] - y[a])
+            - (a - xs) * (next_y[i] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+
+    peak = int(np.argmax(y))
+    if peak not in selected:
+        selected = np.sort(np.append(selected, peak))
+
+    return selected
+
+
+def minmax_envelope(y, n_buckets: int = MAX_POINTS // 2):
+    """
+    Mínimo e máximo de `y` por bucket de frames (NaN ignorados).
+    Devolve (x, lo, hi), com x o centro de cada bucket.
+    """
+
+    y = np.asarray(y)
+    n = len(y)
+    n_buckets = max(1, min(n_buckets, n))
+
+    edges = _bucket_edges(n, n_buckets)
+    lo = np.fmin.reduceat(y, edges[:-1])
+    hi = np.fmax.reduceat(y, edges[:-1])
+    x = (edges[:-1] + edges[1:] - 1) / 2
+
+    return x, lo, hi
+
+
+def decimate_series(y, max_points: int = MAX_POINTS):
+    """(x, y) reduzidos por LTTB; sem alterações se já couberem."""
+
+    y = np.asarray(y)
+    idx = lttb_indices(y, max_points)
+
+    return idx, y[idx]
@@ -0,0 +1,126 @@
+# =====================================================
+# DENSIDADE — KDE BINNED PARA O PI 1
+# =====================================================
+
+import numpy as np
+
+
+def _linear_binning(values: np.ndarray, lo: float, hi: float, gridsize: int):
+    """
+    Posição de cada valor na grelha de `gridsize` nós em [lo, hi]:
+    índice do nó à esquerda e peso atribuído ao nó à direita.
+    """
+
+    if hi > lo:
+        position = (values - lo) / (hi - lo) * (gridsize - 1)
+    else:
+        position = np.zeros_like(values, dtype=float)
+
+    left = np.clip(np.floor(position).astype(np.int64), 0, gridsize - 2)
+    weight = position - left
+
+    return left, weight
+
+
+def binned_kde(
+    x: np.ndarray,
+    y: np.ndarray,
+    gridsize: int = 120,
+    bw_method: float = 0.25
+) -> dict:
+    """
+    Estimativa de densidade gaussiana 2D em grelha (KDE binned).
+
+    Equivalente a scipy.stats.gaussian_kde(bw_method=...) avaliada numa
+    grelha gridsize × gridsize sobre [min, max] de x e y, mas:
+    - usa todos os pontos (sem subamostragem aleatória): determinística
+    - cada ponto é distribuído pelos 4 nós vizinhos (binning linear) e a
+      grelha é convoluída com o kernel gaussiano por FFT
+    - custo O(N + G² log G) em vez de O(N × G²)
+
+    A covariância do kernel é a dos dados × bw_method², como no scipy.
+    Devolve {"density": grelha [ix, iy], "extent": (x0, x1, y0, y1)}.
+    Lança ValueError se houver menos de 2 pontos ou covariância singular.
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    n = len(x)
+
+    if n < 2:
+        raise ValueError("São necessários pelo menos 2 pontos para o KDE.")
+
+    cov = np.cov(np.vstack([x, y])) * bw_method**2
+    det = np.linalg.det(cov)
+
+    if not np.isfinite(det) or det <= 0:
+        raise ValueError("Covariância singular: posições sem dispersão.")
+
+    extent = (x.min(), x.max(), y.min(), y.max())
+
+    # ---------- Binning linear ----------
+    ix, wx = _linear_binning(x, extent[0], extent[1], gridsize)
+    iy, wy = _linear_binning(y, extent[2], extent[3], gridsize)
+
+    counts = np.zeros(gridsize * gridsize)
+    for dx, fx in [(0, 1 - wx), (1, wx)]:
+        for dy, fy in [(0, 1 - wy), (1, wy)]:
+            counts += np.bincount(
+                (ix + dx) * gridsize + (iy + dy),
+                weights=fx * fy,
+                minlength=gridsize * gridsize
+            )
+    counts = counts.reshape(gridsize, gridsize)
+
+    return kde_from_counts(counts, extent, cov, n)
+
+
+def kde_from_counts(
+    counts: np.ndarray,
+    extent: tuple,
+    cov: np.ndarray,
+    n: int
+) -> dict:
+    """
+    Convolução de contagens já agregadas numa grelha regular (nós de
+    extent[0]..extent[1] × extent[2]..extent[3]) com o kernel gaussiano
+    de covariância `cov`, normalizada por `n` pontos.
+
+    Permite somar contagens de vários blocos (ex.: células do cubo de
+    KPIs, src.kpi_cube) e só depois suavizar. Mesmo formato de saída
+    que binned_kde; ValueError se a covariância for singular.
+    """
+
+    det = np.linalg.det(cov)
+    if not np.isfinite(det) or det <= 0:
+        raise ValueError("Covariância singular: posições sem dispersão.")
+
+    nx, ny = counts.shape
+
+    # ---------- Kernel gaussiano nos desvios da grelha ----------
+    step_x = (extent[1] - extent[0]) / max(nx - 1, 1)
+    step_y = (extent[3] - extent[2]) / max(ny - 1, 1)
+    dx, dy = np.meshgrid(
+        np.arange(-(nx - 1), nx) * step_x,
+        np.arange(-(ny - 1), ny) * step_y,
+        indexing="ij"
+    )
+
+    inv = np.linalg.inv(cov)
+    quad = inv[0, 0] * dx**2 + 2 * inv[0, 1] * dx * dy + inv[1, 1] * dy**2
+    kernel = np.exp(-0.5 * quad) / (2 * np.pi * np.sqrt(det))
+
+    # ---------- Convolução linear por FFT ----------
+    shape = (2 * nx - 1 + nx - 1, 2 * ny - 1 + ny - 1)
+    full = np.fft.irfft2(
+        np.fft.rfft2(counts, shape) * np.fft.rfft2(kernel, shape),
+        shape
+    )
+    density = full[nx - 1:2 * nx - 1, ny - 1:2 * ny - 1] / n
+
+    return {
+        "density": np.maximum(density, 0),
+        "extent": extent
+    }
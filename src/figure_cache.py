@@ -0,0 +1,61 @@
+# =====================================================
+# CACHE DE FIGURAS — PNG / PLOTLY JSON JÁ SERIALIZADOS
+# =====================================================
+#
+# Cada figura do dashboard depende apenas do resultado dos KPIs (que a
+# DatasetFingerprint identifica), do tipo de figura e da escala. Guardar
+# a figura já serializada evita reconstruí-la (KDE, px.imshow, ...) em
+# cada rerun do Streamlit: mudar de escala ou de persona e voltar atrás
+# serve os bytes em cache.
+
+import io
+import json
+
+from src.cache import LRUCache
+
+
+def figure_to_png(fig, dpi: float = 100) -> bytes:
+    """Rasteriza uma figura matplotlib para PNG e liberta-a."""
+
+    import matplotlib.pyplot as plt
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
+
+    return buffer.getvalue()
+
+
+class FigureCache(LRUCache):
+    """
+    LRU limitada por memória de figuras serializadas, com chave
+    (fingerprint dos KPIs, tipo de figura, escala).
+
+    - png(): figuras matplotlib, rasterizadas com dpi proporcional à
+      escala
+    - plotly(): figuras Plotly, guardadas como JSON e devolvidas como
+      dicionário (aceite por st.plotly_chart)
+
+    `build` só é chamado quando a figura não está em cache.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2**20, **kwargs):
+        super().__init__(max_bytes=max_bytes, **kwargs)
+
+    @staticmethod
+    def key(fingerprint, figure: str, scale: float, kind: str) -> tuple:
+        """Chave de uma figura; kind é "png" ou "plotly"."""
+        return fingerprint, figure, scale, kind
+
+    def png(self, fingerprint, figure: str, scale: float, build) -> bytes:
+        return self.get_or_compute(
+            self.key(fingerprint, figure, scale, "png"),
+            lambda: figure_to_png(build(), dpi=100 * scale)
+        )
+
+    def plotly(self, fingerprint, figure: str, scale: float, build) -> dict:
+        spec = self.get_or_compute(
+            self.key(fingerprint, figure, scale, "plotly"),
+            lambda: build().to_json()
+        )
+        return json.loads(spec)
@@ -0,0 +1,489 @@
+# =====================================================
+# GEOMETRIA GUARDA-REDES–BOLA — MOTOR VETORIZADO POR FRAME
+# =====================================================
+#
+# Para cada frame, a partir de #x0/#y0 (guarda-redes) e #ball_x/#ball_y:
+# - distância do guarda-redes à bola (m)
+# - ângulo de remate: ângulo entre os dois postes visto da bola (graus)
+# - desvio à bissetriz: distância (m) e ângulo (graus) do guarda-redes à
+#   bissetriz do ângulo de remate, negativos para o lado do poste mais
+#   próximo da bola
+# - cobertura do 1.º / 2.º poste: fração de cada metade do ângulo de
+#   remate tapada pelo guarda-redes (um disco de raio `reach`)
+#
+# Só operações NumPy sobre colunas, em float32 e por blocos de
+# GEOMETRY_BLOCK frames (os temporários ficam em cache do CPU). Os
+# resumos (médias, % de frames na bissetriz, histograma do desvio) são
+# somas: acumulam-se por blocos de leitura (GeometryAccumulator,
+# stream_geometry) e respondem a intervalos de frames a partir de somas
+# cumulativas (GeometryRangeIndex).
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.heatmap import COURT_LENGTH, COURT_WIDTH
+from src.instrumentation import instrument
+from src.kpis import column_array
+from src.streaming import iter_chunks, select_context
+
+
+# Baliza de andebol (metros)
+GOAL_WIDTH = 3.0
+
+# raio coberto pelo guarda-redes (braços / passo lateral, m)
+KEEPER_REACH = 1.0
+
+# |desvio| até ao qual o guarda-redes conta como "na bissetriz" (m)
+BISECTOR_TOLERANCE = 0.5
+
+# histograma do desvio à bissetriz: classes de 0.5 m entre -3 e 3 m
+# (mais as duas classes abertas nas pontas)
+DEVIATION_EDGES = np.linspace(-3.0, 3.0, 13)
+
+GEOMETRY_COLUMNS = ["#x0", "#y0", "#ball_x", "#ball_y"]
+
+GEOMETRY_METRICS = (
+    "distance",
+    "shooting_angle",
+    "bisector_deviation",
+    "bisector_angle",
+    "near_post_coverage",
+    "far_post_coverage",
+)
+
+# frames por bloco interno (4 colunas float32 de 1 MB cada)
+GEOMETRY_BLOCK = 1 << 18
+
+
+@dataclass(frozen=True)
+class Goal:
+    """
+    Baliza defendida, em metros: linha de golo em x = line_x, centrada
+    em y = center_y, com `width` entre postes.
+
+    `scale` converte as coordenadas do tracking para metros; por
+    defeito são metros. Para coordenadas normalizadas em [0, 1] (como
+    handball_X_*) usar Goal.normalized().
+    """
+
+    line_x: float = 0.0
+    center_y: float = COURT_WIDTH / 2
+    width: float = GOAL_WIDTH
+    scale: tuple[float, float] = (1.0, 1.0)
+
+    @classmethod
+    def normalized(cls, right: bool = False) -> "Goal":
+        """Baliza da esquerda (x = 0) ou da direita, em coordenadas [0, 1]."""
+
+        return cls(
+            line_x=COURT_LENGTH if right else 0.0,
+            scale=(COURT_LENGTH, COURT_WIDTH)
+        )
+
+    @property
+    def posts(self) -> tuple[tuple[float, float], tuple[float, float]]:
+        half = self.width / 2
+        return (
+            (self.line_x, self.center_y - half),
+            (self.line_x, self.center_y + half)
+        )
+
+
+DEFAULT_GOAL = Goal.normalized()
+
+
+# ==================================================
+# GEOMETRIA POR FRAME
+# ==================================================
+def _geometry_block(kx, ky, bx, by, goal: Goal, reach: float) -> dict:
+    """Métricas de um bloco; entradas já em metros (float32)."""
+
+    f32 = np.float32
+
+    # vetores bola -> postes: (dx, a1) e (dx, a2)
+    dx = f32(goal.line_x) - bx
+    a1 = f32(goal.posts[0][1]) - by
+    a2 = a1 + f32(goal.width)
+    n1 = np.hypot(dx, a1)
+    n2 = np.hypot(dx, a2)
+
+    # ângulo entre os postes: |u1 × u2| = |dx| · largura
+    angle = np.arctan2(np.abs(dx) * f32(goal.width), dx * dx + a1 * a2)
+
+    # bissetriz = soma dos vetores unitários para os postes
+    ex = dx / n1 + dx / n2
+    ey = a1 / n1 + a2 / n2
+    ne = np.hypot(ex, ey)
+
+    # guarda-redes no referencial (bissetriz, perpendicular)
+    gx = kx - bx
+    gy = ky - by
+    distance = np.hypot(gx, gy)
+    across = (ex * gy - ey * gx) / ne
+    along = (ex * gx + ey * gy) / ne
+
+    # sinal: negativo para o lado do poste mais próximo da bola
+    post1_negative = (ex * a1 - ey * dx) < 0
+    orient = np.where((n1 <= n2) == post1_negative, f32(1), f32(-1))
+
+    deviation = orient * across
+    phi = orient * np.arctan2(across, along)
+
+    # cobertura: o disco do guarda-redes tapa [phi - beta, phi + beta];
+    # metade do 1.º poste = [-half, 0], do 2.º poste = [0, half]
+    half = angle / 2
+    beta = np.arcsin(np.minimum(reach / distance, f32(1)))
+    lo = phi - beta
+    hi = phi + beta
+    near = np.maximum(np.minimum(hi, 0) - np.maximum(lo, -half), 0) / half
+    far = np.maximum(np.minimum(hi, half) - np.maximum(lo, 0), 0) / half
+
+    return {
+        "distance": distance,
+        "shooting_angle": np.degrees(angle),
+        "bisector_deviation": deviation,
+        "bisector_angle": np.degrees(phi),
+        "near_post_coverage": near,
+        "far_post_coverage": far,
+    }
+
+
+def geometry_arrays(
+    keeper_x,
+    keeper_y,
+    ball_x,
+    ball_y,
+    goal: Goal = DEFAULT_GOAL,
+    reach: float = KEEPER_REACH
+) -> dict:
+    """
+    Métricas GR–bola de cada frame a partir das quatro coordenadas.
+
+    Devolve {métrica: array float32} (ver GEOMETRY_METRICS). Frames
+    com coordenadas em falta, ou com a bola sobre a linha de golo fora
+    da baliza (ângulo nulo), dão NaN.
+    """
+
+    columns = [np.asarray(c) for c in (keeper_x, keeper_y, ball_x, ball_y)]
+    n = len(columns[0])
+
+    if any(len(c) != n for c in columns):
+        raise ValueError("As coordenadas devem ter o mesmo número de frames.")
+
+    sx, sy = (np.float32(s) for s in goal.scale)
+    scales = [sx, sy, sx, sy]
+    out = {name: np.empty(n, dtype=np.float32) for name in GEOMETRY_METRICS}
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for start in range(0, n, GEOMETRY_BLOCK):
+            rows = slice(start, start + GEOMETRY_BLOCK)
+            block = _geometry_block(
+                *(c[rows].astype(np.float32) * s
+                  for c, s in zip(columns, scales)),
+                goal,
+                np.float32(reach)
+            )
+            for name, values in block.items():
+                out[name][rows] = values
+
+    return out
+
+
+@instrument("geometry.frames")
+def goalkeeper_geometry(
+    X,
+    goal: Goal = DEFAULT_GOAL,
+    reach: float = KEEPER_REACH,
+    frames=None
+) -> dict:
+    """
+    Geometria GR–bola de cada frame de X (DataFrame ou ColumnStore),
+    ou só dos `frames` indicados (filtro por label, ver src.labels).
+
+    Persona: Treinador de Guarda-Redes
+    """
+
+    missing = [c for c in GEOMETRY_COLUMNS if c not in X.columns]
+    if missing:
+        raise ValueError(
+            f"Colunas {missing} não encontradas para a geometria GR–bola."
+        )
+
+    return geometry_arrays(
+        *(column_array(X, c, frames) for c in GEOMETRY_COLUMNS),
+        goal,
+        reach
+    )
+
+
+# ==================================================
+# RESUMOS (SOMAS ADITIVAS)
+# ==================================================
+# colunas de uma linha de totais: somas e contagens por métrica,
+# soma de |desvio|, frames na bissetriz, histograma do desvio
+_N_METRICS = len(GEOMETRY_METRICS)
+_ABS_DEVIATION = 2 * _N_METRICS
+_ON_BISECTOR = _ABS_DEVIATION + 1
+_HISTOGRAM = _ON_BISECTOR + 1
+_N_TOTALS = _HISTOGRAM + len(DEVIATION_EDGES) + 1
+
+
+def _totals(
+    geometry: dict,
+    tolerance: float,
+    block: int | None = None
+) -> np.ndarray:
+    """
+    Totais por bloco de `block` frames (por defeito um só bloco):
+    array (n_blocks, _N_TOTALS) em float64. Frames depois do último
+    bloco completo são ignorados.
+    """
+
+    n = len(geometry["distance"])
+    block = block or max(n, 1)
+    n_blocks = n // block
+    totals = np.zeros((n_blocks, _N_TOTALS))
+
+    def blocks(values):
+        return values[:n_blocks * block].reshape(n_blocks, block)
+
+    for i, name in enumerate(GEOMETRY_METRICS):
+        values = blocks(geometry[name])
+        valid = ~np.isnan(values)
+        totals[:, i] = np.where(valid, values, 0).sum(axis=1, dtype=float)
+        totals[:, _N_METRICS + i] = valid.sum(axis=1)
+
+    deviation = blocks(geometry["bisector_deviation"])
+    valid = ~np.isnan(deviation)
+    magnitude = np.where(valid, np.abs(deviation), 0)
+    totals[:, _ABS_DEVIATION] = magnitude.sum(axis=1, dtype=float)
+    totals[:, _ON_BISECTOR] = (
+        valid & (magnitude <= tolerance)
+    ).sum(axis=1)
+
+    # histograma de todos os blocos num só bincount (id = bloco, classe)
+    n_bins = len(DEVIATION_EDGES) + 1
+    ids = (
+        np.arange(n_blocks)[:, None] * n_bins
+        + np.digitize(deviation, DEVIATION_EDGES)
+    )
+    totals[:, _HISTOGRAM:] = np.bincount(
+        ids[valid], minlength=n_blocks * n_bins
+    ).reshape(n_blocks, n_bins)
+
+    return totals
+
+
+def _summary(totals: np.ndarray, n_frames: int) -> dict:
+    """Resumo GR–bola a partir de uma linha de totais."""
+
+    sums = totals[:_N_METRICS]
+    counts = totals[_N_METRICS:_ABS_DEVIATION]
+    valid = int(counts[GEOMETRY_METRICS.index("bisector_deviation")])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+        mean_abs = totals[_ABS_DEVIATION] / valid
+        on_bisector = totals[_ON_BISECTOR] / valid * 100
+
+    summary = {"n_frames": int(n_frames), "valid_frames": valid}
+    summary.update({
+        f"mean_{name}": float(mean)
+        for name, mean in zip(GEOMETRY_METRICS, means)
+    })
+    summary.update({
+        "mean_abs_deviation": float(mean_abs),
+        "on_bisector_pct": float(on_bisector),
+        "deviation_histogram": totals[_HISTOGRAM:].astype(np.int64),
+        "deviation_edges": DEVIATION_EDGES,
+    })
+
+    return summary
+
+
+def geometry_summary(
+    geometry: dict,
+    tolerance: float = BISECTOR_TOLERANCE
+) -> dict:
+    """
+    Resumo das métricas por frame (saída de goalkeeper_geometry):
+    médias (ignoram NaN), desvio absoluto médio, % de frames com
+    |desvio| <= tolerance e histograma do desvio (DEVIATION_EDGES,
+    com classes abertas nas pontas).
+    """
+
+    totals = _totals(geometry, tolerance)
+    row = totals[0] if len(totals) else np.zeros(_N_TOTALS)
+
+    return _summary(row, len(geometry["distance"]))
+
+
+# ==================================================
+# STREAMING — BLOCOS DE LEITURA
+# ==================================================
+class GeometryAccumulator:
+    """
+    Resumo GR–bola acumulado por blocos (mesmo resultado de
+    geometry_summary sobre o dataset completo).
+    """
+
+    def __init__(
+        self,
+        goal: Goal = DEFAULT_GOAL,
+        reach: float = KEEPER_REACH,
+        tolerance: float = BISECTOR_TOLERANCE,
+        keep_series: bool = False
+    ):
+        self.goal = goal
+        self.reach = reach
+        self.tolerance = tolerance
+        self.totals = np.zeros(_N_TOTALS)
+        self.n_frames = 0
+        self.keep_series = keep_series
+        self._series = []
+
+    def update(self, X) -> None:
+        self.add(goalkeeper_geometry(X, self.goal, self.reach))
+
+    def add(self, geometry: dict) -> None:
+        """Junta métricas por frame já calculadas."""
+
+        n = len(geometry["distance"])
+        if n == 0:
+            return
+
+        self.totals += _totals(geometry, self.tolerance)[0]
+        self.n_frames += n
+
+        if self.keep_series:
+            self._series.append(geometry)
+
+    def merge(self, other: "GeometryAccumulator") -> None:
+        if (other.goal, other.reach, other.tolerance) != (
+            self.goal, self.reach, self.tolerance
+        ):
+            raise ValueError(
+                "Resumos com baliza, alcance ou tolerância diferentes "
+                "não são somáveis."
+            )
+        self.totals += other.totals
+        self.n_frames += other.n_frames
+        self._series += other._series
+
+    def result(self) -> dict:
+        result = _summary(self.totals, self.n_frames)
+
+        if self.keep_series:
+            result["geometry"] = {
+                name: (
+                    np.concatenate([s[name] for s in self._series])
+                    if self._series
+                    else np.array([], dtype=np.float32)
+                )
+                for name in GEOMETRY_METRICS
+            }
+
+        return result
+
+
+def stream_geometry(
+    source,
+    chunksize: int = 1_000_000,
+    context: str | None = None,
+    **kwargs
+) -> dict:
+    """
+    Resumo GR–bola numa leitura por blocos de `source` (caminho para
+    CSV, DataFrame ou ColumnStore), opcionalmente filtrado por contexto.
+    kwargs seguem para GeometryAccumulator.
+    """
+
+    accumulator = GeometryAccumulator(**kwargs)
+
+    for chunk in iter_chunks(source, chunksize, GEOMETRY_COLUMNS):
+        if context is not None:
+            chunk = select_context(chunk, context)
+        accumulator.update(chunk)
+
+    return accumulator.result()
+
+
+# ==================================================
+# INTERVALOS DE FRAMES — SOMAS CUMULATIVAS POR BLOCO
+# ==================================================
+class GeometryRangeIndex:
+    """
+    Métricas GR–bola de um dataset completo, com resumos de qualquer
+    intervalo [start, end) sem percorrer as linhas: os blocos completos
+    vêm das somas cumulativas e só as pontas (< 2 blocos) são somadas.
+
+        index = GeometryRangeIndex(X)
+        index.query(10_000, 250_000)["on_bisector_pct"]
+        index.query_ranges(sequences["start"], sequences["end"] + 1)
+    """
+
+    def __init__(
+        self,
+        X,
+        goal: Goal = DEFAULT_GOAL,
+        reach: float = KEEPER_REACH,
+        tolerance: float = BISECTOR_TOLERANCE,
+        block: int = 4096
+    ):
+        self.geometry = goalkeeper_geometry(X, goal, reach)
+        self.tolerance = tolerance
+        self.block = block
+
+        totals = _totals(self.geometry, tolerance, block)
+        self.cum = np.concatenate(
+            [np.zeros((1, _N_TOTALS)), np.cumsum(totals, axis=0)]
+        )
+
+    def __len__(self) -> int:
+        return len(self.geometry["distance"])
+
+    def _range_totals(self, start: int, end: int) -> np.ndarray:
+        n_blocks = len(self.cum) - 1
+        k0 = min(-(-start // self.block), n_blocks)
+        k1 = min(end // self.block, n_blocks)
+
+        if k0 >= k1:
+            k0 = k1 = 0
+            parts = [(start, end)]
+        else:
+            parts = [(start, k0 * self.block), (k1 * self.block, end)]
+
+        totals = self.cum[k1] - self.cum[k0]
+        for a, b in parts:
+            if b > a:
+                part = {
+                    name: values[a:b]
+                    for name, values in self.geometry.items()
+                }
+                totals = totals + _totals(part, self.tolerance)[0]
+
+        return totals
+
+    def query(self, start: int = 0, end: int | None = None) -> dict:
+        """Resumo (como geometry_summary) dos frames [start, end)."""
+
+        start, end, _ = slice(start, end).indices(len(self))
+        end = max(end, start)
+
+        return _summary(self._range_totals(start, end), end - start)
+
+    def query_ranges(self, starts, ends) -> pd.DataFrame:
+        """
+        Resumos escalares de vários intervalos (ex.: as sequências de
+        frame_sequences), uma linha por intervalo.
+        """
+
+        rows = []
+        for start, end in zip(np.asarray(starts), np.asarray(ends)):
+            summary = self.query(int(start), int(end))
+            del summary["deviation_histogram"], summary["deviation_edges"]
+            rows.append({"start": int(start), "end": int(end), **summary})
+
+        return pd.DataFrame(rows)
@@ -0,0 +1,185 @@
+# =====================================================
+# HEATMAPS — GRELHA FIXA EM COORDENADAS DO CAMPO
+# =====================================================
+#
+# Com arestas fixas (e não dependentes dos dados), heatmaps de jogos,
+# blocos ou processos diferentes podem ser somados, comparados e
+# guardados em cache.
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+# Campo de andebol (metros)
+COURT_LENGTH = 40.0
+COURT_WIDTH = 20.0
+
+# Coordenadas do tracking (handball_X_*): normalizadas em [0, 1]
+DATA_RANGE = (0.0, 1.0)
+
+
+@dataclass(frozen=True)
+class CourtGrid:
+    """
+    Grelha regular sobre o campo: [x0, x1] × [y0, y1] em bins_x × bins_y.
+
+    Por defeito cobre o campo nas unidades do tracking, normalizadas em
+    [0, 1]; em metros: CourtGrid((0, COURT_LENGTH), (0, COURT_WIDTH)).
+    """
+
+    x_range: tuple[float, float] = DATA_RANGE
+    y_range: tuple[float, float] = DATA_RANGE
+    bins_x: int = 10
+    bins_y: int = 10
+
+    @classmethod
+    def normalized(cls, bins_x: int = 10, bins_y: int = 10) -> "CourtGrid":
+        return cls(DATA_RANGE, DATA_RANGE, bins_x, bins_y)
+
+    @classmethod
+    def with_resolution(
+        cls,
+        cell_size: float,
+        x_range: tuple[float, float] = DATA_RANGE,
+        y_range: tuple[float, float] = DATA_RANGE
+    ) -> "CourtGrid":
+        """
+        Grelha com células de ~cell_size nas unidades de x_range/y_range
+        (ex.: 0.05 nos dados normalizados, 2.0 com os ranges em metros).
+        """
+
+        bins_x = max(1, round((x_range[1] - x_range[0]) / cell_size))
+        bins_y = max(1, round((y_range[1] - y_range[0]) / cell_size))
+
+        return cls(tuple(x_range), tuple(y_range), bins_x, bins_y)
+
+    @classmethod
+    def from_edges(cls, x_edges, y_edges) -> "CourtGrid":
+        """Grelha de um resultado do PI 3 (arestas regulares)."""
+
+        return cls(
+            (float(x_edges[0]), float(x_edges[-1])),
+            (float(y_edges[0]), float(y_edges[-1])),
+            len(x_edges) - 1,
+            len(y_edges) - 1
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.bins_x, self.bins_y
+
+    @property
+    def n_cells(self) -> int:
+        return self.bins_x * self.bins_y
+
+    @property
+    def x_edges(self) -> np.ndarray:
+        return np.linspace(*self.x_range, self.bins_x + 1)
+
+    @property
+    def y_edges(self) -> np.ndarray:
+        return np.linspace(*self.y_range, self.bins_y + 1)
+
+    def cell_ids(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Célula plana (ix * bins_y + iy) de cada ponto, com a convenção de
+        np.histogram2d (último bin fechado à direita); -1 fora da grelha
+        ou NaN.
+        """
+
+        ix = np.searchsorted(self.x_edges, x, side="right") - 1
+        iy = np.searchsorted(self.y_edges, y, side="right") - 1
+        ix[x == self.x_range[1]] = self.bins_x - 1
+        iy[y == self.y_range[1]] = self.bins_y - 1
+
+        inside = (
+            (ix >= 0) & (ix < self.bins_x) & (iy >= 0) & (iy < self.bins_y)
+        )
+
+        return np.where(inside, ix * self.bins_y + iy, -1).astype(np.int32)
+
+    def result(self, counts: np.ndarray, outside: int = 0) -> dict:
+        """Dicionário no formato do PI 3 (heatmap, x_edges, y_edges)."""
+
+        return {
+            "heatmap": counts,
+            "x_edges": self.x_edges,
+            "y_edges": self.y_edges,
+            "outside": int(outside)
+        }
+
+
+def grid_from_data(
+    x: np.ndarray,
+    y: np.ndarray,
+    bins_x: int = 10,
+    bins_y: int = 10
+) -> CourtGrid:
+    """
+    Grelha com as mesmas arestas que np.histogram2d escolheria para os
+    dados (mínimo/máximo, NaN ignorados). Útil para fixar as arestas de
+    um dataset completo e reutilizá-las em subconjuntos.
+    """
+
+    return CourtGrid(_finite_range(x), _finite_range(y), bins_x, bins_y)
+
+
+def _finite_range(values: np.ndarray) -> tuple[float, float]:
+    finite = values[np.isfinite(values)]
+    if len(finite) == 0:
+        return 0.0, 1.0
+
+    lo, hi = float(finite.min()), float(finite.max())
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+
+    return lo, hi
+
+
+def heatmap_counts(
+    x: np.ndarray,
+    y: np.ndarray,
+    grid: CourtGrid
+) -> tuple[np.ndarray, int]:
+    """
+    Contagens inteiras por célula (bins_x × bins_y), via np.bincount
+    sobre os índices planos, e nº de pontos fora da grelha (ou NaN).
+    """
+
+    cells = grid.cell_ids(np.asarray(x), np.asarray(y))
+    inside = cells >= 0
+    counts = np.bincount(cells[inside], minlength=grid.n_cells)
+
+    outside = len(cells) - np.count_nonzero(inside)
+
+    return counts.reshape(grid.shape), int(outside)
+
+
+def merge_heatmaps(results) -> dict:
+    """
+    Soma heatmaps (resultados do PI 3) calculados na mesma grelha fixa:
+    jogos, blocos de um stream ou processos de um batch.
+    """
+
+    results = list(results)
+    if not results:
+        raise ValueError("Nenhum heatmap para juntar.")
+
+    x_edges, y_edges = results[0]["x_edges"], results[0]["y_edges"]
+    for r in results[1:]:
+        same_edges = (
+            np.array_equal(r["x_edges"], x_edges)
+            and np.array_equal(r["y_edges"], y_edges)
+        )
+        if not same_edges:
+            raise ValueError(
+                "Heatmaps com arestas diferentes não são somáveis."
+            )
+
+    return {
+        "heatmap": sum(r["heatmap"] for r in results),
+        "x_edges": x_edges,
+        "y_edges": y_edges,
+        "outside": sum(r.get("outside", 0) for r in results)
+    }
@@ -0,0 +1,247 @@
+# =====================================================
+# INSTRUMENTAÇÃO — TEMPO, LINHAS, MEMÓRIA E CACHE POR ETAPA
+# =====================================================
+#
+# Cada etapa (carregamento, contexto, KPIs, figuras) é medida com o
+# decorador @instrument ou o context manager stage():
+# - wall_s: tempo de relógio
+# - rows: linhas processadas (DataFrame, ColumnStore ou array)
+# - alloc_bytes: pico de memória alocada (tracemalloc), só com
+#   trace_memory ativo, por ser caro. O tracemalloc mede o processo
+#   inteiro: se outra thread (ex.: o warmup de src/warmup.py) tiver uma
+#   etapa ativa ao mesmo tempo, as alocações não são separáveis e
+#   alloc_bytes fica None nas etapas sobrepostas
+# - cache: "hit" / "miss" quando a etapa usa uma cache
+#
+# Os registos ficam num buffer em memória (painel oculto do dashboard)
+# e, opcionalmente, num log JSON-lines. Configurável por ambiente:
+#   DG_METRICS_LOG=logs/metrics.jsonl  DG_TRACE_MEMORY=1
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+
+MAX_RECORDS = 1000
+
+_records = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+_local = threading.local()
+
+# etapas com tracemalloc em curso, em todas as threads
+_traced = []
+
+_config = {
+    "log_path": os.environ.get("DG_METRICS_LOG") or None,
+    "trace_memory": os.environ.get("DG_TRACE_MEMORY") == "1",
+}
+
+
+def configure(log_path=None, trace_memory: bool | None = None) -> None:
+    """
+    Ativa o log JSON-lines (log_path) e/ou a medição de memória por
+    tracemalloc. log_path=None mantém o log atual.
+    """
+
+    if log_path is not None:
+        _config["log_path"] = str(log_path) if log_path else None
+
+    if trace_memory is not None:
+        _config["trace_memory"] = trace_memory
+        if not trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def records() -> list[dict]:
+    """Registos mais recentes (até MAX_RECORDS), do mais antigo ao último."""
+
+    with _lock:
+        return list(_records)
+
+
+def clear() -> None:
+    with _lock:
+        _records.clear()
+
+
+def summary():
+    """Agregado por etapa: chamadas, tempo total/médio/máximo, hits/misses."""
+
+    import pandas as pd  # só o painel de desempenho precisa do pandas
+
+    df = pd.DataFrame(records())
+    if df.empty:
+        return df
+
+    if "cache" not in df:
+        df["cache"] = None
+
+    return df.groupby("stage").agg(
+        calls=("wall_s", "size"),
+        total_s=("wall_s", "sum"),
+        mean_s=("wall_s", "mean"),
+        max_s=("wall_s", "max"),
+        rows=("rows", "sum"),
+        hits=("cache", lambda c: int((c == "hit").sum())),
+        misses=("cache", lambda c: int((c == "miss").sum()))
+    ).sort_values("total_s", ascending=False)
+
+
+def count_rows(obj) -> int | None:
+    """Nº de linhas de um DataFrame, ColumnStore ou array (senão None)."""
+
+    # DataFrame / Series sem importar o pandas (arranque da app)
+    if isinstance(obj, np.ndarray) or hasattr(obj, "iloc"):
+        return len(obj)
+
+    n_rows = getattr(obj, "n_rows", None)
+    return n_rows if isinstance(n_rows, int) else None
+
+
+def _write(record: dict) -> None:
+    with _lock:
+        _records.append(record)
+
+        log_path = _config["log_path"]
+        if log_path:
+            path = Path(log_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+
+
+def _stack() -> list:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+# ==================================================
+# CONTEXT MANAGER E DECORADOR
+# ==================================================
+@contextmanager
+def stage(name: str, rows: int | None = None):
+    """
+    Mede o bloco como etapa `name`. Devolve o registo, que o bloco pode
+    completar (ex.: record["rows"] = ..., record["cache"] = "hit").
+
+    Etapas aninhadas são medidas de forma independente; o pico de
+    memória da etapa exterior inclui o das interiores. Etapas de threads
+    diferentes que se sobreponham ficam sem alloc_bytes (o pico do
+    tracemalloc é global ao processo).
+    """
+
+    record = {"stage": name, "rows": rows, "cache": None}
+    stack = _stack()
+
+    trace = _config["trace_memory"]
+    if trace:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        thread = threading.get_ident()
+        with _lock:
+            others = [r for r in _traced if r["_thread"] != thread]
+            for other in others:
+                other["_shared"] = True
+            record["_shared"] = bool(others)
+            record["_thread"] = thread
+            _traced.append(record)
+
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            # guardar o pico da etapa exterior antes de o reiniciar
+            stack[-1]["_peak"] = max(stack[-1].get("_peak", 0), peak)
+        tracemalloc.reset_peak()
+        record["_base"] = current
+
+    stack.append(record)
+    start = time.perf_counter()
+
+    try:
+        yield record
+    finally:
+        record["wall_s"] = time.perf_counter() - start
+        stack.pop()
+
+        if trace:
+            with _lock:
+                _traced.remove(record)
+            shared = record.pop("_shared")
+            record.pop("_thread")
+        else:
+            shared = True
+
+        if not shared and tracemalloc.is_tracing():
+            peak = max(
+                record.pop("_peak", 0), tracemalloc.get_traced_memory()[1]
+            )
+            record["alloc_bytes"] = peak - record.pop("_base")
+            if stack:
+                stack[-1]["_peak"] = max(stack[-1].get("_peak", 0), peak)
+        else:
+            record.pop("_peak", None)
+            record.pop("_base", None)
+            record["alloc_bytes"] = None
+
+        record["time"] = time.time()
+        _write(record)
+
+
+def log_elapsed(name: str, start: float, **fields) -> dict:
+    """
+    Regista como etapa `name` o tempo desde `start` (time.perf_counter),
+    para intervalos que não cabem num bloco (ex.: arranque da app).
+    """
+
+    record = {
+        "stage": name,
+        "rows": None,
+        "cache": None,
+        "wall_s": time.perf_counter() - start,
+        "alloc_bytes": None,
+        "time": time.time(),
+        **fields,
+    }
+    _write(record)
+
+    return record
+
+
+def mark_cache(hit: bool) -> None:
+    """Marca a etapa em curso como hit/miss de cache."""
+
+    stack = _stack()
+    if stack:
+        stack[-1]["cache"] = "hit" if hit else "miss"
+
+
+def instrument(name: str):
+    """
+    Decorador: mede cada chamada como etapa `name`. As linhas são as do
+    primeiro argumento (X) ou, se este não as tiver, as do resultado.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            rows = count_rows(args[0]) if args else None
+
+            with stage(name, rows) as record:
+                result = fn(*args, **kwargs)
+                if record["rows"] is None:
+                    record["rows"] = count_rows(result)
+
+            return result
+
+        return wrapper
+
+    return decorator
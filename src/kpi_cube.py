@@ -0,0 +1,757 @@
+# =====================================================
+# CUBO DE KPIs — PI 1–5 MATERIALIZADOS POR (JOGO, CONTEXTO, MINUTO)
+# =====================================================
+#
+# Uso (CLI, offline):
+#   python -m src.kpi_cube data/raw/handball_X_train.csv --steps 1 5
+#   python -m src.kpi_cube data/raw/handball_X_train.csv --verify 50
+#
+# Cada jogo é dividido em buckets fixos de frames (por defeito 1 minuto
+# a 25 Hz). Para cada (contexto, bucket) — contexto de
+# infer_game_context — os PI são calculados uma vez com
+# compute_all_kpis e guardados numa forma somável (célula):
+#
+#   PI 1  somas e contagens de #x0/#y0, momentos de 2.ª ordem e
+#         histograma de posições numa grelha fixa (densidade)
+#   PI 2  distância dentro do bucket + 1.ª e última posição (a ligação
+#         entre buckets é somada na consulta)
+#   PI 3  contagens por célula da grelha fixa da bola
+#   PI 4  soma e máximo das velocidades
+#   PI 5  contagens por canal
+#
+# O dashboard responde a uma seleção (intervalo, contexto) somando as
+# células dos buckets completos; só as pontas do intervalo (< 2
+# buckets) são calculadas a partir das linhas. verify_cube compara as
+# respostas do cubo com o cálculo direto.
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.column_store import ColumnStore
+from src.data_loading import (
+    DATA_CACHE_PATH,
+    DATA_RAW_PATH,
+    DATASET_FILES,
+    PROJECT_ROOT,
+    ensure_cache,
+    source_fingerprint,
+    source_key,
+)
+from src.density import kde_from_counts
+from src.heatmap import CourtGrid, grid_from_data, heatmap_counts
+from src.kpis import (
+    KPI_VERSION,
+    PI5_CHANNEL_EDGES,
+    channel_labels,
+    channel_summary,
+    column_array,
+    compute_all_kpis,
+    lazy_series,
+)
+from src.preprocessing import infer_game_context
+from src.results import (
+    FrameRuns,
+    PI1Result,
+    PI2Result,
+    PI4Result,
+    positions_frame,
+    speeds,
+    step_distances,
+)
+
+
+KPI_CUBE_PATH = PROJECT_ROOT / "data" / "processed" / "cubes"
+
+# 1 minuto a 25 Hz
+BUCKET_FRAMES = 1500
+
+# grelha do histograma de posições do PI 1 (densidade)
+DENSITY_BINS = 32
+
+# mesmo alargamento do kernel que src.density.binned_kde
+DENSITY_BW = 0.25
+
+# Incrementar sempre que o formato do cubo mudar
+KPI_CUBE_VERSION = 1
+
+
+def _empty_cells(shape, grid, density_grid, n_channels) -> dict:
+    """Arrays das células (contexto, bucket) de um cubo vazio."""
+
+    return {
+        "n": np.zeros(shape, dtype=np.int64),
+        "xy_sum": np.zeros((*shape, 2)),
+        "xy_count": np.zeros((*shape, 2), dtype=np.int64),
+        # nº de pares (x, y) válidos e Σx, Σy, Σx², Σy², Σxy
+        "pair_n": np.zeros(shape, dtype=np.int64),
+        "moments": np.zeros((*shape, 5)),
+        "positions": np.zeros((*shape, *density_grid.shape), dtype=np.int32),
+        "first_xy": np.full((*shape, 2), np.nan, dtype=np.float32),
+        "last_xy": np.full((*shape, 2), np.nan, dtype=np.float32),
+        "distance": np.zeros(shape),
+        "heatmap": np.zeros((*shape, *grid.shape), dtype=np.int32),
+        "outside": np.zeros(shape, dtype=np.int64),
+        "speed_sum": np.zeros(shape),
+        "speed_max": np.full(shape, -np.inf),
+        "channels": np.zeros((*shape, n_channels), dtype=np.int64),
+    }
+
+
+def context_frames(X, start: int, end: int, step: int, context: str):
+    """
+    Frames de [start, end) com passo `step` no contexto dado, segundo
+    infer_game_context (sem coluna 'contexto', tudo é 'Jogo').
+    """
+
+    rows = slice(start, end, step)
+    selection = X.iloc[rows] if isinstance(X, pd.DataFrame) else X.select(
+        rows
+    )
+    # comparação sobre os códigos da categórica (sem strings por frame)
+    mask = np.asarray(infer_game_context(selection)["contexto"] == context)
+
+    return np.flatnonzero(mask) * step + start
+
+
+# ==================================================
+# CÉLULA — PI 1–5 DE UM CONJUNTO DE FRAMES, EM FORMA SOMÁVEL
+# ==================================================
+def cell_aggregates(
+    X,
+    frames,
+    grid: CourtGrid,
+    density_grid: CourtGrid,
+    channel_edges=PI5_CHANNEL_EDGES
+) -> dict:
+    """
+    Agregados somáveis dos PI 1–5 nos `frames` dados, a partir de
+    compute_all_kpis (mesmos valores que o dashboard calcularia).
+    """
+
+    kpis = compute_all_kpis(
+        X, grid=grid, channel_edges=channel_edges, frames=frames
+    )
+    n = kpis["pi1"].n_frames
+
+    x = column_array(X, "#x0", frames)
+    y = column_array(X, "#y0", frames)
+
+    # PI 1: média (ignora NaN) × nº de valores válidos
+    xy_count = np.array([np.count_nonzero(~np.isnan(v)) for v in (x, y)])
+    xy_sum = np.where(
+        xy_count > 0,
+        np.asarray(kpis["pi1"]["mean_position"], dtype=float) * xy_count,
+        0
+    )
+
+    # PI 1: momentos dos pares válidos (covariância do KDE)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    xv = x[valid].astype(np.float64)
+    yv = y[valid].astype(np.float64)
+    moments = [xv.sum(), yv.sum(), xv @ xv, yv @ yv, xv @ yv]
+    positions, _ = heatmap_counts(x, y, density_grid)
+
+    pi4 = kpis["pi4"]
+
+    return {
+        "n": n,
+        "xy_sum": xy_sum,
+        "xy_count": xy_count,
+        "pair_n": len(xv),
+        "moments": moments,
+        "positions": positions,
+        "first_xy": (x[0], y[0]) if n else (np.nan, np.nan),
+        "last_xy": (x[-1], y[-1]) if n else (np.nan, np.nan),
+        "distance": kpis["pi2"]["total_distance"],
+        "heatmap": kpis["pi3"]["heatmap"],
+        "outside": kpis["pi3"]["outside"],
+        "speed_sum": pi4["mean_speed"] * n if n else 0.0,
+        "speed_max": pi4["max_speed"] if n else -np.inf,
+        "channels": list(kpis["pi5"]["counts"].values()),
+    }
+
+
+# ==================================================
+# CUBO DE UM JOGO
+# ==================================================
+class KPICube:
+    """
+    Células somáveis dos PI 1–5 por (contexto, bucket de frames) de um
+    jogo, calculadas sobre os frames múltiplos de `step`.
+
+        cube = KPICube.build(X, step=5)
+        kpis = cube.query(0, 90_000, "Jogo", X=X)
+
+    query devolve o formato de compute_all_kpis. O PI 3 usa a grelha
+    fixa do jogo (como o KPIRangeIndex) e o PI 1 uma densidade sobre o
+    histograma de posições das células.
+    """
+
+    def __init__(
+        self,
+        cells: dict,
+        contexts: list[str],
+        n_frames: int,
+        step: int,
+        bucket_frames: int,
+        grid: CourtGrid,
+        density_grid: CourtGrid,
+        channel_edges=PI5_CHANNEL_EDGES
+    ):
+        self.cells = cells
+        self.contexts = list(contexts)
+        self.n_frames = n_frames
+        self.step = step
+        self.bucket_frames = bucket_frames
+        self.grid = grid
+        self.density_grid = density_grid
+        self.channel_edges = list(channel_edges)
+
+    @property
+    def n_buckets(self) -> int:
+        return self.cells["n"].shape[1]
+
+    @classmethod
+    def build(
+        cls,
+        X,
+        step: int = 1,
+        bucket_frames: int = BUCKET_FRAMES,
+        bins_x: int = 10,
+        bins_y: int = 10,
+        channel_edges=PI5_CHANNEL_EDGES
+    ) -> "KPICube":
+        """Calcula as células de todos os (contexto, bucket) de X."""
+
+        if step < 1 or bucket_frames % step:
+            raise ValueError(
+                f"bucket_frames ({bucket_frames}) tem de ser múltiplo "
+                f"do step ({step})."
+            )
+
+        X = infer_game_context(X)
+        n_frames = len(X) if isinstance(X, pd.DataFrame) else X.n_rows
+
+        grid = grid_from_data(
+            column_array(X, "#ball_x"), column_array(X, "#ball_y"),
+            bins_x, bins_y
+        )
+        density_grid = grid_from_data(
+            column_array(X, "#x0"), column_array(X, "#y0"),
+            DENSITY_BINS, DENSITY_BINS
+        )
+
+        context = pd.Categorical(X["contexto"])
+        contexts = [str(c) for c in context.categories]
+        codes = np.asarray(context.codes)[::step]
+        frames = np.arange(0, n_frames, step)
+
+        n_buckets = -(-n_frames // bucket_frames)
+        cells = _empty_cells(
+            (len(contexts), n_buckets), grid, density_grid,
+            len(channel_edges) + 1
+        )
+
+        # frames agrupados por (contexto, bucket), por ordem de frame
+        keys = codes.astype(np.int64) * n_buckets + frames // bucket_frames
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        bounds = np.flatnonzero(np.diff(keys)) + 1
+        bounds = np.concatenate([[0], bounds, [len(keys)]])
+
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            if a == b or keys[a] < 0:
+                continue
+            c, k = divmod(int(keys[a]), n_buckets)
+            cell = cell_aggregates(
+                X, frames[order[a:b]], grid, density_grid, channel_edges
+            )
+            for name, value in cell.items():
+                cells[name][c, k] = value
+
+        return cls(
+            cells, contexts, n_frames, step, bucket_frames, grid,
+            density_grid, channel_edges
+        )
+
+    # --------------------------------------------------
+    # CONSULTAS
+    # --------------------------------------------------
+    def _check_selection(self, start: int, end: int, step: int):
+        if step != self.step:
+            raise ValueError(
+                f"Cubo construído com step {self.step} (pedido: {step})."
+            )
+
+        start, end, _ = slice(start, end, step).indices(self.n_frames)
+        if start % step:
+            raise ValueError(
+                f"O início ({start}) tem de ser múltiplo do step ({step})."
+            )
+
+        return start, max(end, start)
+
+    def cell_sums(
+        self,
+        start: int = 0,
+        end: int | None = None,
+        context: str = "Jogo",
+        step: int | None = None,
+        X=None
+    ) -> dict:
+        """
+        Células da seleção por ordem de frame: os buckets completos vêm
+        do cubo; as pontas, se existirem, são calculadas a partir de X.
+        """
+
+        step = self.step if step is None else step
+        start, end = self._check_selection(start, end, step)
+
+        if context not in self.contexts:
+            return {
+                name: values[:0, 0] for name, values in self.cells.items()
+            }
+
+        # buckets completos [k0, k1); o último pode ser mais curto
+        bucket = self.bucket_frames
+        k0 = -(-start // bucket)
+        k1 = self.n_buckets if end >= self.n_frames else end // bucket
+
+        if k0 >= k1:
+            k0 = k1 = 0
+            edges = [(start, end), (end, end)]
+        else:
+            edges = [(start, k0 * bucket), (k1 * bucket, end)]
+
+        parts = []
+        for a, b in edges:
+            if b <= a:
+                parts.append([])
+                continue
+            if X is None:
+                raise ValueError(
+                    "Intervalo fora das fronteiras dos buckets: indicar X "
+                    "para calcular as pontas."
+                )
+            cell = cell_aggregates(
+                X, context_frames(X, a, b, step, context),
+                self.grid, self.density_grid, self.channel_edges
+            )
+            parts.append([cell])
+
+        left, right = parts
+        c = self.contexts.index(context)
+
+        return {
+            name: np.concatenate([
+                *(np.asarray(cell[name])[None] for cell in left),
+                values[c, k0:k1],
+                *(np.asarray(cell[name])[None] for cell in right),
+            ]) if left or right else values[c, k0:k1]
+            for name, values in self.cells.items()
+        }
+
+    def query(
+        self,
+        start: int = 0,
+        end: int | None = None,
+        context: str = "Jogo",
+        step: int | None = None,
+        X=None
+    ) -> dict:
+        """
+        KPIs de [start, end) no contexto dado, somando as células.
+
+        Devolve o mesmo formato de compute_all_kpis. Com X, as séries
+        dos PI 1, 2 e 4 ficam disponíveis a pedido (src.results) e as
+        pontas fora dos buckets são calculadas; sem X o intervalo tem
+        de coincidir com fronteiras de buckets.
+        """
+
+        step = self.step if step is None else step
+        cells = self.cell_sums(start, end, context, step, X)
+        n = int(cells["n"].sum())
+
+        # ---------- PI 1 ----------
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_x, mean_y = (
+                cells["xy_sum"].sum(axis=0) / cells["xy_count"].sum(axis=0)
+            )
+
+        # ---------- PI 2: distâncias + ligações entre células ----------
+        nonempty = cells["n"] > 0
+        first = cells["first_xy"][nonempty][1:]
+        last = cells["last_xy"][nonempty][:-1]
+        bridges = np.sqrt(((first - last) ** 2).sum(axis=1))
+        total_distance = cells["distance"][nonempty].sum() + bridges.sum()
+
+        # ---------- séries a pedido (só com X) ----------
+        series = {"pi1": None, "pi2": None, "pi4": None}
+        if X is not None:
+            start, end = self._check_selection(start, end, step)
+            frames = FrameRuns.encode(
+                context_frames(X, start, end, step, context)
+            )
+            series = {
+                "pi1": lazy_series(
+                    positions_frame, X, ["#x0", "#y0"], frames, index=True
+                ),
+                "pi2": lazy_series(step_distances, X, ["#x0", "#y0"], frames),
+                "pi4": lazy_series(speeds, X, ["#vx0", "#vy0"], frames),
+            }
+
+        return {
+            "pi1": PI1Result(
+                (mean_x, mean_y), n, series["pi1"],
+                density=self._density(cells)
+            ),
+            "pi2": PI2Result(total_distance, n, series["pi2"]),
+            "pi3": self.grid.result(
+                cells["heatmap"].sum(axis=0), cells["outside"].sum()
+            ),
+            "pi4": PI4Result(
+                cells["speed_sum"].sum() / n if n else np.nan,
+                cells["speed_max"].max() if n else np.nan,
+                n,
+                series["pi4"]
+            ),
+            "pi5": channel_summary(
+                cells["channels"].sum(axis=0),
+                channel_labels(len(self.channel_edges) + 1)
+            ),
+        }
+
+    def _density(self, cells: dict):
+        """
+        KDE sobre o histograma de posições somado (nós nos centros das
+        células da grelha), com a covariância dos momentos; None se não
+        houver pontos ou dispersão suficientes.
+        """
+
+        n = int(cells["pair_n"].sum())
+        if n < 2:
+            return None
+
+        sx, sy, sxx, syy, sxy = cells["moments"].sum(axis=0)
+        mx, my = sx / n, sy / n
+        cov = np.array([
+            [sxx - n * mx * mx, sxy - n * mx * my],
+            [sxy - n * mx * my, syy - n * my * my],
+        ]) / (n - 1) * DENSITY_BW**2
+
+        grid = self.density_grid
+        half_x = (grid.x_range[1] - grid.x_range[0]) / grid.bins_x / 2
+        half_y = (grid.y_range[1] - grid.y_range[0]) / grid.bins_y / 2
+        extent = (
+            grid.x_range[0] + half_x, grid.x_range[1] - half_x,
+            grid.y_range[0] + half_y, grid.y_range[1] - half_y
+        )
+
+        try:
+            density = kde_from_counts(
+                cells["positions"].sum(axis=0).astype(float), extent, cov, n
+            )
+        except ValueError:
+            return None
+
+        density["density"] = density["density"].astype(np.float32)
+        return density
+
+    # --------------------------------------------------
+    # PERSISTÊNCIA
+    # --------------------------------------------------
+    def save(self, cube_dir: Path, source: str | None = None) -> None:
+        """Grava as células (.npz) e meta.json (escrito por último)."""
+
+        cube_dir = Path(cube_dir)
+        cube_dir.mkdir(parents=True, exist_ok=True)
+
+        # invalidar antes de reescrever as células
+        (cube_dir / "meta.json").unlink(missing_ok=True)
+        np.savez_compressed(cube_dir / "cells.npz", **self.cells)
+
+        meta = {
+            "version": KPI_CUBE_VERSION,
+            "kpi_version": KPI_VERSION,
+            "source": source,
+            "contexts": self.contexts,
+            "n_frames": self.n_frames,
+            "step": self.step,
+            "bucket_frames": self.bucket_frames,
+            "grid": _grid_meta(self.grid),
+            "density_grid": _grid_meta(self.density_grid),
+            "channel_edges": self.channel_edges,
+        }
+
+        tmp = cube_dir / "meta.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, cube_dir / "meta.json")
+
+    @classmethod
+    def load(cls, cube_dir: Path) -> "KPICube":
+        cube_dir = Path(cube_dir)
+        with open(cube_dir / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        with np.load(cube_dir / "cells.npz") as cells:
+            cells = dict(cells)
+
+        return cls(
+            cells,
+            meta["contexts"],
+            meta["n_frames"],
+            meta["step"],
+            meta["bucket_frames"],
+            CourtGrid(**_grid_args(meta["grid"])),
+            CourtGrid(**_grid_args(meta["density_grid"])),
+            meta["channel_edges"]
+        )
+
+
+def _grid_meta(grid: CourtGrid) -> dict:
+    return {
+        "x_range": list(grid.x_range),
+        "y_range": list(grid.y_range),
+        "bins_x": grid.bins_x,
+        "bins_y": grid.bins_y,
+    }
+
+
+def _grid_args(meta: dict) -> dict:
+    return {
+        **meta,
+        "x_range": tuple(meta["x_range"]),
+        "y_range": tuple(meta["y_range"]),
+    }
+
+
+# ==================================================
+# CUBOS GRAVADOS POR JOGO E STEP
+# ==================================================
+def cube_dir(path, step: int, cube_root: Path = KPI_CUBE_PATH) -> Path:
+    """
+    Pasta do cubo de um CSV: <raiz>/<source_key>/step_<s>, com a chave
+    do caminho (como a cache colunar), para que jogos com CSVs do mesmo
+    nome (jogos/*/handball_X_train.csv) não se substituam.
+    """
+    return Path(cube_root) / source_key(path) / f"step_{step}"
+
+
+def _read_meta(directory: Path) -> dict:
+    try:
+        with open(directory / "meta.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_kpi_cube(
+    path,
+    step: int = 1,
+    bucket_frames: int = BUCKET_FRAMES,
+    cube_root: Path = KPI_CUBE_PATH,
+    cache_root: Path = DATA_CACHE_PATH
+) -> KPICube:
+    """
+    Constrói e grava o cubo de um jogo (CSV de tracking), lendo as
+    colunas da cache colunar por memory-map.
+    """
+
+    cache_dir, cache_meta = ensure_cache(Path(path), cache_root)
+    X = ColumnStore.from_cache(cache_dir, cache_meta)
+
+    cube = KPICube.build(X, step=step, bucket_frames=bucket_frames)
+    cube.save(
+        cube_dir(path, step, cube_root), cache_meta["source"]["sha1"]
+    )
+
+    return cube
+
+
+def open_kpi_cube(
+    name: str = "X_train",
+    step: int = 1,
+    raw_path: Path = DATA_RAW_PATH,
+    cube_root: Path = KPI_CUBE_PATH,
+    cache_root: Path = DATA_CACHE_PATH
+) -> KPICube | None:
+    """
+    Cubo gravado de um split, ou None se não existir ou estiver
+    desatualizado (CSV ou código dos KPIs alterados). Nunca o constrói:
+    a construção é um passo offline (build_kpi_cube / CLI).
+    """
+
+    path = Path(raw_path) / DATASET_FILES[name]
+    directory = cube_dir(path, step, cube_root)
+    meta = _read_meta(directory)
+
+    valid = (
+        meta.get("version") == KPI_CUBE_VERSION
+        and meta.get("kpi_version") == KPI_VERSION
+        and meta.get("step") == step
+        and path.exists()
+        and meta.get("source") == source_fingerprint(path, cache_root)
+    )
+
+    return KPICube.load(directory) if valid else None
+
+
+# ==================================================
+# VERIFICAÇÃO — CUBO vs CÁLCULO DIRETO
+# ==================================================
+def _relative_error(a, b) -> float:
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+
+    if np.array_equal(np.isnan(a), np.isnan(b)):
+        a, b = np.nan_to_num(a), np.nan_to_num(b)
+    else:
+        return np.inf
+
+    scale = np.maximum(np.abs(b), 1e-9)
+    return float(np.max(np.abs(a - b) / scale, initial=0))
+
+
+def verify_cube(
+    cube: KPICube,
+    X,
+    n_checks: int = 20,
+    seed: int = 0,
+    rtol: float = 1e-4
+) -> pd.DataFrame:
+    """
+    Compara cube.query com compute_all_kpis sobre os mesmos frames em
+    seleções aleatórias (intervalos alinhados e não alinhados aos
+    buckets, todos os contextos).
+
+    Devolve uma linha por seleção com o maior erro relativo e `ok`.
+    """
+
+    rng = np.random.default_rng(seed)
+    step, bucket = cube.step, cube.bucket_frames
+    n = cube.n_frames
+
+    selections = [(0, n)]
+    for i in range(n_checks - 1):
+        a, b = np.sort(rng.integers(0, n + 1, 2))
+        if i % 2:
+            # metade alinhada aos buckets (sem pontas)
+            a, b = a // bucket * bucket, min(b // bucket * bucket, n)
+        selections.append((int(a) // step * step, int(b)))
+
+    rows = []
+    for i, (start, end) in enumerate(selections):
+        context = cube.contexts[i % len(cube.contexts)]
+
+        cells = cube.cell_sums(start, end, context, X=X)
+        answer = cube.query(start, end, context, X=X)
+
+        frames = context_frames(X, start, end, step, context)
+        direct = compute_all_kpis(
+            X, grid=cube.grid, channel_edges=cube.channel_edges,
+            frames=frames
+        )
+        positions, _ = heatmap_counts(
+            column_array(X, "#x0", frames), column_array(X, "#y0", frames),
+            cube.density_grid
+        )
+
+        errors = {
+            "n_frames": _relative_error(
+                answer["pi1"].n_frames, len(frames)
+            ),
+            "mean_position": _relative_error(
+                answer["pi1"]["mean_position"],
+                direct["pi1"]["mean_position"]
+            ),
+            "density_counts": _relative_error(
+                cells["positions"].sum(axis=0), positions
+            ),
+            "total_distance": _relative_error(
+                answer["pi2"]["total_distance"],
+                direct["pi2"]["total_distance"]
+            ),
+            "heatmap": _relative_error(
+                answer["pi3"]["heatmap"], direct["pi3"]["heatmap"]
+            ),
+            "mean_speed": _relative_error(
+                answer["pi4"]["mean_speed"], direct["pi4"]["mean_speed"]
+            ),
+            "max_speed": _relative_error(
+                answer["pi4"]["max_speed"], direct["pi4"]["max_speed"]
+            ),
+            "channels": _relative_error(
+                list(answer["pi5"]["counts"].values()),
+                list(direct["pi5"]["counts"].values())
+            ),
+        }
+        worst = max(errors, key=errors.get)
+
+        rows.append({
+            "start": start,
+            "end": end,
+            "context": context,
+            "frames": len(frames),
+            "max_rel_error": errors[worst],
+            "worst": worst,
+            "ok": errors[worst] <= rtol,
+        })
+
+    return pd.DataFrame(rows)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Constrói (offline) o cubo de KPIs de cada jogo."
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="CSVs de tracking (um por jogo)"
+    )
+    parser.add_argument("--steps", type=int, nargs="+", default=[1])
+    parser.add_argument(
+        "--bucket", type=int, default=BUCKET_FRAMES,
+        help="frames por bucket (por defeito 1 minuto a 25 Hz)"
+    )
+    parser.add_argument(
+        "--verify", type=int, default=0, metavar="N",
+        help="compara N seleções aleatórias com o cálculo direto"
+    )
+    parser.add_argument("-o", "--output", default=str(KPI_CUBE_PATH))
+    args = parser.parse_args(argv)
+
+    failed = False
+    for path in args.paths:
+        for step in args.steps:
+            start = time.perf_counter()
+            cube = build_kpi_cube(
+                path, step, args.bucket, cube_root=Path(args.output)
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                f">>> {path} (step {step}): "
+                f"{cube.n_buckets} buckets × {len(cube.contexts)} "
+                f"contextos em {elapsed:.1f} s"
+            )
+
+            if args.verify:
+                cache_dir, cache_meta = ensure_cache(Path(path))
+                X = ColumnStore.from_cache(cache_dir, cache_meta)
+                report = verify_cube(cube, X, args.verify)
+                failed |= not report["ok"].all()
+                print(report.to_string(index=False))
+
+    if failed:
+        print(">>> Verificação falhou: o cubo difere do cálculo direto.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
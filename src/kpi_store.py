@@ -0,0 +1,318 @@
+# =====================================================
+# KPI STORE — RESULTADOS DOS PI 1–5 PERSISTIDOS EM DISCO
+# =====================================================
+#
+# As caches em memória (LRUCache, st.cache_*) perdem-se a cada deploy
+# ou reinício do servidor. O KPIStore guarda os resultados em disco,
+# endereçados pelo conteúdo da seleção:
+#
+#   chave = SHA-1(fingerprint do dataset, intervalo de frames, step,
+#                 contexto, [label], KPI_VERSION, formato)
+#   <raiz>/<chave[:2]>/<chave>.npz    arrays (np.savez_compressed)
+#   <raiz>/<chave[:2]>/<chave>.json   estrutura, escalares e metadados
+#
+# - Escritas atómicas (ficheiro temporário + os.replace), com o .json
+#   escrito por último: uma entrada só existe depois de completa, e
+#   várias sessões Streamlit / jobs batch podem partilhar a pasta.
+# - Cada leitura atualiza o mtime do .json; quando o total excede
+#   max_bytes, as entradas usadas há mais tempo são apagadas.
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data_loading import PROJECT_ROOT
+from src.kpis import KPI_VERSION
+from src.results import RESULT_TYPES, KPIResult
+
+
+KPI_STORE_PATH = PROJECT_ROOT / "data" / "processed" / "kpis"
+
+# Incrementar sempre que o formato dos ficheiros mudar
+STORE_FORMAT_VERSION = 2
+
+# temporários órfãos (escritor interrompido) apagados após 1 h
+STALE_TMP_SECONDS = 3600
+
+
+# ==================================================
+# SERIALIZAÇÃO: DICIONÁRIO DE KPIs ↔ (ARRAYS, ÁRVORE JSON)
+# ==================================================
+def _encode(value, arrays: list) -> dict:
+    """
+    Descreve `value` em JSON; os arrays vão para `arrays` e são
+    referidos pela posição. Dos resultados dos PI 1, 2 e 4
+    (src.results) só é guardada a forma compacta.
+    """
+
+    def array(values) -> int:
+        arrays.append(np.asarray(values))
+        return len(arrays) - 1
+
+    if isinstance(value, KPIResult):
+        return {
+            "kind": "result",
+            "type": type(value).__name__,
+            "state": _encode(value.compact(), arrays)
+        }
+    if isinstance(value, dict):
+        return {
+            "kind": "dict",
+            "items": [[k, _encode(v, arrays)] for k, v in value.items()]
+        }
+    if isinstance(value, np.ndarray):
+        return {"kind": "array", "ref": array(value)}
+    if isinstance(value, pd.DataFrame):
+        return {
+            "kind": "frame",
+            "columns": [[c, array(value[c])] for c in value.columns],
+            "index": array(value.index)
+        }
+    if isinstance(value, tuple):
+        return {"kind": "tuple", "items": [_encode(v, arrays) for v in value]}
+    if isinstance(value, np.generic):
+        return {
+            "kind": "scalar",
+            "dtype": value.dtype.str,
+            "value": value.item()
+        }
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return {"kind": "value", "value": value}
+
+    raise ValueError(f"Tipo não suportado no KPIStore: {type(value)!r}")
+
+
+def _decode(node: dict, arrays):
+    kind = node["kind"]
+
+    if kind == "result":
+        return RESULT_TYPES[node["type"]].from_compact(
+            _decode(node["state"], arrays)
+        )
+    if kind == "dict":
+        return {k: _decode(v, arrays) for k, v in node["items"]}
+    if kind == "array":
+        return arrays[node["ref"]]
+    if kind == "frame":
+        return pd.DataFrame(
+            {c: arrays[ref] for c, ref in node["columns"]},
+            index=pd.Index(arrays[node["index"]]),
+            copy=False
+        )
+    if kind == "tuple":
+        return tuple(_decode(v, arrays) for v in node["items"])
+    if kind == "scalar":
+        return np.dtype(node["dtype"]).type(node["value"])
+
+    return node["value"]
+
+
+def _atomic_write(path: Path, write) -> None:
+    """write(f) num temporário da mesma pasta, depois os.replace."""
+
+    fd, tmp = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        os.fchmod(fd, 0o644)  # mkstemp cria 0600; outros jobs leem
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+# ==================================================
+# STORE
+# ==================================================
+class KPIStore:
+    """
+    Resultados de compute_all_kpis (ou KPIRangeIndex.query) em disco,
+    por DatasetFingerprint.
+
+        store = KPIStore()
+        kpis = store.get_or_compute(fingerprint, lambda: compute(...))
+    """
+
+    def __init__(
+        self,
+        root: Path = KPI_STORE_PATH,
+        max_bytes: int = 2 * 2**30,
+        kpi_version: int = KPI_VERSION,
+        compress: bool = True
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.kpi_version = kpi_version
+        # séries float32 de tracking comprimem pouco (~1/3) e a
+        # descompressão domina a leitura; compress=False troca disco
+        # por velocidade
+        self.compress = compress
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, fingerprint) -> str:
+        identity = {
+            "source": fingerprint.source,
+            "frame_start": fingerprint.frame_start,
+            "frame_end": fingerprint.frame_end,
+            "step": fingerprint.step,
+            "context": fingerprint.context,
+            "kpi_version": self.kpi_version,
+            "format": STORE_FORMAT_VERSION,
+        }
+        # sem filtro por label a chave não muda (entradas já gravadas)
+        if fingerprint.label is not None:
+            identity["label"] = fingerprint.label
+            identity["before"] = fingerprint.before
+        encoded = json.dumps(identity, sort_keys=True).encode("utf-8")
+        return hashlib.sha1(encoded).hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        folder = self.root / key[:2]
+        return folder / f"{key}.npz", folder / f"{key}.json"
+
+    def __contains__(self, fingerprint) -> bool:
+        return self._paths(self.key(fingerprint))[1].exists()
+
+    def get(self, fingerprint, default=None):
+        data_path, meta_path = self._paths(self.key(fingerprint))
+
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            with np.load(data_path, allow_pickle=False) as npz:
+                arrays = [npz[f"a{i}"] for i in range(meta["n_arrays"])]
+            os.utime(meta_path)  # usado agora (ordem de remoção)
+        except (OSError, ValueError, KeyError):
+            # ausente, apagado por outro processo ou incompleto
+            with self._lock:
+                self.misses += 1
+            return default
+
+        with self._lock:
+            self.hits += 1
+
+        return _decode(meta["tree"], arrays)
+
+    def put(self, fingerprint, kpis: dict) -> None:
+        arrays = []
+        tree = _encode(kpis, arrays)
+
+        key = self.key(fingerprint)
+        data_path, meta_path = self._paths(key)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+
+        save = np.savez_compressed if self.compress else np.savez
+        _atomic_write(
+            data_path,
+            lambda f: save(f, **{f"a{i}": a for i, a in enumerate(arrays)})
+        )
+
+        meta = {
+            "format": STORE_FORMAT_VERSION,
+            "kpi_version": self.kpi_version,
+            "fingerprint": fingerprint.key(),
+            "created": time.time(),
+            "n_arrays": len(arrays),
+            "tree": tree,
+        }
+        # .json por último: só então a entrada fica visível
+        _atomic_write(
+            meta_path,
+            lambda f: f.write(json.dumps(meta).encode("utf-8"))
+        )
+
+        self.evict()
+
+    def get_or_compute(self, fingerprint, compute):
+        """Devolve o resultado em disco ou calcula-o e guarda-o."""
+
+        sentinel = object()
+        value = self.get(fingerprint, sentinel)
+
+        if value is sentinel:
+            value = compute()
+            self.put(fingerprint, value)
+
+        return value
+
+    # --------------------------------------------------
+    # TAMANHO E REMOÇÃO
+    # --------------------------------------------------
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """(último uso, bytes, chave) de cada entrada completa."""
+
+        entries = []
+        now = time.time()
+
+        for folder in self.root.glob("??"):
+            sizes, used, orphans = {}, {}, {}
+
+            for entry in os.scandir(folder):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                stale = now - stat.st_mtime > STALE_TMP_SECONDS
+                if entry.name.endswith(".tmp"):
+                    if stale:
+                        Path(entry.path).unlink(missing_ok=True)
+                    continue
+
+                key, suffix = os.path.splitext(entry.name)
+                sizes[key] = sizes.get(key, 0) + stat.st_size
+                if suffix == ".json":
+                    used[key] = stat.st_mtime
+                elif stale:
+                    orphans[key] = entry.path
+
+            # .npz sem .json há mais de 1 h: escritor interrompido
+            for key, path in orphans.items():
+                if key not in used:
+                    Path(path).unlink(missing_ok=True)
+
+            entries += [(used[key], sizes[key], key) for key in used]
+
+        return entries
+
+    def nbytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def evict(self) -> int:
+        """Apaga as entradas menos usadas até caber em max_bytes."""
+
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+
+            data_path, meta_path = self._paths(key)
+            # .json primeiro: a entrada deixa de ser visível
+            meta_path.unlink(missing_ok=True)
+            data_path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        return removed
+
+    def clear(self) -> None:
+        for _, _, key in self._entries():
+            for path in self._paths(key):
+                path.unlink(missing_ok=True)
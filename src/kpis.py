@@ -1,66 +1,187 @@
+from functools import partial
+
+import numpy as np
 import pandas as pd
 
+from src.heatmap import CourtGrid, heatmap_counts
+from src.instrumentation import instrument
+from src.results import (
+    FrameRuns,
+    LazySeries,
+    PI1Result,
+    PI2Result,
+    PI4Result,
+    positions_frame,
+    speeds,
+    step_distances,
+)
+
+
+# Versão do código dos KPIs: incrementar sempre que o resultado de um
+# PI mudar (os resultados guardados em disco, src/kpi_store.py, deixam
+# de ser válidos)
+KPI_VERSION = 4
+
+
+# ==================================================
+# COLUNAS NECESSÁRIAS POR INDICADOR
+# ==================================================
+KPI_COLUMNS = {
+    "pi1": ["#x0", "#y0"],
+    "pi2": ["#x0", "#y0"],
+    "pi3": ["#ball_x", "#ball_y"],
+    "pi4": ["#vx0", "#vy0"],
+    "pi5": ["#x0"],
+}
+
 
-def pi1_positional_distribution(X: pd.DataFrame):
+def required_columns(kpis) -> list[str]:
+    """
+    Devolve as colunas de tracking necessárias para calcular os
+    indicadores pedidos (ex.: ["pi1", "pi5"]), sem repetições.
+    """
+
+    columns = []
+    for kpi in kpis:
+        if kpi not in KPI_COLUMNS:
+            raise ValueError(f"Indicador desconhecido: {kpi!r}")
+
+        columns += [c for c in KPI_COLUMNS[kpi] if c not in columns]
+
+    return columns
+
+
+def column_array(X, name: str, frames=None) -> np.ndarray:
+    """
+    Coluna como array NumPy, sem cópia.
+    X pode ser um DataFrame ou um ColumnStore (src.column_store).
+
+    Com `frames` (posições, ex.: de src.labels.LabelIndex.select)
+    devolve só essas linhas, por fancy indexing sobre a coluna.
+    """
+
+    values = np.asarray(X[name])
+    return values if frames is None else values[frames]
+
+
+def lazy_series(compute, X, names, frames=None, index=False) -> LazySeries:
+    """
+    Série calculada a pedido sobre as colunas `names` de X (referidas
+    sem cópia) e os `frames` selecionados, guardados em troços
+    (FrameRuns) quando ocupam menos; com index=True o índice do
+    DataFrame é passado como última coluna.
+    """
+
+    columns = [column_array(X, name) for name in names]
+    if index:
+        columns.append(X.index if isinstance(X, pd.DataFrame) else None)
+
+    return LazySeries(compute, columns, FrameRuns.encode(frames))
+
+
+def _mean(values: np.ndarray):
+    """Média como pandas (ignora NaN, mesmo dtype)."""
+    return pd.Series(values, copy=False).mean()
+
+
+def _sum(values: np.ndarray) -> float:
+    """Soma acumulada em float64 (como o KPIRangeIndex e o LiveKPIs)."""
+    return values.sum(dtype=np.float64)
+
+
+def _max(values: np.ndarray):
+    """Máximo, ou NaN sem frames (como no KPIRangeIndex)."""
+    return values.max() if len(values) else np.nan
+
+
+@instrument("kpis.pi1")
+def pi1_positional_distribution(X: pd.DataFrame, frames=None):
     """
     PI 1 — Distribuição Posicional e Posição Média do Guarda-Redes
     Assume o guarda-redes como o jogador 0 (#x0, #y0).
-    """
 
-    gr_positions = X[["#x0", "#y0"]].copy()
+    Em todos os PI, `frames` restringe o cálculo a essas posições de X
+    (filtro por label, ver src.labels), sem copiar o DataFrame.
 
-    mean_x = gr_positions["#x0"].mean()
-    mean_y = gr_positions["#y0"].mean()
+    Os PI 1, 2 e 4 devolvem resultados compactos (src.results): as
+    séries frame a frame ("positions", ...) são calculadas a pedido.
+    """
 
-    return {
-        "positions": gr_positions,
-        "mean_position": (mean_x, mean_y)
-    }
+    x = column_array(X, "#x0", frames)
+    y = column_array(X, "#y0", frames)
+
+    return PI1Result(
+        (_mean(x), _mean(y)),
+        len(x),
+        lazy_series(positions_frame, X, ["#x0", "#y0"], frames, index=True)
+    )
 
 
 import numpy as np
 
 
-def pi2_distance_travelled(X: pd.DataFrame):
+@instrument("kpis.pi2")
+def pi2_distance_travelled(
+    X: pd.DataFrame,
+    segment_starts=None,
+    frames=None
+):
 
     """
     PI 2 — Distância Percorrida pelo Guarda-Redes
     Calculada como soma das distâncias euclidianas entre posições consecutivas.
     Assume sequência temporal implícita na ordem das linhas.
-    """
-
-    x = X["#x0"].values
-    y = X["#y0"].values
 
-    dx = np.diff(x)
-    dy = np.diff(y)
+    Com `segment_starts` (ver src.segmentation.segment_starts), as
+    distâncias entre o fim de um segmento e o início do seguinte são
+    anuladas em vez de contarem como deslocação. Com `frames`, as
+    posições de segment_starts referem-se aos frames selecionados
+    (ver src.labels.gap_starts).
+    """
 
-    distances = np.sqrt(dx**2 + dy**2)
+    x = column_array(X, "#x0", frames)
+    y = column_array(X, "#y0", frames)
 
-    total_distance = distances.sum()
+    # totais na precisão dos dados; a série a pedido fica em float32
+    distances = step_distances(x, y, segment_starts, dtype=None)
 
-    return {
-        "total_distance": total_distance,
-        "instant_distances": distances
-    }
+    return PI2Result(
+        _sum(distances),
+        len(x),
+        lazy_series(
+            partial(step_distances, segment_starts=segment_starts),
+            X, ["#x0", "#y0"], frames
+        )
+    )
 
 
 import numpy as np
 
 
+@instrument("kpis.pi3")
 def pi3_threat_frequency_by_zone(
     X: pd.DataFrame,
     bins_x: int = 10,
-    bins_y: int = 10
+    bins_y: int = 10,
+    grid: CourtGrid | None = None,
+    frames=None
 ):
     """
     PI 3 — Frequência de Ameaças por Zona
     Calcula a densidade de posições da bola (#ball_x, #ball_y)
     num grid espacial.
+
+    Com `grid` (src.heatmap.CourtGrid) as arestas são fixas em
+    coordenadas do campo e o heatmap é inteiro e somável entre jogos;
+    sem grid, as arestas dependem dos dados (np.histogram2d).
     """
 
-    ball_x = X["#ball_x"].values
-    ball_y = X["#ball_y"].values
+    ball_x = column_array(X, "#ball_x", frames)
+    ball_y = column_array(X, "#ball_y", frames)
+
+    if grid is not None:
+        counts, outside = heatmap_counts(ball_x, ball_y, grid)
+        return grid.result(counts, outside)
 
     heatmap, x_edges, y_edges = np.histogram2d(
         ball_x,
@@ -75,63 +196,118 @@ def pi3_threat_frequency_by_zone(
     }
 
 
-def pi4_reaction_intensity(X: pd.DataFrame):
+@instrument("kpis.pi4")
+def pi4_reaction_intensity(X: pd.DataFrame, frames=None):
     """
     PI 4 — Intensidade de Reação do Guarda-Redes
     Calcula a intensidade da reação com base na magnitude da velocidade.
     """
 
-    vx = X["#vx0"].values
-    vy = X["#vy0"].values
-
-    speed_series = np.sqrt(vx**2 + vy**2)
-
-    mean_speed = speed_series.mean()
-    max_speed = speed_series.max()
+    speed_series = speeds(
+        column_array(X, "#vx0", frames), column_array(X, "#vy0", frames),
+        dtype=None
+    )
+    n = len(speed_series)
 
-    return {
-        "speed_series": speed_series,
-        "mean_speed": mean_speed,
-        "max_speed": max_speed
-    }
+    return PI4Result(
+        _sum(speed_series) / n if n else np.nan,
+        _max(speed_series),
+        n,
+        lazy_series(speeds, X, ["#vx0", "#vy0"], frames)
+    )
 
 
 
 
+@instrument("kpis.pi5_origin")
 def pi5_threat_origin_zones(
     X: pd.DataFrame,
     bins_x: int = 10,
-    bins_y: int = 10
+    bins_y: int = 10,
+    grid: CourtGrid | None = None,
+    frames=None
 ):
     """
     PI 5 — Zona de Origem das Ameaças
     Analisa a distribuição espacial das posições iniciais da bola
     como proxy da origem das ações ofensivas.
+
+    Mesmo cálculo do PI 3 (ver pi3_threat_frequency_by_zone).
     """
 
-    ball_x = X["#ball_x"].values
-    ball_y = X["#ball_y"].values
+    return pi3_threat_frequency_by_zone(X, bins_x, bins_y, grid, frames)
+
+
+# ==================================================
+# PI 5 — CANAL DE PROGRESSÃO DAS AMEAÇAS OFENSIVAS
+# ==================================================
+PI5_CHANNELS = ["Esquerdo", "Central", "Direito"]
+PI5_CHANNEL_EDGES = [0.33, 0.66]
 
-    heatmap, x_edges, y_edges = np.histogram2d(
-        ball_x,
-        ball_y,
-        bins=[bins_x, bins_y]
-    )
+
+def channel_labels(n_channels: int) -> list[str]:
+    """Esquerdo/Central/Direito para 3 canais; 'Canal 1..N' nos restantes."""
+
+    if n_channels == len(PI5_CHANNELS):
+        return list(PI5_CHANNELS)
+
+    return [f"Canal {i + 1}" for i in range(n_channels)]
+
+
+def channel_summary(counts: np.ndarray, labels: list[str]) -> dict:
+    """Resultado do PI 5 (contagens, percentagens e total)."""
+
+    total = int(counts.sum())
+
+    # Percentagens
+    percentages = counts / total * 100 if total > 0 else counts
 
     return {
-        "heatmap": heatmap,
-        "x_edges": x_edges,
-        "y_edges": y_edges
+        "counts": dict(zip(labels, counts.tolist())),
+        "percentages": dict(zip(labels, percentages.tolist())),
+        "total_threats": total
     }
 
 
-import pandas as pd
+def channel_counts(
+    values: np.ndarray,
+    edges=PI5_CHANNEL_EDGES,
+    labels=None
+) -> dict:
+    """
+    Classifica cada valor num canal delimitado por `edges`
+    (canal i: edges[i-1] <= x < edges[i]) e conta frames por canal,
+    com np.digitize + np.bincount. NaN cai no último canal.
 
+    Com 2 arestas os canais são Esquerdo/Central/Direito; com N arestas
+    são 'Canal 1' ... 'Canal N+1', salvo `labels` explícitas.
+    """
 
-# ==================================================
-# PI 5 — CANAL DE PROGRESSÃO DAS AMEAÇAS OFENSIVAS
-# ==================================================
-def pi5_threat_progression_channels(X: pd.DataFrame):
+    n_channels = len(edges) + 1
+
+    if labels is None:
+        labels = channel_labels(n_channels)
+    elif len(labels) != n_channels:
+        raise ValueError(
+            f"São necessárias {n_channels} labels para {len(edges)} arestas."
+        )
+
+    counts = np.bincount(
+        np.digitize(values, np.asarray(edges, dtype=float)),
+        minlength=n_channels
+    )
+
+    return channel_summary(counts, labels)
+
+
+@instrument("kpis.pi5")
+def pi5_threat_progression_channels(
+    X: pd.DataFrame,
+    edges=PI5_CHANNEL_EDGES,
+    labels=None,
+    column: str = "#x0",
+    frames=None
+):
     """
     PI 5 — Canal de Progressão das Ameaças Ofensivas
 
@@ -141,35 +317,98 @@ def pi5_threat_progression_channels(X: pd.DataFrame):
 
     Persona: Treinador Principal
     Contexto: Pós-Jogo
+
+    Os canais são definidos pelas arestas `edges` sobre a coordenada X
+    normalizada (por defeito 0.33 / 0.66). `column="#ball_x"` classifica
+    a posição da bola em vez da do guarda-redes.
+    """
+
+    if column not in X.columns:
+        raise ValueError(
+            f"Coluna '{column}' não encontrada para cálculo do PI 5."
+        )
+
+    return channel_counts(column_array(X, column, frames), edges, labels)
+
+
+# ==================================================
+# MOTOR FUNDIDO — PI 1 A PI 5 NUMA SÓ PASSAGEM
+# ==================================================
+@instrument("kpis.compute_all")
+def compute_all_kpis(
+    X: pd.DataFrame,
+    bins_x: int = 10,
+    bins_y: int = 10,
+    channel_edges=PI5_CHANNEL_EDGES,
+    grid: CourtGrid | None = None,
+    frames=None,
+    segment_starts=None
+) -> dict:
+    """
+    Calcula PI 1 a PI 5 extraindo cada coluna uma única vez.
+
+    Devolve {"pi1": ..., "pi5": ...} com os mesmos resultados das
+    funções individuais (o que as visualizações esperam). `frames` e
+    `segment_starts` como em pi1_positional_distribution e
+    pi2_distance_travelled.
     """
 
     if "#x0" not in X.columns:
         raise ValueError("Coluna '#x0' não encontrada para cálculo do PI 5.")
 
-    # Classificação dos canais com base na coordenada X normalizada
-    def classify_channel(x):
-        if x < 0.33:
-            return "Esquerdo"
-        elif x < 0.66:
-            return "Central"
-        else:
-            return "Direito"
-
-    channels = X["#x0"].apply(classify_channel)
-
-    # Contagem absoluta
-    counts = channels.value_counts().reindex(
-        ["Esquerdo", "Central", "Direito"],
-        fill_value=0
+    x = column_array(X, "#x0", frames)
+    y = column_array(X, "#y0", frames)
+    ball_x = column_array(X, "#ball_x", frames)
+    ball_y = column_array(X, "#ball_y", frames)
+
+    # PI 2 e PI 4: estatísticas na precisão dos dados (float64 nos
+    # totais); as séries a pedido ficam em float32
+    distances = step_distances(x, y, segment_starts, dtype=None)
+
+    # PI 3
+    if grid is not None:
+        pi3 = grid.result(*heatmap_counts(ball_x, ball_y, grid))
+    else:
+        heatmap, x_edges, y_edges = np.histogram2d(
+            ball_x,
+            ball_y,
+            bins=[bins_x, bins_y]
+        )
+        pi3 = {"heatmap": heatmap, "x_edges": x_edges, "y_edges": y_edges}
+
+    # PI 4
+    speed_series = speeds(
+        column_array(X, "#vx0", frames), column_array(X, "#vy0", frames),
+        dtype=None
     )
+    n = len(speed_series)
 
-    total = counts.sum()
-
-    # Percentagens
-    percentages = (counts / total * 100) if total > 0 else counts
+    # as séries ficam como LazySeries sobre as colunas de X (com os
+    # mesmos frames em troços para os três PI)
+    frames = FrameRuns.encode(frames)
 
     return {
-        "counts": counts.to_dict(),
-        "percentages": percentages.to_dict(),
-        "total_threats": int(total)
+        "pi1": PI1Result(
+            (_mean(x), _mean(y)),
+            len(x),
+            lazy_series(
+                positions_frame, X, ["#x0", "#y0"], frames, index=True
+            )
+        ),
+        "pi2": PI2Result(
+            _sum(distances),
+            len(x),
+            lazy_series(
+                partial(step_distances, segment_starts=segment_starts),
+                X, ["#x0", "#y0"], frames
+            )
+        ),
+        "pi3": pi3,
+        "pi4": PI4Result(
+            _sum(speed_series) / n if n else np.nan,
+            _max(speed_series),
+            n,
+            lazy_series(speeds, X, ["#vx0", "#vy0"], frames)
+        ),
+        "pi5": channel_counts(x, channel_edges)
     }
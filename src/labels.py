@@ -0,0 +1,210 @@
+# =====================================================
+# ÍNDICE DE LABELS — FRAMES POR RESULTADO (handball_y_*)
+# =====================================================
+#
+# Os splits handball_y_* têm uma linha por frame de handball_X_*. Em vez
+# de um merge X ⨝ y a cada pedido, as labels são alinhadas aos frames
+# uma única vez e guardadas em CSR, como o ZoneIndex:
+#
+#   frames[indptr[k]:indptr[k + 1]]  ->  frames com a label k (ordenados)
+#
+# Um filtro ("frames com label Golo", "os 50 frames antes de cada
+# Defesa") resolve-se sobre estes arrays com searchsorted e aritmética
+# de intervalos, e os KPIs recebem os índices resultantes
+# (src.kpis: argumento `frames`), lendo por fancy indexing apenas as
+# linhas selecionadas de cada coluna.
+
+import numpy as np
+import pandas as pd
+
+
+LABEL_COLUMN = "label"
+
+
+class LabelIndex:
+    """
+    Frames de cada label (CSR), alinhados a um dataset de n_frames.
+
+        index = LabelIndex.build(y_train, n_frames=len(X_train))
+        frames = index.select("Golo", before=50, start=0, step=5)
+        kpis = compute_all_kpis(X_train, frames=frames)
+    """
+
+    def __init__(self, labels: list[str], indptr, frames, n_frames: int):
+        self.labels = list(labels)
+        self.indptr = indptr
+        self.frames = frames
+        self.n_frames = n_frames
+
+    @classmethod
+    def build(
+        cls,
+        y: pd.DataFrame,
+        n_frames: int | None = None,
+        column: str | None = None,
+        frame_column: str | None = None
+    ) -> "LabelIndex":
+        """
+        Alinha as linhas de `y` aos frames de X:
+        - sem frame_column, a linha i de y é o frame i (como handball_y_*)
+        - com frame_column, essa coluna dá o frame de cada linha
+
+        `column` é a coluna da label ('label' ou, se y tiver uma só
+        coluna, essa). Linhas sem label (NaN) não entram no índice.
+        """
+
+        if column is None:
+            if LABEL_COLUMN in y.columns:
+                column = LABEL_COLUMN
+            elif len(y.columns) == 1:
+                column = y.columns[0]
+            else:
+                raise ValueError(
+                    f"Indicar a coluna da label: {list(y.columns)}."
+                )
+
+        if frame_column is None:
+            positions = np.arange(len(y))
+        else:
+            positions = np.asarray(y[frame_column], dtype=np.int64)
+
+        if n_frames is None:
+            n_frames = int(positions.max()) + 1 if len(positions) else 0
+        elif frame_column is None and len(y) != n_frames:
+            raise ValueError(
+                f"y tem {len(y)} linhas para {n_frames} frames de X."
+            )
+        elif len(positions) and (
+            positions.min() < 0 or positions.max() >= n_frames
+        ):
+            raise ValueError("Frames de y fora do intervalo de X.")
+
+        values = y[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy()
+            labels = [str(c) for c in values.cat.categories]
+        else:
+            codes, uniques = pd.factorize(values, sort=True)
+            labels = [str(c) for c in uniques]
+
+        dtype = np.int32 if n_frames < 2**31 else np.int64
+
+        # ordenação estável: em cada label os frames ficam por ordem
+        order = np.argsort(codes, kind="stable")
+        n_missing = np.count_nonzero(codes < 0)
+        frames = positions[order[n_missing:]].astype(dtype)
+        counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+
+        indptr = np.zeros(len(labels) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+
+        # com frame_column, y pode não vir ordenado por frame
+        if frame_column is not None:
+            for k in range(len(labels)):
+                frames[indptr[k]:indptr[k + 1]].sort()
+
+        return cls(labels, indptr, frames, n_frames)
+
+    def __len__(self) -> int:
+        return self.n_frames
+
+    def counts(self) -> dict:
+        """Nº de frames por label."""
+        return dict(zip(self.labels, np.diff(self.indptr).tolist()))
+
+    def frames_of(self, label: str) -> np.ndarray:
+        """Frames (ordenados, sem cópia) com a label dada."""
+
+        if label not in self.labels:
+            raise ValueError(
+                f"Label desconhecida: {label!r} (existem {self.labels})."
+            )
+
+        k = self.labels.index(label)
+        return self.frames[self.indptr[k]:self.indptr[k + 1]]
+
+    def select(
+        self,
+        labels,
+        before: int = 0,
+        after: int = 0,
+        start: int = 0,
+        end: int | None = None,
+        step: int = 1
+    ) -> np.ndarray:
+        """
+        Frames ordenados com alguma das `labels` (str ou lista),
+        alargados a `before` frames antes e `after` frames depois de
+        cada um (ex.: o ataque que leva a um golo), e limitados à
+        seleção do dashboard: [start, end) com subamostragem step.
+
+        O custo é proporcional aos frames com a label, não ao dataset.
+        """
+
+        if isinstance(labels, str):
+            labels = [labels]
+
+        parts = [self.frames_of(label) for label in labels]
+        frames = parts[0] if len(parts) == 1 else np.sort(
+            np.concatenate(parts)
+        )
+
+        if before or after:
+            frames = expand_frames(frames, before, after, self.n_frames)
+
+        start, end, step = slice(start, end, step).indices(self.n_frames)
+        frames = frames[
+            np.searchsorted(frames, start):np.searchsorted(frames, end)
+        ]
+        if step > 1:
+            frames = frames[(frames - start) % step == 0]
+
+        return frames
+
+
+def expand_frames(
+    frames: np.ndarray,
+    before: int,
+    after: int,
+    n_frames: int
+) -> np.ndarray:
+    """
+    União ordenada dos intervalos [f - before, f + after] de cada frame
+    ordenado f, limitada a [0, n_frames). Os intervalos sobrepostos são
+    fundidos e expandidos sem ciclos Python (np.repeat).
+    """
+
+    if len(frames) == 0:
+        return frames
+
+    lo = np.maximum(frames - before, 0)
+    hi = np.minimum(frames + after, n_frames - 1)
+
+    # novo troço quando o intervalo começa depois do fim do anterior
+    # (os fins crescem com os frames ordenados)
+    new = np.concatenate([[True], lo[1:] > hi[:-1] + 1])
+    starts = lo[new]
+    ends = hi[np.append(np.flatnonzero(new)[1:] - 1, len(hi) - 1)]
+
+    lengths = ends - starts + 1
+    offsets = np.cumsum(lengths) - lengths
+
+    return (
+        np.arange(lengths.sum(), dtype=frames.dtype)
+        - np.repeat(offsets - starts, lengths).astype(frames.dtype)
+    )
+
+
+def gap_starts(frames: np.ndarray, max_gap: int = 1) -> np.ndarray:
+    """
+    Posições (em `frames`) onde começa um novo troço contínuo: o
+    segment_starts do PI 2 para não contar como deslocação o salto
+    entre janelas de frames disjuntas.
+    """
+
+    frames = np.asarray(frames)
+    if len(frames) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    breaks = np.flatnonzero(np.diff(frames) > max_gap) + 1
+    return np.concatenate([[0], breaks]).astype(np.int64)
@@ -0,0 +1,406 @@
+# =====================================================
+# MODO AO VIVO — INGESTÃO EM RING BUFFER E KPIs INCREMENTAIS
+# =====================================================
+#
+# O feed de tracking (um CSV a crescer ou um socket local, com o mesmo
+# formato de handball_X_*) é lido por uma thread em segundo plano:
+# - cada frame entra num ring buffer NumPy de capacidade fixa (janela
+#   recente para os gráficos, memória constante durante o jogo)
+# - os PI 1, 2, 4 e 5 são atualizados em O(1) por frame (somas,
+#   contagens, máximo e última posição), nunca recalculados
+# O dashboard só lê snapshot(), que é barato e thread-safe.
+#
+# Para testes e demonstrações, replay_to_file / replay_to_socket
+# reproduzem um CSV existente ao ritmo do jogo (25 Hz).
+#
+# Uso (feed de teste, noutro terminal):
+#   python -m src.live replay data/raw/handball_X_test.csv data/live/feed.csv
+
+import argparse
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.kpis import PI5_CHANNEL_EDGES, channel_labels, channel_summary
+
+
+FPS = 25
+
+# colunas usadas pelos PI 1, 2, 4 e 5
+LIVE_COLUMNS = ["#x0", "#y0", "#vx0", "#vy0"]
+
+# janela recente guardada para os gráficos: 5 minutos a 25 Hz
+DEFAULT_CAPACITY = 5 * 60 * FPS
+
+
+# ==================================================
+# RING BUFFER
+# ==================================================
+class RingBuffer:
+    """
+    Buffer circular (capacity × n_columns) float32: extend() copia no
+    máximo duas fatias, view() devolve as linhas por ordem de chegada.
+    """
+
+    def __init__(self, capacity: int, n_columns: int):
+        self.data = np.full((capacity, n_columns), np.nan, dtype=np.float32)
+        self.capacity = capacity
+        self.end = 0      # próxima posição de escrita
+        self.size = 0     # linhas válidas (≤ capacity)
+        self.total = 0    # linhas recebidas desde o início
+
+    def __len__(self) -> int:
+        return self.size
+
+    def extend(self, rows: np.ndarray) -> None:
+        rows = rows[-self.capacity:]
+        n = len(rows)
+
+        first = min(n, self.capacity - self.end)
+        self.data[self.end:self.end + first] = rows[:first]
+        self.data[:n - first] = rows[first:]
+
+        self.end = (self.end + n) % self.capacity
+        self.size = min(self.capacity, self.size + n)
+        self.total += n
+
+    def view(self) -> np.ndarray:
+        """Cópia das linhas guardadas, da mais antiga à mais recente."""
+
+        if self.size < self.capacity:
+            return self.data[:self.size].copy()
+
+        return np.concatenate([self.data[self.end:], self.data[:self.end]])
+
+
+# ==================================================
+# KPIs INCREMENTAIS
+# ==================================================
+class LiveKPIs:
+    """
+    Estado dos PI 1, 2, 4 e 5 atualizado frame a frame (ou por lotes
+    de frames), com o mesmo significado de src.kpis sobre todos os
+    frames recebidos até ao momento.
+    """
+
+    def __init__(self, channel_edges=PI5_CHANNEL_EDGES):
+        self.channel_edges = np.asarray(channel_edges, dtype=float)
+        self.labels = channel_labels(len(channel_edges) + 1)
+
+        self.position_sum = np.zeros(2)
+        self.position_count = np.zeros(2, dtype=np.int64)
+        self.total_distance = 0.0
+        self.last = None
+        self.speed_sum = 0.0
+        self.speed_count = 0
+        self.max_speed = -np.inf
+        self.channels = np.zeros(len(self.labels), dtype=np.int64)
+
+    def update(self, frames: np.ndarray) -> None:
+        """frames: (k, 4) com as colunas LIVE_COLUMNS."""
+
+        if len(frames) == 0:
+            return
+
+        xy = frames[:, :2].astype(np.float64)
+        valid = ~np.isnan(xy)
+
+        # PI 1
+        self.position_sum += np.where(valid, xy, 0).sum(axis=0)
+        self.position_count += valid.sum(axis=0)
+
+        # PI 2 (a última posição liga os lotes)
+        path = xy if self.last is None else np.vstack([self.last, xy])
+        steps = np.diff(path, axis=0)
+        self.total_distance += np.sqrt((steps**2).sum(axis=1)).sum()
+        self.last = xy[-1]
+
+        # PI 4
+        speed = np.sqrt(frames[:, 2] ** 2 + frames[:, 3] ** 2)
+        self.speed_sum += speed.sum(dtype=np.float64)
+        self.speed_count += len(speed)
+        self.max_speed = np.maximum(self.max_speed, speed.max())
+
+        # PI 5
+        channel = np.digitize(frames[:, 0], self.channel_edges)
+        self.channels += np.bincount(channel, minlength=len(self.labels))
+
+    def result(self) -> dict:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_x, mean_y = self.position_sum / self.position_count
+
+        count = self.speed_count
+
+        return {
+            "pi1": {"mean_position": (mean_x, mean_y)},
+            "pi2": {"total_distance": self.total_distance},
+            "pi4": {
+                "mean_speed": self.speed_sum / count if count else np.nan,
+                "max_speed": self.max_speed if count else np.nan
+            },
+            "pi5": channel_summary(self.channels, self.labels)
+        }
+
+
+# ==================================================
+# FEEDS: CSV A CRESCER E SOCKET LOCAL
+# ==================================================
+def _parse_lines(lines: list[str], header: list[str]) -> np.ndarray:
+    """
+    Linhas CSV completas → array (k, 4) float32 com as LIVE_COLUMNS.
+    Um split por linha: com 1–2 frames por leitura, o pd.read_csv
+    custaria ~50x mais do que a atualização dos KPIs.
+    """
+
+    columns = [header.index(c) for c in LIVE_COLUMNS]
+    rows = [line.rstrip("\r").split(",") for line in lines]
+
+    return np.array(
+        [[float(row[i] or "nan") for i in columns] for row in rows],
+        dtype=np.float32
+    ).reshape(-1, len(LIVE_COLUMNS))
+
+
+def tail_csv(path, poll_interval: float = 1 / FPS, stop=None):
+    """
+    Segue um CSV a crescer (como `tail -f`): devolve arrays (k, 4) com
+    as linhas completas acrescentadas desde a última leitura. Termina
+    quando stop (threading.Event) é ativado.
+
+    Se o ficheiro for truncado (ex.: replay_to_file reiniciado, que o
+    abre com "w"), volta ao início, relê o cabeçalho e devolve None
+    para indicar que o feed recomeçou.
+    """
+
+    path = Path(path)
+    while not path.exists():
+        if stop is not None and stop.is_set():
+            return
+        time.sleep(poll_interval)
+
+    with open(path, "rb") as f:
+        header = None
+        pending = b""
+
+        while stop is None or not stop.is_set():
+            chunk = f.read()
+            if not chunk:
+                if os.fstat(f.fileno()).st_size < f.tell():
+                    f.seek(0)
+                    header, pending = None, b""
+                    yield None
+                else:
+                    time.sleep(poll_interval)
+                continue
+
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()  # linha ainda incompleta
+            lines = [line.decode("utf-8") for line in lines if line]
+
+            if header is None and lines:
+                header = lines.pop(0).rstrip("\r").split(",")
+
+            if lines:
+                yield _parse_lines(lines, header)
+
+
+def socket_feed(host: str, port: int, stop=None):
+    """
+    Lê um feed TCP com linhas CSV (cabeçalho na primeira linha) e
+    devolve arrays (k, 4) com as linhas recebidas em cada leitura.
+    """
+
+    with socket.create_connection((host, port)) as conn:
+        conn.settimeout(1 / FPS)
+        header = None
+        pending = b""
+
+        while stop is None or not stop.is_set():
+            try:
+                data = conn.recv(1 << 16)
+            except socket.timeout:
+                continue
+            if not data:
+                return
+
+            lines = (pending + data).split(b"\n")
+            pending = lines.pop()
+            lines = [line.decode("utf-8") for line in lines if line]
+
+            if header is None and lines:
+                header = lines.pop(0).rstrip("\r").split(",")
+
+            if lines:
+                yield _parse_lines(lines, header)
+
+
+def open_feed(source: str, stop=None):
+    """'host:porta' → socket_feed; qualquer outro valor → tail_csv."""
+
+    host, _, port = str(source).rpartition(":")
+    if host and port.isdigit():
+        return socket_feed(host, int(port), stop)
+
+    return tail_csv(source, stop=stop)
+
+
+# ==================================================
+# JOGO AO VIVO
+# ==================================================
+class LiveMatch:
+    """
+    Consome um feed numa thread e mantém o ring buffer e os KPIs.
+
+        live = LiveMatch("data/live/feed.csv").start()
+        kpis = live.snapshot()
+    """
+
+    def __init__(
+        self,
+        source,
+        capacity: int = DEFAULT_CAPACITY,
+        channel_edges=PI5_CHANNEL_EDGES
+    ):
+        self.source = source
+        self.buffer = RingBuffer(capacity, len(LIVE_COLUMNS))
+        self.kpis = LiveKPIs(channel_edges)
+        self.error = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def ingest(self, frames: np.ndarray) -> None:
+        """frames: (k, 4) float32 com as colunas LIVE_COLUMNS."""
+
+        with self._lock:
+            self.buffer.extend(frames)
+            self.kpis.update(frames)
+
+    def reset(self) -> None:
+        """Recomeça o jogo: ring buffer e KPIs vazios."""
+
+        with self._lock:
+            self.buffer = RingBuffer(self.buffer.capacity, len(LIVE_COLUMNS))
+            self.kpis = LiveKPIs(self.kpis.channel_edges)
+
+    def _run(self) -> None:
+        try:
+            for frames in open_feed(self.source, self._stop):
+                if frames is None:  # feed truncado: novo jogo
+                    self.reset()
+                    continue
+                self.ingest(frames)
+                self.error = None
+        except Exception as exc:  # mostrado no dashboard
+            self.error = exc
+
+    def start(self) -> "LiveMatch":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def restart(self) -> "LiveMatch":
+        """
+        Nova thread de ingestão se a anterior terminou (ligação recusada
+        ou fechada); os KPIs acumulados mantêm-se.
+        """
+
+        if not self.running:
+            self._stop.clear()
+            self._thread = None
+        return self.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def snapshot(self) -> dict:
+        """
+        KPIs acumulados desde o início do jogo + séries da janela
+        recente (ring buffer), no formato de compute_all_kpis.
+        """
+
+        with self._lock:
+            result = self.kpis.result()
+            window = self.buffer.view()
+            total = self.buffer.total
+
+        x, y, vx, vy = window.T
+        result["pi1"]["positions"] = pd.DataFrame({"#x0": x, "#y0": y})
+        result["pi2"]["instant_distances"] = np.sqrt(
+            np.diff(x) ** 2 + np.diff(y) ** 2
+        )
+        result["pi4"]["speed_series"] = np.sqrt(vx**2 + vy**2)
+        result["frames"] = total
+
+        return result
+
+
+# ==================================================
+# REPLAYERS (SUBSTITUTOS DO FEED REAL)
+# ==================================================
+def _replay_lines(csv_path, fps: float):
+    """Linhas do CSV (cabeçalho primeiro) ao ritmo de `fps` frames/s."""
+
+    with open(csv_path, "r", encoding="utf-8") as f:
+        yield f.readline()
+
+        start = time.perf_counter()
+        for i, line in enumerate(f):
+            delay = start + i / fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            yield line
+
+
+def replay_to_file(csv_path, feed_path, fps: float = FPS) -> None:
+    """Escreve as linhas de csv_path em feed_path, frame a frame."""
+
+    feed_path = Path(feed_path)
+    feed_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(feed_path, "w", encoding="utf-8") as out:
+        for line in _replay_lines(csv_path, fps):
+            out.write(line)
+            out.flush()
+
+
+def replay_to_socket(csv_path, port: int, fps: float = FPS) -> None:
+    """Serve csv_path em localhost:port para um cliente, frame a frame."""
+
+    with socket.create_server(("127.0.0.1", port)) as server:
+        conn, _ = server.accept()
+        with conn:
+            for line in _replay_lines(csv_path, fps):
+                conn.sendall(line.encode("utf-8"))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Reproduz um CSV de tracking como feed ao vivo."
+    )
+    parser.add_argument("mode", choices=["replay", "serve"])
+    parser.add_argument("csv_path", type=Path)
+    parser.add_argument(
+        "target", help="CSV de saída (replay) ou porta TCP (serve)"
+    )
+    parser.add_argument("--fps", type=float, default=FPS)
+    args = parser.parse_args(argv)
+
+    if args.mode == "replay":
+        replay_to_file(args.csv_path, args.target, args.fps)
+    else:
+        replay_to_socket(args.csv_path, int(args.target), args.fps)
+
+
+if __name__ == "__main__":
+    main()
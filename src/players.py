@@ -0,0 +1,154 @@
+# =====================================================
+# KPIs DE JOGADORES — PI 1, PI 2 E PI 4 PARA TODOS DE UMA VEZ
+# =====================================================
+#
+# Cada coordenada (#x{i}, #y{i}, #vx{i}, #vy{i}) é usada como o array
+# plano da sua coluna (sem cópia: column_array). Os KPIs de cada
+# jogador são somas sobre esses arrays contíguos, percorridos por blocos
+# de BLOCK_FRAMES frames com dois buffers de trabalho reutilizados
+# (operações in-place, sem séries temporárias do tamanho do jogo): cada
+# bloco é lido da memória uma só vez. Os totais e médias são reduzidos
+# em float64, como nas funções de src.kpis.
+
+import re
+
+import numpy as np
+
+from src.kpis import column_array
+
+
+PLAYER_COLUMN = re.compile(r"^#x(\d+)$")
+
+# frames por bloco (2 buffers float32 de 128 KB cabem na cache L2)
+BLOCK_FRAMES = 32_768
+
+
+def player_ids(columns) -> list[int]:
+    """Jogadores presentes no dataset (colunas #x{i}), por ordem de i."""
+
+    return sorted(
+        int(match.group(1))
+        for match in map(PLAYER_COLUMN.match, columns)
+        if match
+    )
+
+
+def player_columns(X, player: int) -> tuple:
+    """Arrays (x, y, vx, vy) do jogador, sem cópia."""
+
+    return tuple(
+        column_array(X, f"#{c}{player}") for c in ("x", "y", "vx", "vy")
+    )
+
+
+def _nanmean(values: np.ndarray) -> float:
+    """Média ignorando NaN (como a média pandas do PI 1)."""
+
+    count = np.count_nonzero(~np.isnan(values))
+    return np.nansum(values, dtype=np.float64) / count if count else np.nan
+
+
+def _norm_into(a, b, out, tmp) -> np.ndarray:
+    """sqrt(a² + b²) escrito em `out`, com `tmp` como buffer auxiliar."""
+
+    np.multiply(a, a, out=out)
+    np.multiply(b, b, out=tmp)
+    out += tmp
+
+    return np.sqrt(out, out=out)
+
+
+def _player_sums(x, y, vx, vy, out, tmp, block: int) -> tuple:
+    """
+    Somas de x, y, das distâncias entre frames consecutivos e das
+    velocidades, e velocidade máxima, por blocos de `block` frames:
+    cada bloco é lido uma vez e os buffers ficam na cache do CPU.
+    """
+
+    n = len(x)
+    sum_x = sum_y = distance = speed = 0.0
+    max_speed = -np.inf
+
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        m = end - start
+
+        sum_x += x[start:end].sum(dtype=np.float64)
+        sum_y += y[start:end].sum(dtype=np.float64)
+
+        values = _norm_into(
+            vx[start:end], vy[start:end], out[:m], tmp[:m]
+        )
+        speed += values.sum(dtype=np.float64)
+        # np.maximum propaga NaN, como o max() do PI 4
+        max_speed = np.maximum(max_speed, values.max())
+
+        # distâncias até ao frame seguinte (o último bloco tem menos uma)
+        m = min(end + 1, n) - start - 1
+        dx, dy = out[:m], tmp[:m]
+        np.subtract(x[start + 1:start + 1 + m], x[start:start + m], out=dx)
+        np.subtract(y[start + 1:start + 1 + m], y[start:start + m], out=dy)
+        distance += _norm_into(dx, dy, dx, dy).sum(dtype=np.float64)
+
+    return sum_x, sum_y, distance, speed, max_speed
+
+
+def all_player_kpis(X, players=None) -> dict:
+    """
+    PI 1, PI 2 e PI 4 de todos os jogadores (por defeito os de
+    player_ids), com o mesmo significado das funções de src.kpis
+    aplicadas a cada jogador. X pode ser um DataFrame ou um ColumnStore.
+
+    Devolve arrays float64 indexados pela ordem de "players":
+    - pi1: mean_position (jogadores, 2), NaN ignorados
+    - pi2: total_distance
+    - pi4: mean_speed, max_speed
+
+    As séries frame a frame de um jogador continuam disponíveis pelas
+    funções de src.kpis.
+    """
+
+    if players is None:
+        players = player_ids(X.columns)
+
+    n_players = len(players)
+    mean_position = np.full((n_players, 2), np.nan)
+    total_distance = np.full(n_players, np.nan)
+    mean_speed = np.full(n_players, np.nan)
+    max_speed = np.full(n_players, np.nan)
+
+    buffers = {}
+
+    for k, player in enumerate(players):
+        x, y, vx, vy = player_columns(X, player)
+        n = len(x)
+        if n == 0:
+            continue
+
+        # buffers de trabalho por dtype (float32 ou superior)
+        dtype = np.result_type(x, y, vx, vy, np.float32)
+        if dtype not in buffers:
+            size = min(n, BLOCK_FRAMES)
+            buffers[dtype] = (np.empty(size, dtype), np.empty(size, dtype))
+
+        sum_x, sum_y, distance, speed, top = _player_sums(
+            x, y, vx, vy, *buffers[dtype], BLOCK_FRAMES
+        )
+
+        # ---------- PI 1 (só com NaN volta a ler a coluna) ----------
+        mean_position[k] = (
+            sum_x / n if not np.isnan(sum_x) else _nanmean(x),
+            sum_y / n if not np.isnan(sum_y) else _nanmean(y)
+        )
+
+        # ---------- PI 2 e PI 4 ----------
+        total_distance[k] = distance
+        mean_speed[k] = speed / n
+        max_speed[k] = top
+
+    return {
+        "players": list(players),
+        "pi1": {"mean_position": mean_position},
+        "pi2": {"total_distance": total_distance},
+        "pi4": {"mean_speed": mean_speed, "max_speed": max_speed}
+    }
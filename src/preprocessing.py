@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
 
+from src.instrumentation import instrument
+
 
 # ==================================================
 # VALIDAÇÃO DE DADOS
@@ -37,7 +40,29 @@ def basic_validation(
 # ==================================================
 # CONTEXTO DE ANÁLISE — TREINO vs JOGO
 # ==================================================
-def infer_game_context(X: pd.DataFrame) -> pd.DataFrame:
+def infer_context_column(X) -> pd.Categorical:
+    """
+    Devolve a coluna de contexto como pd.Categorical compacto
+    (1 byte por frame), sem copiar o dataset.
+
+    Aceita um DataFrame ou um ColumnStore (src.column_store).
+    """
+
+    # Se o dataset já tiver contexto explícito, usar
+    if "contexto" in X.columns:
+        return pd.Categorical(X["contexto"])
+
+    n_rows = len(X) if isinstance(X, pd.DataFrame) else X.n_rows
+
+    # Comportamento seguro por defeito
+    return pd.Categorical.from_codes(
+        np.zeros(n_rows, dtype=np.int8),
+        categories=["Jogo"]
+    )
+
+
+@instrument("preprocessing.infer_game_context")
+def infer_game_context(X):
     """
     Infere o contexto de análise segundo o relatório M2:
     - Treino
@@ -51,15 +76,25 @@ def infer_game_context(X: pd.DataFrame) -> pd.DataFrame:
     - Coerente com o relatório
     - Não especulativa
     - Facilmente extensível no futuro
-    """
 
-    X = X.copy()
+    Um DataFrame é sempre devolvido como cópia superficial (as colunas
+    de tracking não são copiadas), com ou sem coluna 'contexto' prévia:
+    quem chama pode acrescentar ou substituir colunas sem alterar X.
+    A coluna inferida é categórica. Um ColumnStore não é alterável no
+    local: é devolvido tal como está ou, sem contexto, um novo store
+    com a coluna 'contexto'.
+    """
 
     # Se o dataset já tiver contexto explícito, usar
     if "contexto" in X.columns:
-        return X
+        return X.copy(deep=False) if isinstance(X, pd.DataFrame) else X
 
-    # Comportamento seguro por defeito
-    X["contexto"] = "Jogo"
+    context = infer_context_column(X)
+
+    if not isinstance(X, pd.DataFrame):
+        return X.with_column("contexto", context)
+
+    X = X.copy(deep=False)
+    X["contexto"] = context
 
     return X
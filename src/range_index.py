@@ -0,0 +1,310 @@
+# =====================================================
+# ÍNDICE DE INTERVALOS — KPIs PARA QUALQUER [start, end) EM O(1)
+# =====================================================
+#
+# Pré-agrega o dataset por blocos de frames (somas cumulativas, máximos
+# numa sparse table, histogramas 2D e contagens por canal por bloco).
+# Uma consulta [start, end) com subamostragem `step` combina os blocos
+# completos em O(1) (máximo em O(1) via sparse table) e percorre apenas
+# as pontas parciais (< 2 blocos), sem tocar no resto dos dados.
+
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from src.heatmap import CourtGrid, grid_from_data
+from src.kpis import (
+    PI5_CHANNEL_EDGES,
+    channel_labels,
+    channel_summary,
+    column_array,
+)
+from src.results import (
+    LazySeries,
+    PI1Result,
+    PI2Result,
+    PI4Result,
+    as_float32,
+    positions_frame,
+)
+
+
+def _block_sums(values: np.ndarray, block: int) -> np.ndarray:
+    """
+    Somas cumulativas por bloco: cum[k] = soma dos primeiros k blocos.
+    `values` pode ser 1D ou 2D (uma coluna por componente).
+    """
+
+    n_blocks = len(values) // block
+    blocks = values[:n_blocks * block].reshape(
+        n_blocks, block, *values.shape[1:]
+    )
+    sums = blocks.sum(axis=1, dtype=np.float64)
+
+    return np.concatenate(
+        [np.zeros((1, *values.shape[1:])), np.cumsum(sums, axis=0)]
+    )
+
+
+def _block_sums_nan(values: np.ndarray, block: int):
+    """
+    Como _block_sums, mas com os NaN contados à parte: uma diferença de
+    somas cumulativas com NaN seria sempre NaN, mesmo fora do intervalo.
+    """
+
+    missing = np.isnan(values)
+    return (
+        _block_sums(np.where(missing, 0, values), block),
+        _block_sums(missing, block)
+    )
+
+
+def _block_counts(ids: np.ndarray, n_ids: int, block: int) -> np.ndarray:
+    """
+    Contagens cumulativas por bloco de ids inteiros (ids < 0 ignorados):
+    cum[k, i] = nº de ocorrências de i nos primeiros k blocos.
+    """
+
+    n_blocks = len(ids) // block
+    ids = ids[:n_blocks * block]
+    block_of = np.repeat(np.arange(n_blocks), block)
+    valid = ids >= 0
+
+    counts = np.bincount(
+        block_of[valid] * n_ids + ids[valid],
+        minlength=n_blocks * n_ids
+    ).reshape(n_blocks, n_ids)
+
+    return np.concatenate(
+        [np.zeros((1, n_ids), dtype=np.int64), np.cumsum(counts, axis=0)]
+    )
+
+
+class _SparseMax:
+    """Sparse table de máximos por bloco: consulta em O(1)."""
+
+    def __init__(self, values: np.ndarray, block: int):
+        n_blocks = len(values) // block
+        level = values[:n_blocks * block].reshape(n_blocks, block).max(axis=1)
+        self.levels = [level]
+
+        width = 1
+        while 2 * width <= n_blocks:
+            level = np.maximum(level[:-width], level[width:])
+            self.levels.append(level)
+            width *= 2
+
+    def query(self, k0: int, k1: int):
+        """Máximo dos blocos [k0, k1), com k1 > k0."""
+        j = (k1 - k0).bit_length() - 1
+        level = self.levels[j]
+        return np.maximum(level[k0], level[k1 - (1 << j)])
+
+
+class _StridedIndex:
+    """
+    Agregados por bloco de uma subsequência x[r::step] (uma por resíduo
+    `r` de start módulo step), construída apenas quando é consultada.
+    """
+
+    def __init__(self, x, y, speed, channel, n_channels, cell, n_cells, block):
+        self.block = block
+        self.x = x
+        self.y = y
+        self.speed = speed
+        self.channel = channel
+        self.cell = cell
+
+        # distância entre frames consecutivos da subsequência
+        self.distances = np.sqrt(np.diff(x) ** 2 + np.diff(y) ** 2)
+
+        self.cum_xy, self.cum_xy_missing = _block_sums_nan(
+            np.column_stack([x, y]), block
+        )
+        self.cum_distance, self.cum_distance_missing = _block_sums_nan(
+            self.distances, block
+        )
+        self.cum_speed, self.cum_speed_missing = _block_sums_nan(speed, block)
+        self.max_speed = _SparseMax(speed, block)
+        self.cum_channel = _block_counts(channel, n_channels, block)
+        self.cum_cell = _block_counts(cell, n_cells, block)
+
+    def split(self, i0: int, i1: int, length: int | None = None):
+        """
+        Divide [i0, i1) em blocos completos [k0, k1) e pontas parciais.
+        Devolve (k0, k1, [(a, b), ...]) com as pontas a percorrer.
+        """
+
+        block = self.block
+        n_blocks = (length if length is not None else len(self.x)) // block
+        k0 = min(-(-i0 // block), n_blocks)
+        k1 = min(i1 // block, n_blocks)
+
+        if k0 >= k1:
+            return 0, 0, [(i0, i1)]
+
+        return k0, k1, [(i0, k0 * block), (k1 * block, i1)]
+
+
+class KPIRangeIndex:
+    """
+    Índice de KPIs sobre um dataset completo (DataFrame ou ColumnStore).
+
+    query(start, end, step) devolve o mesmo dicionário que
+    compute_all_kpis(X.iloc[start:end:step]), mas:
+    - PI 1 (média), PI 2 (total), PI 3, PI 4 (média/máximo) e PI 5
+      vêm dos agregados por bloco, sem percorrer as linhas do intervalo
+    - as séries (posições, distâncias, velocidades) ficam como
+      LazySeries sobre os arrays do índice (src.results)
+
+    O PI 3 usa arestas fixas (`grid`, ou por defeito as do dataset
+    completo) para que os heatmaps de intervalos diferentes sejam
+    comparáveis.
+    """
+
+    def __init__(
+        self,
+        X,
+        bins_x: int = 10,
+        bins_y: int = 10,
+        channel_edges=PI5_CHANNEL_EDGES,
+        block: int = 4096,
+        grid: CourtGrid | None = None
+    ):
+        self.block = block
+        self.channel_edges = channel_edges
+
+        self.x = column_array(X, "#x0")
+        self.y = column_array(X, "#y0")
+        self.speed = np.sqrt(
+            column_array(X, "#vx0") ** 2 + column_array(X, "#vy0") ** 2
+        )
+        self.channel = np.digitize(self.x, channel_edges).astype(np.int8)
+        self.n_channels = len(channel_edges) + 1
+
+        ball_x = column_array(X, "#ball_x")
+        ball_y = column_array(X, "#ball_y")
+        if grid is None:
+            grid = grid_from_data(ball_x, ball_y, bins_x, bins_y)
+        self.grid = grid
+        self.cell = grid.cell_ids(ball_x, ball_y)
+
+        self._strided = {}
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def _index(self, step: int, residue: int) -> _StridedIndex:
+        key = (step, residue)
+
+        if key not in self._strided:
+            rows = slice(residue, None, step)
+            self._strided[key] = _StridedIndex(
+                self.x[rows],
+                self.y[rows],
+                self.speed[rows],
+                self.channel[rows],
+                self.n_channels,
+                self.cell[rows],
+                self.grid.n_cells,
+                self.block
+            )
+
+        return self._strided[key]
+
+    def query(
+        self,
+        start: int = 0,
+        end: int | None = None,
+        step: int = 1
+    ) -> dict:
+        """KPIs do intervalo de frames [start, end) com subamostragem step."""
+
+        n = len(self)
+        start, end, step = slice(start, end, step).indices(n)
+        end = max(end, start)
+
+        residue = start % step
+        index = self._index(step, residue)
+        i0 = start // step
+        i1 = i0 + len(range(start, end, step))
+
+        # ---------- PI 1 ----------
+        k0, k1, parts = index.split(i0, i1)
+        sum_xy = index.cum_xy[k1] - index.cum_xy[k0]
+        count_xy = (k1 - k0) * index.block - (
+            index.cum_xy_missing[k1] - index.cum_xy_missing[k0]
+        )
+        for a, b in parts:
+            xy = np.column_stack([index.x[a:b], index.y[a:b]])
+            sum_xy += np.nansum(xy, axis=0, dtype=np.float64)
+            count_xy += np.count_nonzero(~np.isnan(xy), axis=0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_x, mean_y = sum_xy / count_xy
+
+        # ---------- PI 2 ----------
+        d0, d1 = i0, max(i1 - 1, i0)
+        k0, k1, parts = index.split(d0, d1, len(index.distances))
+        total_distance = index.cum_distance[k1] - index.cum_distance[k0]
+        if index.cum_distance_missing[k1] > index.cum_distance_missing[k0]:
+            total_distance = np.nan
+        for a, b in parts:
+            total_distance += index.distances[a:b].sum(dtype=np.float64)
+
+        # ---------- PI 3 / PI 4 / PI 5 ----------
+        k0, k1, parts = index.split(i0, i1)
+        cells = index.cum_cell[k1] - index.cum_cell[k0]
+        channels = index.cum_channel[k1] - index.cum_channel[k0]
+        speed_sum = index.cum_speed[k1] - index.cum_speed[k0]
+        if index.cum_speed_missing[k1] > index.cum_speed_missing[k0]:
+            speed_sum = np.nan
+        max_speed = index.max_speed.query(k0, k1) if k1 > k0 else -np.inf
+
+        for a, b in parts:
+            cell = index.cell[a:b]
+            cells += np.bincount(cell[cell >= 0], minlength=len(cells))
+            channels += np.bincount(
+                index.channel[a:b], minlength=self.n_channels
+            )
+            speed_sum += index.speed[a:b].sum(dtype=np.float64)
+            if b > a:
+                max_speed = np.maximum(max_speed, index.speed[a:b].max())
+
+        n_rows = i1 - i0
+
+        # séries: vistas sobre os arrays do índice, calculadas a pedido
+        frames = slice(i0, i1)
+
+        return {
+            "pi1": PI1Result(
+                (mean_x, mean_y),
+                n_rows,
+                LazySeries(
+                    partial(
+                        positions_frame,
+                        index=pd.RangeIndex(start, end, step)
+                    ),
+                    [index.x, index.y],
+                    frames
+                )
+            ),
+            "pi2": PI2Result(
+                total_distance,
+                n_rows,
+                LazySeries(as_float32, [index.distances], slice(d0, d1))
+            ),
+            "pi3": self.grid.result(
+                cells.reshape(self.grid.shape),
+                n_rows - cells.sum()
+            ),
+            "pi4": PI4Result(
+                speed_sum / n_rows if n_rows else np.nan,
+                max_speed if n_rows else np.nan,
+                n_rows,
+                LazySeries(as_float32, [index.speed], frames)
+            ),
+            "pi5": channel_summary(channels, channel_labels(self.n_channels))
+        }
+
@@ -0,0 +1,449 @@
+# =====================================================
+# RESULTADOS DOS PI 1, 2 E 4 — OBJETOS COMPACTOS
+# =====================================================
+#
+# Os PI 1, 2 e 4 devolviam séries do tamanho da seleção (posições,
+# distâncias e velocidades frame a frame), que ficavam nas caches de
+# KPIs para cada intervalo escolhido. Os resultados guardam agora:
+# - as estatísticas resumo (médias, totais, máximos)
+# - uma LazySeries: as colunas de tracking já em memória (sem cópia) e
+#   os frames selecionados (um slice, ou troços start:stop:step em vez
+#   de um array por frame); a série completa (float32) só é calculada
+#   quando pedida e não fica guardada
+# - as versões reduzidas usadas pelos gráficos (LTTB, envelope mín/máx,
+#   grelha de densidade), calculadas no 1.º uso e memorizadas
+#
+# O acesso por chave (result["speed_series"]) continua a funcionar como
+# nos dicionários anteriores. Um resultado lido do KPIStore só traz a
+# parte compacta: as chaves das séries completas deixam de existir.
+
+from abc import abstractmethod
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from src.decimation import MAX_POINTS, decimate_series, minmax_envelope
+from src.density import binned_kde
+
+
+# posições guardadas para o scatter de recurso do PI 1
+MAX_SAMPLE = 5000
+
+_MISSING = object()
+
+
+# ==================================================
+# FRAMES SELECIONADOS EM TROÇOS
+# ==================================================
+class FrameRuns:
+    """
+    Frames ordenados como troços de passo constante:
+    starts[k], starts[k] + step, ... (lengths[k] frames). Uma seleção
+    por label (janelas contíguas) ocupa o nº de troços, não de frames.
+    """
+
+    __slots__ = ("starts", "lengths", "step")
+
+    def __init__(self, starts, lengths, step: int):
+        self.starts = starts
+        self.lengths = lengths
+        self.step = step
+
+    @classmethod
+    def encode(cls, frames):
+        """
+        FrameRuns de `frames` (ordenados, sem repetidos), ou os próprios
+        frames se os troços não ocuparem menos memória.
+        """
+
+        if not isinstance(frames, np.ndarray) or len(frames) < 2:
+            return frames
+
+        diffs = np.diff(frames)
+        step = int(diffs.min())
+        breaks = np.flatnonzero(diffs != step) + 1
+
+        if step < 1 or 2 * (len(breaks) + 1) >= len(frames):
+            return frames
+
+        bounds = np.concatenate([[0], breaks, [len(frames)]])
+        return cls(frames[bounds[:-1]], np.diff(bounds), step)
+
+    def __len__(self) -> int:
+        return int(self.lengths.sum())
+
+    def to_array(self) -> np.ndarray:
+        offsets = np.cumsum(self.lengths) - self.lengths
+        base = np.repeat(self.starts - self.step * offsets, self.lengths)
+        frames = base + self.step * np.arange(len(self), dtype=base.dtype)
+        return frames.astype(self.starts.dtype, copy=False)
+
+
+# ==================================================
+# SÉRIES CALCULADAS A PEDIDO
+# ==================================================
+class LazySeries:
+    """
+    compute(*colunas[frames]) calculado a pedido.
+
+    `columns` são arrays (ou índices pandas) já em memória, referidos
+    sem cópia; `frames` (slice, FrameRuns, array de posições ou None)
+    só é aplicado quando a série é pedida.
+    """
+
+    __slots__ = ("compute", "columns", "frames")
+
+    def __init__(self, compute, columns, frames=None):
+        self.compute = compute
+        self.columns = tuple(columns)
+        self.frames = frames
+
+    def __call__(self):
+        frames = self.frames
+        if frames is None:
+            return self.compute(*self.columns)
+        if isinstance(frames, FrameRuns):
+            frames = frames.to_array()
+
+        return self.compute(*(
+            None if c is None else c[frames] for c in self.columns
+        ))
+
+    def nbytes(self, seen: set | None = None) -> int:
+        """Memória própria (as colunas pertencem ao dataset)."""
+
+        seen = set() if seen is None else seen
+
+        # seleção e argumentos fixos (ex.: functools.partial)
+        keywords = getattr(self.compute, "keywords", {})
+        return (
+            _array_nbytes(self.frames, seen) + _array_nbytes(keywords, seen)
+        )
+
+
+def as_float32(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float32)
+
+
+def positions_frame(x, y, index=None) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"#x0": as_float32(x), "#y0": as_float32(y)},
+        index=index,
+        copy=False
+    )
+
+
+def step_distances(x, y, segment_starts=None, dtype=np.float32):
+    """
+    Distâncias entre posições consecutivas (n - 1), em float32 (séries
+    guardadas); dtype=None mantém a precisão de x, y (para totais).
+    """
+
+    distances = np.sqrt(np.diff(x) ** 2 + np.diff(y) ** 2)
+    if dtype is not None:
+        distances = np.asarray(distances, dtype=dtype)
+
+    if segment_starts is not None:
+        crossings = np.asarray(segment_starts, dtype=np.int64) - 1
+        distances[crossings[crossings >= 0]] = 0
+
+    return distances
+
+
+def speeds(vx, vy, dtype=np.float32) -> np.ndarray:
+    """Magnitude da velocidade, como step_distances quanto a dtype."""
+
+    values = np.sqrt(vx**2 + vy**2)
+    return values if dtype is None else np.asarray(values, dtype=dtype)
+
+
+def _array_nbytes(value, seen: set) -> int:
+    """Bytes dos arrays em `value`; os já vistos (`seen`) contam 0."""
+
+    if value is None or value is _MISSING or id(value) in seen:
+        return 0
+    if isinstance(value, np.ndarray):
+        seen.add(id(value))
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        seen.add(id(value))
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, FrameRuns):
+        seen.add(id(value))
+        return _array_nbytes(value.starts, seen) + _array_nbytes(
+            value.lengths, seen
+        )
+    if isinstance(value, (tuple, list)):
+        return sum(_array_nbytes(v, seen) for v in value)
+    if isinstance(value, dict):
+        return sum(_array_nbytes(v, seen) for v in value.values())
+    return 0
+
+
+# ==================================================
+# BASE — ACESSO POR CHAVE
+# ==================================================
+class KPIResult(Mapping):
+    """
+    Resultado de um PI com acesso por chave, como os dicionários de
+    src.kpis. KEYS lista as chaves; SERIES as que exigem a série
+    completa (ausentes sem dados de origem).
+
+    Classe abstrata (Mapping já usa ABCMeta): cada PI implementa
+    compact / from_compact.
+    """
+
+    __slots__ = ("n_frames", "source")
+
+    KEYS: tuple[str, ...] = ()
+    SERIES: tuple[str, ...] = ()
+
+    def __getitem__(self, key: str):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        if key in self.SERIES and self.source is None:
+            raise KeyError(
+                f"{key!r}: série completa indisponível (resultado "
+                f"compacto, sem dados de origem)"
+            )
+        return getattr(self, key)
+
+    def __iter__(self):
+        for key in self.KEYS:
+            if key not in self.SERIES or self.source is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        summary = ", ".join(
+            f"{k}={getattr(self, k)!r}" for k in self.KEYS
+            if k not in self.SERIES
+        )
+        return f"{type(self).__name__}({summary}, n_frames={self.n_frames})"
+
+    def nbytes(self, seen: set | None = None) -> int:
+        """
+        Memória própria: resumo, versões reduzidas e seleção. `seen`
+        (ids) evita contar duas vezes arrays partilhados entre PI.
+        """
+
+        seen = set() if seen is None else seen
+
+        own = sum(
+            _array_nbytes(getattr(self, name), seen)
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+            if name != "source"
+        )
+        return own + (self.source.nbytes(seen) if self.source else 0)
+
+    @abstractmethod
+    def compact(self) -> dict:
+        """Estado sem séries completas (para o KPIStore)."""
+
+    @classmethod
+    @abstractmethod
+    def from_compact(cls, state: dict) -> "KPIResult":
+        """Resultado reconstruído a partir de compact()."""
+
+
+# ==================================================
+# PI 1 — DISTRIBUIÇÃO POSICIONAL
+# ==================================================
+class PI1Result(KPIResult):
+    """Posição média, densidade (KDE binned) e amostra de posições."""
+
+    __slots__ = ("mean_position", "_density", "_sample")
+
+    KEYS = ("positions", "mean_position")
+    SERIES = ("positions",)
+
+    def __init__(
+        self,
+        mean_position,
+        n_frames: int,
+        source: LazySeries | None = None,
+        density=_MISSING,
+        sample: pd.DataFrame | None = None
+    ):
+        self.mean_position = mean_position
+        self.n_frames = n_frames
+        self.source = source
+        self._density = density
+        self._sample = sample
+
+    @property
+    def positions(self) -> pd.DataFrame:
+        """Posições #x0/#y0 de todos os frames selecionados (float32)."""
+        return self.source()
+
+    def density(self):
+        """
+        binned_kde sobre todas as posições (grelha float32), ou None se
+        não houver pontos ou dispersão suficientes.
+        """
+
+        if self._density is _MISSING:
+            positions = self.positions
+            try:
+                density = binned_kde(positions["#x0"], positions["#y0"])
+            except ValueError:
+                self._density = None
+            else:
+                density["density"] = density["density"].astype(np.float32)
+                self._density = density
+
+        return self._density
+
+    def sample(self, max_points: int = MAX_SAMPLE) -> pd.DataFrame:
+        """Até max_points posições igualmente espaçadas (scatter)."""
+
+        if self._sample is None:
+            positions = self.positions
+            stride = max(1, -(-len(positions) // max_points))
+            self._sample = positions.iloc[::stride].copy()
+
+        return self._sample
+
+    def compact(self) -> dict:
+        return {
+            "mean_position": self.mean_position,
+            "n_frames": self.n_frames,
+            "density": self.density(),
+            "sample": self.sample(),
+        }
+
+    @classmethod
+    def from_compact(cls, state: dict) -> "PI1Result":
+        return cls(
+            state["mean_position"], state["n_frames"],
+            density=state["density"], sample=state["sample"]
+        )
+
+
+# ==================================================
+# PI 2 — DISTÂNCIA PERCORRIDA
+# ==================================================
+class PI2Result(KPIResult):
+    """Distância total e distância acumulada reduzida (LTTB)."""
+
+    __slots__ = ("total_distance", "_points")
+
+    KEYS = ("total_distance", "instant_distances")
+    SERIES = ("instant_distances",)
+
+    def __init__(
+        self,
+        total_distance,
+        n_frames: int,
+        source: LazySeries | None = None,
+        points=None
+    ):
+        self.total_distance = total_distance
+        self.n_frames = n_frames
+        self.source = source
+        self._points = points
+
+    @property
+    def instant_distances(self) -> np.ndarray:
+        return self.source()
+
+    def decimated(self) -> tuple[np.ndarray, np.ndarray]:
+        """(frames, distância acumulada) com até MAX_POINTS pontos."""
+
+        if self._points is None:
+            idx, values = decimate_series(np.cumsum(self.instant_distances))
+            self._points = (idx.astype(np.int64), as_float32(values))
+
+        return self._points
+
+    def compact(self) -> dict:
+        return {
+            "total_distance": self.total_distance,
+            "n_frames": self.n_frames,
+            "points": self.decimated(),
+        }
+
+    @classmethod
+    def from_compact(cls, state: dict) -> "PI2Result":
+        return cls(
+            state["total_distance"], state["n_frames"],
+            points=state["points"]
+        )
+
+
+# ==================================================
+# PI 4 — INTENSIDADE DE REAÇÃO
+# ==================================================
+class PI4Result(KPIResult):
+    """Velocidade média/máxima, linha LTTB e envelope mín/máx."""
+
+    __slots__ = ("mean_speed", "max_speed", "_points", "_envelope")
+
+    KEYS = ("speed_series", "mean_speed", "max_speed")
+    SERIES = ("speed_series",)
+
+    def __init__(
+        self,
+        mean_speed,
+        max_speed,
+        n_frames: int,
+        source: LazySeries | None = None,
+        points=None,
+        envelope=_MISSING
+    ):
+        self.mean_speed = mean_speed
+        self.max_speed = max_speed
+        self.n_frames = n_frames
+        self.source = source
+        self._points = points
+        self._envelope = envelope
+
+    @property
+    def speed_series(self) -> np.ndarray:
+        return self.source()
+
+    def decimated(self) -> tuple[np.ndarray, np.ndarray]:
+        """(frames, velocidade) com até MAX_POINTS pontos (LTTB)."""
+
+        if self._points is None:
+            idx, values = decimate_series(self.speed_series)
+            self._points = (idx.astype(np.int64), as_float32(values))
+
+        return self._points
+
+    def envelope(self):
+        """(x, mín, máx) por bucket, ou None se a série já couber."""
+
+        if self._envelope is _MISSING:
+            series = self.speed_series
+            self._envelope = (
+                minmax_envelope(series, MAX_POINTS // 2)
+                if len(series) > MAX_POINTS else None
+            )
+
+        return self._envelope
+
+    def compact(self) -> dict:
+        return {
+            "mean_speed": self.mean_speed,
+            "max_speed": self.max_speed,
+            "n_frames": self.n_frames,
+            "points": self.decimated(),
+            "envelope": self.envelope(),
+        }
+
+    @classmethod
+    def from_compact(cls, state: dict) -> "PI4Result":
+        return cls(
+            state["mean_speed"], state["max_speed"], state["n_frames"],
+            points=state["points"], envelope=state["envelope"]
+        )
+
+
+RESULT_TYPES = {
+    cls.__name__: cls for cls in (PI1Result, PI2Result, PI4Result)
+}
@@ -0,0 +1,188 @@
+# =====================================================
+# SEGMENTAÇÃO — KPIs POR SEQUÊNCIA / POSSE DE BOLA
+# =====================================================
+#
+# As linhas de um dataset de tracking não formam uma única sequência
+# contínua: janelas e sequências diferentes estão concatenadas, e a
+# subamostragem por `step` aumenta os saltos. Aqui as fronteiras de
+# segmento são detetadas (ou dadas) como posições de início, e os KPIs
+# de todos os segmentos são reduzidos de uma vez com np.add.reduceat /
+# np.maximum.reduceat, sem ciclos Python por grupo.
+
+import numpy as np
+import pandas as pd
+
+from src.kpis import PI5_CHANNEL_EDGES, channel_labels, column_array
+
+
+def _step_distances(X) -> np.ndarray:
+    """Distância do guarda-redes entre cada frame e o anterior (n - 1)."""
+
+    x = column_array(X, "#x0")
+    y = column_array(X, "#y0")
+
+    return np.sqrt(np.diff(x) ** 2 + np.diff(y) ** 2)
+
+
+def segment_starts(
+    X,
+    sequence_column: str | None = None,
+    time_column: str | None = None,
+    max_gap: float | None = None,
+    max_jump: float | None = None
+) -> np.ndarray:
+    """
+    Posições (0-based, ordenadas) onde começa cada segmento.
+
+    Há uma fronteira antes da linha i quando:
+    - sequence_column muda de valor entre i - 1 e i
+    - max_gap: o salto de tempo entre i - 1 e i excede max_gap; o tempo
+      vem de time_column ou, sem ela, do índice do DataFrame (útil depois
+      de X.iloc[::step], onde frames seguidos distam `step`)
+    - max_jump: o guarda-redes "teleporta" mais do que max_jump entre
+      i - 1 e i (em unidades das coordenadas; escalar com o step)
+
+    Sem critérios devolve [0] (um só segmento).
+    """
+
+    n = len(X) if isinstance(X, pd.DataFrame) else X.n_rows
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    breaks = np.zeros(n - 1, dtype=bool)
+
+    if sequence_column is not None:
+        ids = column_array(X, sequence_column)
+        breaks |= ids[1:] != ids[:-1]
+
+    if max_gap is not None:
+        if time_column is not None:
+            t = column_array(X, time_column)
+        elif isinstance(X, pd.DataFrame):
+            t = np.asarray(X.index)
+        else:
+            raise ValueError(
+                "max_gap sem time_column requer um DataFrame (índice)."
+            )
+        breaks |= np.diff(t) > max_gap
+
+    if max_jump is not None:
+        breaks |= _step_distances(X) > max_jump
+
+    return np.concatenate([[0], np.flatnonzero(breaks) + 1]).astype(np.int64)
+
+
+def segment_ids(starts: np.ndarray, n: int) -> np.ndarray:
+    """Id do segmento (0..S-1) de cada uma das n linhas."""
+
+    lengths = np.diff(np.append(starts, n))
+    return np.repeat(np.arange(len(starts)), lengths)
+
+
+def _validate_starts(starts, n: int) -> np.ndarray:
+    starts = np.asarray(starts, dtype=np.int64)
+
+    if n == 0:
+        return starts[:0]
+
+    valid = (
+        len(starts) > 0
+        and starts[0] == 0
+        and starts[-1] < n
+        and np.all(np.diff(starts) > 0)
+    )
+    if not valid:
+        raise ValueError(
+            "starts deve ser estritamente crescente, começar em 0 e "
+            "ficar dentro do dataset."
+        )
+
+    return starts
+
+
+def segment_kpis(
+    X,
+    starts=None,
+    channel_edges=PI5_CHANNEL_EDGES,
+    labels=None
+) -> pd.DataFrame:
+    """
+    KPIs por segmento, todos numa só passagem vetorizada.
+
+    `starts` são as posições de início (ver segment_starts); por defeito
+    o dataset é um único segmento. Devolve um DataFrame com uma linha por
+    segmento:
+    - start, end, n_frames: linhas [start, end) do segmento
+    - mean_x, mean_y (PI 1): posição média, NaN ignorados
+    - total_distance (PI 2): só entre frames do mesmo segmento, sem os
+      saltos de uma sequência para a seguinte
+    - mean_speed, max_speed (PI 4)
+    - uma coluna de contagem por canal (PI 5)
+    """
+
+    x = column_array(X, "#x0")
+    y = column_array(X, "#y0")
+    n = len(x)
+    starts = _validate_starts([0] if starts is None else starts, n)
+
+    n_channels = len(channel_edges) + 1
+    if labels is None:
+        labels = channel_labels(n_channels)
+    elif len(labels) != n_channels:
+        raise ValueError(
+            f"São necessárias {n_channels} labels para "
+            f"{len(channel_edges)} arestas."
+        )
+
+    if n == 0:
+        columns = [
+            "start", "end", "n_frames", "mean_x", "mean_y",
+            "total_distance", "mean_speed", "max_speed", *labels
+        ]
+        return pd.DataFrame(columns=columns)
+
+    lengths = np.diff(np.append(starts, n))
+
+    # ---------- PI 1 (média com NaN ignorados) ----------
+    xy = np.column_stack([x, y]).astype(np.float64)
+    missing = np.isnan(xy)
+    sums = np.add.reduceat(np.where(missing, 0, xy), starts, axis=0)
+    counts = np.add.reduceat((~missing).astype(np.int64), starts, axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_xy = sums / counts
+
+    # ---------- PI 2 (distância até cada frame; 0 no início) ----------
+    arrival = np.zeros(n)
+    arrival[1:] = _step_distances(X)
+    arrival[starts] = 0
+    total_distance = np.add.reduceat(arrival, starts)
+
+    # ---------- PI 4 ----------
+    speed = np.sqrt(
+        column_array(X, "#vx0") ** 2 + column_array(X, "#vy0") ** 2
+    )
+    mean_speed = np.add.reduceat(speed.astype(np.float64), starts) / lengths
+    max_speed = np.maximum.reduceat(speed, starts)
+
+    # ---------- PI 5 (contagens por segmento × canal) ----------
+    channel = np.digitize(x, np.asarray(channel_edges, dtype=float))
+    seg = segment_ids(starts, n)
+    channels = np.bincount(
+        seg * n_channels + channel,
+        minlength=len(starts) * n_channels
+    ).reshape(len(starts), n_channels)
+
+    table = pd.DataFrame({
+        "start": starts,
+        "end": starts + lengths,
+        "n_frames": lengths,
+        "mean_x": mean_xy[:, 0],
+        "mean_y": mean_xy[:, 1],
+        "total_distance": total_distance,
+        "mean_speed": mean_speed,
+        "max_speed": max_speed
+    })
+    table[list(labels)] = channels
+
+    return table
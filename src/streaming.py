@@ -0,0 +1,372 @@
+# =====================================================
+# STREAMING — KPIs POR BLOCOS (DADOS MAIORES QUE A RAM)
+# =====================================================
+#
+# Cada indicador é um acumulador com update(bloco) / result().
+# Os resultados coincidem com os de src.kpis sobre o dataset completo;
+# as séries frame-a-frame só são guardadas com keep_series=True.
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data_loading import read_csv_chunks
+from src.heatmap import CourtGrid, grid_from_data, heatmap_counts
+from src.kpis import (
+    column_array,
+    pi5_threat_progression_channels,
+    required_columns,
+)
+from src.preprocessing import infer_game_context
+
+
+ALL_KPIS = ("pi1", "pi2", "pi3", "pi4", "pi5")
+
+
+# ==================================================
+# PI 1 — MÉDIA ACUMULADA
+# ==================================================
+class PI1Accumulator:
+    """Posição média do guarda-redes (ignora NaN, como pandas)."""
+
+    def __init__(self, keep_series: bool = False):
+        self.sum = np.zeros(2)
+        self.count = np.zeros(2, dtype=np.int64)
+        self.keep_series = keep_series
+        self._positions = []
+
+    def update(self, X) -> None:
+        for i, name in enumerate(["#x0", "#y0"]):
+            values = column_array(X, name)
+            self.sum[i] += np.nansum(values, dtype=np.float64)
+            self.count[i] += np.count_nonzero(~np.isnan(values))
+
+        if self.keep_series:
+            self._positions.append(pd.DataFrame({
+                "#x0": column_array(X, "#x0"),
+                "#y0": column_array(X, "#y0")
+            }))
+
+    def merge(self, other: "PI1Accumulator") -> None:
+        self.sum += other.sum
+        self.count += other.count
+        self._positions += other._positions
+
+    def result(self) -> dict:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_x, mean_y = self.sum / self.count
+
+        result = {"mean_position": (mean_x, mean_y)}
+
+        if self.keep_series:
+            result["positions"] = (
+                pd.concat(self._positions, ignore_index=True)
+                if self._positions
+                else pd.DataFrame(columns=["#x0", "#y0"])
+            )
+
+        return result
+
+
+# ==================================================
+# PI 2 — DISTÂNCIA COM TRANSPORTE DA ÚLTIMA POSIÇÃO
+# ==================================================
+class PI2Accumulator:
+    """
+    Distância percorrida. A última posição de cada bloco é guardada
+    para que o np.diff atravesse a fronteira entre blocos.
+    """
+
+    def __init__(self, keep_series: bool = False):
+        self.total_distance = 0.0
+        self.last = None
+        self.keep_series = keep_series
+        self._distances = []
+
+    def update(self, X) -> None:
+        x = column_array(X, "#x0")
+        y = column_array(X, "#y0")
+
+        if len(x) == 0:
+            return
+
+        if self.last is not None:
+            x = np.concatenate([[self.last[0]], x]).astype(x.dtype)
+            y = np.concatenate([[self.last[1]], y]).astype(y.dtype)
+
+        distances = np.sqrt(np.diff(x) ** 2 + np.diff(y) ** 2)
+
+        self.total_distance += distances.sum(dtype=np.float64)
+        self.last = (x[-1], y[-1])
+
+        if self.keep_series:
+            self._distances.append(distances)
+
+    def merge(self, other: "PI2Accumulator") -> None:
+        """
+        Junta outra gravação (ex.: outro jogo): as distâncias somam-se,
+        sem ligar a última posição de uma à primeira da outra.
+        """
+        self.total_distance += other.total_distance
+        self._distances += other._distances
+
+    def result(self) -> dict:
+        result = {"total_distance": self.total_distance}
+
+        if self.keep_series:
+            result["instant_distances"] = (
+                np.concatenate(self._distances)
+                if self._distances
+                else np.array([])
+            )
+
+        return result
+
+
+# ==================================================
+# PI 3 — HEATMAP ADITIVO (GRELHA FIXA)
+# ==================================================
+class PI3Accumulator:
+    """
+    Heatmap das posições da bola sobre uma grelha fixa (CourtGrid).
+    Com a grelha do dataset completo (grid_from_data), as contagens são
+    idênticas às de pi3_threat_frequency_by_zone.
+    """
+
+    def __init__(self, grid: CourtGrid):
+        self.grid = grid
+        self.heatmap = np.zeros(grid.shape, dtype=np.int64)
+        self.outside = 0
+
+    def update(self, X) -> None:
+        counts, outside = heatmap_counts(
+            column_array(X, "#ball_x"),
+            column_array(X, "#ball_y"),
+            self.grid
+        )
+        self.heatmap += counts
+        self.outside += outside
+
+    def merge(self, other: "PI3Accumulator") -> None:
+        if other.grid != self.grid:
+            raise ValueError(
+                "Heatmaps com grelhas diferentes não são somáveis."
+            )
+        self.heatmap += other.heatmap
+        self.outside += other.outside
+
+    def result(self) -> dict:
+        return self.grid.result(self.heatmap, self.outside)
+
+
+# ==================================================
+# PI 4 — MÉDIA E MÁXIMO ACUMULADOS
+# ==================================================
+class PI4Accumulator:
+    """Velocidade média e máxima do guarda-redes."""
+
+    def __init__(self, keep_series: bool = False):
+        self.sum = 0.0
+        self.count = 0
+        self.max_speed = -np.inf
+        self.keep_series = keep_series
+        self._speeds = []
+
+    def update(self, X) -> None:
+        vx = column_array(X, "#vx0")
+        vy = column_array(X, "#vy0")
+        speed = np.sqrt(vx**2 + vy**2)
+
+        if len(speed) == 0:
+            return
+
+        self.sum += speed.sum(dtype=np.float64)
+        self.count += len(speed)
+        self.max_speed = np.maximum(self.max_speed, speed.max())
+
+        if self.keep_series:
+            self._speeds.append(speed)
+
+    def merge(self, other: "PI4Accumulator") -> None:
+        self.sum += other.sum
+        self.count += other.count
+        self.max_speed = np.maximum(self.max_speed, other.max_speed)
+        self._speeds += other._speeds
+
+    def result(self) -> dict:
+        empty = self.count == 0
+        result = {
+            "mean_speed": np.nan if empty else self.sum / self.count,
+            "max_speed": np.nan if empty else self.max_speed,
+        }
+
+        if self.keep_series:
+            result["speed_series"] = (
+                np.concatenate(self._speeds) if self._speeds else np.array([])
+            )
+
+        return result
+
+
+# ==================================================
+# PI 5 — CONTAGENS POR CANAL
+# ==================================================
+class PI5Accumulator:
+    """Contagens por canal (esquerdo/central/direito), somadas por bloco."""
+
+    def __init__(self):
+        self.counts = None
+
+    def update(self, X) -> None:
+        self._add(pi5_threat_progression_channels(X)["counts"])
+
+    def merge(self, other: "PI5Accumulator") -> None:
+        if other.counts is not None:
+            self._add(other.counts)
+
+    def _add(self, counts: dict) -> None:
+        if self.counts is None:
+            self.counts = dict(counts)
+        else:
+            self.counts = {c: self.counts[c] + n for c, n in counts.items()}
+
+    def result(self) -> dict:
+        counts = self.counts or {"Esquerdo": 0, "Central": 0, "Direito": 0}
+        total = sum(counts.values())
+
+        percentages = (
+            {c: n / total * 100 for c, n in counts.items()}
+            if total > 0
+            else dict(counts)
+        )
+
+        return {
+            "counts": counts,
+            "percentages": percentages,
+            "total_threats": int(total)
+        }
+
+
+# ==================================================
+# LEITURA POR BLOCOS
+# ==================================================
+def iter_chunks(source, chunksize: int = 100_000, usecols=None):
+    """
+    Itera sobre blocos de linhas de:
+    - um caminho para CSV (lido com pd.read_csv(chunksize=...))
+    - um DataFrame ou ColumnStore já aberto (fatias sem cópia)
+    """
+
+    if isinstance(source, (str, Path)):
+        yield from read_csv_chunks(source, chunksize, usecols)
+        return
+
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield source.iloc[start:start + chunksize]
+        return
+
+    for start in range(0, source.n_rows, chunksize):
+        yield source.select(slice(start, start + chunksize))
+
+
+def select_context(chunk, context: str):
+    """Linhas de um bloco (DataFrame ou ColumnStore) no `context` dado."""
+
+    chunk = infer_game_context(chunk)
+    mask = np.asarray(chunk["contexto"] == context)
+
+    return (
+        chunk[mask] if isinstance(chunk, pd.DataFrame)
+        else chunk.select(mask)
+    )
+
+
+def _ball_grid(source, chunksize: int, bins_x: int, bins_y: int) -> CourtGrid:
+    """
+    1.ª passagem: mínimo/máximo da bola para reproduzir as arestas
+    que np.histogram2d calcularia sobre o dataset completo.
+    """
+
+    lo = np.array([np.inf, np.inf])
+    hi = np.array([-np.inf, -np.inf])
+
+    for chunk in iter_chunks(source, chunksize, ["#ball_x", "#ball_y"]):
+        for i, name in enumerate(["#ball_x", "#ball_y"]):
+            values = column_array(chunk, name)
+            values = values[np.isfinite(values)]
+            if len(values):
+                lo[i] = min(lo[i], values.min())
+                hi[i] = max(hi[i], values.max())
+
+    return grid_from_data(
+        np.array([lo[0], hi[0]]), np.array([lo[1], hi[1]]), bins_x, bins_y
+    )
+
+
+def stream_accumulators(
+    source,
+    kpis=ALL_KPIS,
+    chunksize: int = 100_000,
+    bins_x: int = 10,
+    bins_y: int = 10,
+    grid: CourtGrid | None = None,
+    context: str | None = None,
+    keep_series: bool = False
+) -> dict:
+    """
+    Acumuladores dos indicadores pedidos, alimentados numa única
+    leitura por blocos.
+
+    - source: caminho para CSV, DataFrame ou ColumnStore
+    - grid: grelha fixa do PI 3 (src.heatmap.CourtGrid); se omitida, é
+      feita uma passagem prévia às colunas da bola para obter as arestas
+      que np.histogram2d usaria
+    - context: se indicado ('Jogo', 'Treino'), filtra as linhas por
+      contexto (ver infer_game_context)
+    - keep_series: guardar também as séries frame-a-frame
+
+    Devolve os acumuladores {"pi1": PI1Accumulator, ...}, que podem
+    ser juntos com .merge() (ex.: vários jogos) antes de .result().
+    """
+
+    accumulators = {}
+
+    for kpi in kpis:
+        if kpi == "pi1":
+            accumulators[kpi] = PI1Accumulator(keep_series)
+        elif kpi == "pi2":
+            accumulators[kpi] = PI2Accumulator(keep_series)
+        elif kpi == "pi3":
+            if grid is None:
+                grid = _ball_grid(source, chunksize, bins_x, bins_y)
+            accumulators[kpi] = PI3Accumulator(grid)
+        elif kpi == "pi4":
+            accumulators[kpi] = PI4Accumulator(keep_series)
+        elif kpi == "pi5":
+            accumulators[kpi] = PI5Accumulator()
+        else:
+            raise ValueError(f"Indicador desconhecido: {kpi!r}")
+
+    for chunk in iter_chunks(source, chunksize, required_columns(kpis)):
+        if context is not None:
+            chunk = select_context(chunk, context)
+
+        for accumulator in accumulators.values():
+            accumulator.update(chunk)
+
+    return accumulators
+
+
+def stream_kpis(source, kpis=ALL_KPIS, **kwargs) -> dict:
+    """
+    Calcula os indicadores pedidos numa única leitura por blocos
+    (argumentos de stream_accumulators).
+
+    Devolve {"pi1": {...}, ...} com as mesmas chaves de src.kpis.
+    """
+
+    accumulators = stream_accumulators(source, kpis, **kwargs)
+
+    return {kpi: acc.result() for kpi, acc in accumulators.items()}
@@ -0,0 +1,229 @@
+# =====================================================
+# DADOS SINTÉTICOS — TRACKING DE ANDEBOL REPRODUZÍVEL
+# =====================================================
+#
+# Gera dados com o formato de handball_X_* (#x{i}, #y{i}, #vx{i},
+# #vy{i}, #ball_x, #ball_y, coordenadas normalizadas em [0, 1]) e
+# handball_y_* (uma label por frame), de 10k a dezenas de milhões de
+# frames, por blocos de memória constante.
+#
+# Movimento: a velocidade de cada jogador/bola é ruído gaussiano
+# suavizado (média móvel), integrado e refletido nas linhas do campo;
+# #vx/#vy são a derivada exata das posições geradas. O resultado só
+# depende de (n_frames, n_players, seed), não do tamanho dos blocos.
+#
+# Uso: python -m src.synthetic data/raw --frames 1000000
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data_loading import DATASET_FILES
+
+
+# frames por segundo (as velocidades vêm em unidades de campo / s)
+FPS = 25
+
+# blocos internos de geração (fixos: garantem o determinismo)
+BLOCK = 100_000
+
+# janela da média móvel que suaviza as acelerações (frames)
+SMOOTHING = 25
+
+# deslocação típica por segundo (fração do campo)
+PLAYER_SPEED = 0.08
+GOALKEEPER_SPEED = 0.04
+BALL_SPEED = 0.25
+
+SYNTHETIC_LABELS = ["Ataque", "Defesa", "Transição"]
+
+
+def _fold(values: np.ndarray) -> np.ndarray:
+    """Reflete valores sem limites para [0, 1] (ricochete nas linhas)."""
+    return 1 - np.abs(np.mod(values, 2) - 1)
+
+
+def _speed_scales(n_players: int) -> np.ndarray:
+    scales = np.full(n_players + 1, PLAYER_SPEED)
+    if n_players:
+        scales[0] = GOALKEEPER_SPEED
+    scales[-1] = BALL_SPEED
+    return scales
+
+
+def _columns(n_players: int) -> list[str]:
+    columns = []
+    for i in range(n_players):
+        columns += [f"#x{i}", f"#y{i}", f"#vx{i}", f"#vy{i}"]
+    return columns + ["#ball_x", "#ball_y"]
+
+
+def _blocks(n_frames: int, n_players: int, seed: int):
+    """Blocos (≤ BLOCK frames) da matriz float32 do dataset."""
+
+    seeds = np.random.SeedSequence(seed)
+    n_entities = n_players + 1  # jogadores + bola
+    scales = _speed_scales(n_players)[:, None]
+    step = 1 / FPS
+
+    init_seed, *block_seeds = seeds.spawn(-(-n_frames // BLOCK) + 1)
+    position = np.random.default_rng(init_seed).random((n_entities, 2)) * 2
+    history = np.zeros((SMOOTHING - 1, n_entities, 2))
+    previous = _fold(position)
+
+    for b, block_seed in enumerate(block_seeds):
+        n = min(BLOCK, n_frames - b * BLOCK)
+        noise = np.random.default_rng(block_seed).standard_normal(
+            (n, n_entities, 2)
+        )
+
+        # média móvel, continuada a partir do fim do bloco anterior
+        padded = np.concatenate([history, noise])
+        cumulative = np.cumsum(padded, axis=0)
+        cumulative[SMOOTHING:] -= cumulative[:-SMOOTHING].copy()
+        velocity = cumulative[SMOOTHING - 1:] / np.sqrt(SMOOTHING)
+        history = padded[-(SMOOTHING - 1):]
+
+        # integrar, refletir nas linhas e derivar (velocidade observada)
+        unfolded = position + np.cumsum(velocity * scales * step, axis=0)
+        position = unfolded[-1]
+        folded = _fold(unfolded)
+        observed = np.diff(folded, axis=0, prepend=previous[None]) / step
+        previous = folded[-1]
+
+        data = np.empty((n, 4 * n_players + 2), dtype=np.float32)
+        players = np.concatenate([folded[:, :-1], observed[:, :-1]], axis=2)
+        data[:, :-2] = players.reshape(n, -1)
+        data[:, -2:] = folded[:, -1]
+
+        yield data
+
+
+def iter_synthetic_tracking(
+    n_frames: int,
+    n_players: int = 14,
+    seed: int = 0,
+    chunksize: int = BLOCK
+):
+    """
+    Gera o dataset em DataFrames float32 de até `chunksize` linhas
+    (memória constante, independente de n_frames).
+    """
+
+    columns = _columns(n_players)
+    pending, n_pending = [], 0
+
+    for data in _blocks(n_frames, n_players, seed):
+        pending.append(data)
+        n_pending += len(data)
+
+        while n_pending >= chunksize:
+            merged = np.concatenate(pending)
+            yield pd.DataFrame(merged[:chunksize], columns=columns)
+            pending = [merged[chunksize:]]
+            n_pending = len(pending[0])
+
+    if n_pending:
+        yield pd.DataFrame(np.concatenate(pending), columns=columns)
+
+
+def synthetic_tracking(
+    n_frames: int,
+    n_players: int = 14,
+    seed: int = 0
+) -> pd.DataFrame:
+    """Dataset completo em memória (float32), como handball_X_*."""
+
+    chunks = list(
+        iter_synthetic_tracking(n_frames, n_players, seed, chunksize=n_frames)
+    )
+    if not chunks:
+        return pd.DataFrame(columns=_columns(n_players), dtype=np.float32)
+
+    return chunks[0]
+
+
+def synthetic_labels(
+    n_frames: int,
+    seed: int = 0,
+    labels=SYNTHETIC_LABELS,
+    mean_run: int = 250
+) -> pd.DataFrame:
+    """
+    Labels por frame (coluna 'label'), como handball_y_*: sequências de
+    ~mean_run frames seguidos com a mesma label.
+    """
+
+    rng = np.random.default_rng(np.random.SeedSequence([seed, 1]))
+
+    n_runs = max(1, 2 * n_frames // mean_run + 1)
+    lengths = rng.geometric(1 / mean_run, n_runs)
+    while lengths.sum() < n_frames:
+        more = rng.geometric(1 / mean_run, n_runs)
+        lengths = np.concatenate([lengths, more])
+
+    codes = np.repeat(rng.integers(0, len(labels), len(lengths)), lengths)
+
+    return pd.DataFrame({
+        "label": pd.Categorical.from_codes(codes[:n_frames], list(labels))
+    })
+
+
+def write_synthetic_dataset(
+    raw_path: Path,
+    n_frames: int,
+    n_players: int = 14,
+    seed: int = 0,
+    splits=("train", "test"),
+    chunksize: int = BLOCK
+) -> list[Path]:
+    """
+    Escreve handball_X_<split>.csv e handball_y_<split>.csv em raw_path,
+    por blocos. Cada split usa uma seed diferente.
+    """
+
+    raw_path = Path(raw_path)
+    raw_path.mkdir(parents=True, exist_ok=True)
+    written = []
+
+    for k, split in enumerate(splits):
+        x_path = raw_path / DATASET_FILES[f"X_{split}"]
+        y_path = raw_path / DATASET_FILES[f"y_{split}"]
+
+        chunks = iter_synthetic_tracking(
+            n_frames, n_players, seed + k, chunksize
+        )
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(
+                x_path,
+                mode="w" if i == 0 else "a",
+                header=i == 0,
+                index=False
+            )
+
+        synthetic_labels(n_frames, seed + k).to_csv(y_path, index=False)
+        written += [x_path, y_path]
+
+    return written
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Gera datasets sintéticos de tracking de andebol."
+    )
+    parser.add_argument("raw_path", type=Path)
+    parser.add_argument("--frames", type=int, default=100_000)
+    parser.add_argument("--players", type=int, default=14)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for path in write_synthetic_dataset(
+        args.raw_path, args.frames, args.players, args.seed
+    ):
+        print(f">>> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,32 @@
 # =====================================================
 # VISUALIZAÇÕES — DIGITAL GOALKEEPER
 # =====================================================
+#
+# matplotlib, plotly e pandas são importados dentro de cada função:
+# juntos custam ~1.5 s e as páginas iniciais do dashboard não desenham
+# gráficos (src/warmup.py pré-importa-os em segundo plano).
 
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
 import numpy as np
-from scipy.stats import gaussian_kde
+
+from src.decimation import MAX_POINTS, decimate_series, minmax_envelope
+from src.density import binned_kde
+from src.instrumentation import instrument
 
 
 # =====================================================
 # PI 1 — Distribuição Posicional do Guarda-Redes (STREAMLIT SAFE)
 # =====================================================
-def plot_pi1_positional_distribution(positions, mean_position):
-    import numpy as np
+@instrument("visualizations.pi1")
+def plot_pi1_positional_distribution(positions, mean_position, density=None):
+    """
+    PI 1 — Distribuição Posicional do Guarda-Redes
+
+    `density` é o resultado de src.density.binned_kde; pode ser
+    calculado (e guardado em cache) à parte. Se omitido, é calculado
+    aqui sobre todas as posições.
+    """
+
     import matplotlib.pyplot as plt
-    from scipy.stats import gaussian_kde
 
     x = positions["#x0"].dropna().values
     y = positions["#y0"].dropna().values
@@ -26,38 +36,22 @@ def plot_pi1_positional_distribution(positions, mean_position):
     ax.set_facecolor("#0E0E0E")
 
     # --------------------------------------------------
-    # 🔹 SUBAMOSTRAGEM (CRÍTICO)
-    # --------------------------------------------------
-    MAX_POINTS = 3000
-    if len(x) > MAX_POINTS:
-        idx = np.random.choice(len(x), MAX_POINTS, replace=False)
-        x = x[idx]
-        y = y[idx]
-
-    # --------------------------------------------------
-    # 🔹 KDE ROBUSTO
+    # 🔹 KDE BINNED (todos os frames, determinístico)
     # --------------------------------------------------
     try:
-        values = np.vstack([x, y])
-        kde = gaussian_kde(values, bw_method=0.25)
-
-        xi, yi = np.mgrid[
-            x.min():x.max():120j,
-            y.min():y.max():120j
-        ]
-        zi = kde(np.vstack([xi.flatten(), yi.flatten()]))
-        zi = zi.reshape(xi.shape)
+        if density is None:
+            density = binned_kde(x, y)
 
         ax.imshow(
-            zi.T,
+            density["density"].T,
             origin="lower",
             cmap="turbo",
-            extent=[x.min(), x.max(), y.min(), y.max()],
+            extent=density["extent"],
             alpha=0.95
         )
 
-    except Exception:
-        # Fallback seguro
+    except ValueError:
+        # Fallback seguro (poucos pontos ou sem dispersão)
         ax.scatter(x, y, s=4, alpha=0.35, color="#4C78A8")
 
     # --------------------------------------------------
@@ -95,21 +89,51 @@ def plot_pi1_positional_distribution(positions, mean_position):
     return fig
 
 
-
-
-
 # =====================================================
 # PI 2 — Distância Percorrida
 # =====================================================
-def plot_pi2_distance_travelled(distances):
-    """PI 2 — Distância Percorrida (acumulada)"""
+@instrument("visualizations.pi2")
+def plot_pi2_distance_travelled(
+    distances,
+    max_points: int = MAX_POINTS,
+    renderer: str = "matplotlib",
+    points=None
+):
+    """
+    PI 2 — Distância Percorrida (acumulada)
+
+    A série é reduzida a max_points pontos (LTTB) antes de desenhar.
+    `points` = (x, y) já reduzidos (PI2Result.decimated()) dispensa a
+    série completa. renderer="plotly" devolve uma figura Plotly WebGL
+    (Scattergl).
+    """
+
+    if points is None:
+        points = decimate_series(np.cumsum(distances), max_points)
+    x, y = points
+
+    title = "PI 2 – Distância Percorrida pelo Guarda-Redes"
 
-    cumulative_distance = np.cumsum(distances)
+    if renderer == "plotly":
+        import plotly.graph_objects as go
+
+        fig = go.Figure(
+            go.Scattergl(x=x, y=y, mode="lines", line=dict(color="blue"))
+        )
+        fig.update_layout(
+            title=title,
+            xaxis_title="Instante (frames)",
+            yaxis_title="Distância acumulada",
+            template="plotly_dark"
+        )
+        return fig
+
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots(figsize=(8, 4))
-    ax.plot(cumulative_distance, color="blue")
+    ax.plot(x, y, color="blue")
 
-    ax.set_title("PI 2 – Distância Percorrida pelo Guarda-Redes")
+    ax.set_title(title)
     ax.set_xlabel("Instante (frames)")
     ax.set_ylabel("Distância acumulada")
 
@@ -119,9 +143,12 @@ def plot_pi2_distance_travelled(distances):
 # =====================================================
 # PI 3 — Frequência de Ameaças por Zona (ESTÁTICO – LEGADO)
 # =====================================================
+@instrument("visualizations.pi3")
 def plot_pi3_threat_frequency(heatmap: np.ndarray):
     """PI 3 — Frequência de Ameaças por Zona (matplotlib)"""
 
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(6, 6))
 
     im = ax.imshow(
@@ -143,6 +170,7 @@ def plot_pi3_threat_frequency(heatmap: np.ndarray):
 # =====================================================
 # PI 3 — Origem Espacial das Ameaças Ofensivas (INTERATIVO)
 # =====================================================
+@instrument("visualizations.pi3_interactive")
 def plot_pi3_threat_frequency_interactive(heatmap: np.ndarray):
     """
     PI 3 — Origem Espacial das Ameaças Ofensivas (Campo)
@@ -150,6 +178,9 @@ def plot_pi3_threat_frequency_interactive(heatmap: np.ndarray):
     Contexto: Pós-Jogo
     """
 
+    import pandas as pd
+    import plotly.express as px
+
     # Evitar log(0)
     heatmap_safe = np.where(heatmap <= 0, 1, heatmap)
     heatmap_log = np.log10(heatmap_safe)
@@ -223,22 +254,92 @@ def plot_pi3_threat_frequency_interactive(heatmap: np.ndarray):
 # =====================================================
 # PI 4 — Intensidade de Reação
 # =====================================================
+@instrument("visualizations.pi4")
 def plot_pi4_reaction_intensity(
     speeds,
     mean_speed,
-    max_speed
+    max_speed,
+    max_points: int = MAX_POINTS,
+    renderer: str = "matplotlib",
+    points=None,
+    envelope=None
 ):
-    """PI 4 — Intensidade de Reação do Guarda-Redes"""
+    """
+    PI 4 — Intensidade de Reação do Guarda-Redes
+
+    Séries maiores do que max_points são desenhadas como envelope
+    mín/máx por bucket (todos os picos visíveis) com a linha LTTB por
+    cima. Com `points` (e `envelope`) já reduzidos (PI4Result) a série
+    completa não é usada. renderer="plotly" devolve uma figura Plotly
+    WebGL (Scattergl).
+    """
+
+    if points is None:
+        speeds = np.asarray(speeds)
+        points = decimate_series(speeds, max_points)
+        envelope = (
+            minmax_envelope(speeds, max_points // 2)
+            if len(speeds) > max_points else None
+        )
+    x, y = points
+
+    title = "PI 4 – Intensidade de Reação do Guarda-Redes"
+    mean_label = f"Velocidade média ({mean_speed:.2f})"
+    max_label = f"Velocidade máxima ({max_speed:.2f})"
+
+    if renderer == "plotly":
+        import plotly.graph_objects as go
+
+        fig = go.Figure()
+
+        if envelope is not None:
+            env_x, lo, hi = envelope
+            fig.add_trace(go.Scattergl(
+                x=np.concatenate([env_x, env_x[::-1]]),
+                y=np.concatenate([hi, lo[::-1]]),
+                fill="toself",
+                fillcolor="rgba(76,120,168,0.25)",
+                line=dict(width=0),
+                hoverinfo="skip",
+                name="Envelope mín/máx"
+            ))
+
+        fig.add_trace(go.Scattergl(
+            x=x, y=y, mode="lines", opacity=0.6,
+            name="Velocidade instantânea"
+        ))
+        fig.add_hline(
+            y=mean_speed, line=dict(color="green", dash="dash", width=2),
+            annotation_text=mean_label
+        )
+        fig.add_hline(
+            y=max_speed, line=dict(color="red", dash="dot", width=2),
+            annotation_text=max_label
+        )
+        fig.update_layout(
+            title=title,
+            xaxis_title="Instante (frames)",
+            yaxis_title="Velocidade",
+            template="plotly_dark"
+        )
+        return fig
+
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots(figsize=(8, 4))
-    ax.plot(speeds, alpha=0.6, label="Velocidade instantânea")
+
+    if envelope is not None:
+        env_x, lo, hi = envelope
+        ax.fill_between(env_x, lo, hi, alpha=0.25, linewidth=0)
+
+    ax.plot(x, y, alpha=0.6, label="Velocidade instantânea")
 
     ax.axhline(
         mean_speed,
         color="green",
         linestyle="--",
         linewidth=2,
-        label=f"Velocidade média ({mean_speed:.2f})"
+        label=mean_label
     )
 
     ax.axhline(
@@ -246,10 +347,10 @@ def plot_pi4_reaction_intensity(
         color="red",
         linestyle=":",
         linewidth=2,
-        label=f"Velocidade máxima ({max_speed:.2f})"
+        label=max_label
     )
 
-    ax.set_title("PI 4 – Intensidade de Reação do Guarda-Redes")
+    ax.set_title(title)
     ax.set_xlabel("Instante (frames)")
     ax.set_ylabel("Velocidade")
     ax.legend()
@@ -260,6 +361,7 @@ def plot_pi4_reaction_intensity(
 # =====================================================
 # PI 5 — CANAL DE PROGRESSÃO DAS AMEAÇAS (FINAL)
 # =====================================================
+@instrument("visualizations.pi5")
 def plot_pi5_threat_progression_channels(pi5_data: dict):
     """
     PI 5 — Canal de Progressão das Ameaças Ofensivas
@@ -267,11 +369,16 @@ def plot_pi5_threat_progression_channels(pi5_data: dict):
     Contexto: Pós-Jogo
     """
 
-    channels = ["Esquerdo", "Central", "Direito"]
+    import plotly.graph_objects as go
+
+    channels = list(pi5_data["counts"])
     counts = [pi5_data["counts"][c] for c in channels]
     percentages = [pi5_data["percentages"][c] for c in channels]
 
-    colors = ["#4C78A8", "#54A24B", "#4C78A8"]
+    # canal central destacado (N ímpar de canais)
+    colors = ["#4C78A8"] * len(channels)
+    if len(channels) % 2 == 1:
+        colors[len(channels) // 2] = "#54A24B"
 
     fig = go.Figure(
         data=[
@@ -0,0 +1,81 @@
+# =====================================================
+# AQUECIMENTO EM SEGUNDO PLANO — IMPORTS, DADOS E KPIs
+# =====================================================
+#
+# As páginas iniciais do dashboard (boas-vindas, persona, login) não
+# precisam de dados nem de gráficos, mas o utilizador passa lá alguns
+# segundos. Warmup aproveita esse tempo: corre, numa thread daemon, as
+# tarefas que o dashboard faria no primeiro acesso (importar o stack de
+# gráficos, carregar o dataset, calcular os KPIs do intervalo por
+# defeito), para que o primeiro gráfico use resultados já em cache.
+#
+# Cada tarefa é medida como etapa "warmup.<nome>" (src.instrumentation).
+# Uma tarefa que falhe não interrompe as seguintes: o erro fica em
+# `errors` e o dashboard volta a tentar pelo caminho normal.
+
+import importlib
+import threading
+
+from src.instrumentation import stage
+
+
+# módulos pesados usados apenas pelas figuras do dashboard
+PLOTTING_MODULES = [
+    "pandas",
+    "matplotlib.pyplot",
+    "plotly.express",
+    "plotly.graph_objects",
+    "src.visualizations",
+]
+
+
+def preload(modules=PLOTTING_MODULES) -> None:
+    """Importa `modules` (ficam em sys.modules para os imports locais)."""
+
+    for name in modules:
+        importlib.import_module(name)
+
+
+class Warmup:
+    """
+    Executa tarefas (nome, função sem argumentos) por ordem numa thread.
+
+        warmup = Warmup([("imports", preload), ("data", load)]).start()
+        warmup.wait()   # no primeiro acesso que precise dos resultados
+    """
+
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+        self.errors = {}
+        self._done = threading.Event()
+        self._thread = None
+
+    def _run(self) -> None:
+        try:
+            for name, task in self.tasks:
+                try:
+                    with stage(f"warmup.{name}"):
+                        task()
+                except Exception as exc:  # repetido no caminho normal
+                    self.errors[name] = exc
+        finally:
+            self._done.set()
+
+    def start(self) -> "Warmup":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="dg-warmup", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Espera pelo fim das tarefas; False se expirar o timeout."""
+
+        if self._thread is None:
+            return True
+        return self._done.wait(timeout)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
@@ -0,0 +1,397 @@
+# =====================================================
+# ÍNDICE ESPACIAL — FRAMES POR ZONA DO CAMPO (CSR)
+# =====================================================
+#
+# "Em que frames esteve a bola na zona Z?" sem percorrer o dataset:
+# numa grelha fina (CourtGrid, por defeito 64 × 64 sobre a extensão
+# dos dados), cada célula guarda os índices dos seus frames, por ordem:
+#
+#   frames[indptr[c]:indptr[c + 1]]  ->  frames na célula c (ordenados)
+#
+# Uma consulta (retângulo, raio, polígono ou célula de um heatmap)
+# junta as células totalmente dentro da zona e filtra apenas as da
+# fronteira pelas coordenadas exatas; um intervalo de frames é aplicado
+# por célula com searchsorted. O índice é gravado ao lado da cache
+# colunar do dataset (data/processed/cache/<split>/zones_<objeto>/) e
+# aberto por memory-map.
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.column_store import ColumnStore
+from src.data_loading import (
+    DATA_CACHE_PATH,
+    DATA_RAW_PATH,
+    DATASET_FILES,
+    ensure_cache,
+)
+from src.heatmap import CourtGrid, grid_from_data
+
+
+# objeto seguido -> colunas (x, y)
+ZONE_OBJECTS = {
+    "ball": ("#ball_x", "#ball_y"),
+    "goalkeeper": ("#x0", "#y0"),
+}
+
+# resolução por defeito da grelha do índice
+INDEX_BINS = 64
+
+# Incrementar sempre que o formato do índice mudar
+ZONE_INDEX_VERSION = 1
+
+
+class ZoneIndex:
+    """
+    Frames por célula de `grid` (CSR) para as posições (x, y).
+
+    As consultas devolvem arrays ordenados de índices de frame
+    (posições nas colunas), opcionalmente limitados a [start, end).
+    """
+
+    def __init__(self, grid, indptr, frames, x, y):
+        self.grid = grid
+        self.indptr = indptr
+        self.frames = frames
+        self.x = x
+        self.y = y
+
+    @classmethod
+    def build(cls, x, y, grid: CourtGrid | None = None) -> "ZoneIndex":
+        x, y = np.asarray(x), np.asarray(y)
+        if grid is None:
+            grid = grid_from_data(x, y, INDEX_BINS, INDEX_BINS)
+
+        cells = grid.cell_ids(x, y)
+        dtype = np.int32 if len(cells) < 2**31 else np.int64
+
+        # ordenação estável: os frames de cada célula ficam por ordem
+        order = np.argsort(cells, kind="stable").astype(dtype)
+        n_outside = np.count_nonzero(cells < 0)
+        counts = np.bincount(cells[cells >= 0], minlength=grid.n_cells)
+
+        indptr = np.zeros(grid.n_cells + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+
+        return cls(grid, indptr, order[n_outside:], x, y)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    # --------------------------------------------------
+    # CÉLULAS CANDIDATAS
+    # --------------------------------------------------
+    def _cell_range(self, lo: float, hi: float, edges, n_bins: int):
+        if hi < edges[0] or lo > edges[-1]:
+            return np.arange(0)
+
+        i0 = np.searchsorted(edges, lo, side="right") - 1
+        i1 = np.searchsorted(edges, hi, side="right") - 1
+        return np.arange(max(i0, 0), min(i1, n_bins - 1) + 1)
+
+    def _cells_in_box(self, x_range, y_range):
+        """(ix, iy) das células que intersetam o retângulo."""
+
+        grid = self.grid
+        ix = self._cell_range(*x_range, grid.x_edges, grid.bins_x)
+        iy = self._cell_range(*y_range, grid.y_edges, grid.bins_y)
+        ix, iy = np.meshgrid(ix, iy, indexing="ij")
+
+        return ix.ravel(), iy.ravel()
+
+    def _collect(self, cells, start: int, end: int | None) -> list:
+        """Frames de cada célula, limitados a [start, end)."""
+
+        end = len(self) if end is None else end
+        parts = []
+
+        for c in cells:
+            frames = self.frames[self.indptr[c]:self.indptr[c + 1]]
+            lo, hi = np.searchsorted(frames, [start, end])
+            if hi > lo:
+                parts.append(frames[lo:hi])
+
+        return parts
+
+    def _query(self, inside, boundary, contains, start, end) -> np.ndarray:
+        """
+        Frames das células `inside` (todas) e das células `boundary`
+        filtradas por contains(x, y).
+        """
+
+        parts = self._collect(inside, start, end)
+
+        candidates = self._collect(boundary, start, end)
+        if candidates:
+            candidates = np.concatenate(candidates)
+            keep = contains(self.x[candidates], self.y[candidates])
+            parts.append(candidates[keep])
+
+        if not parts:
+            return np.zeros(0, dtype=self.frames.dtype)
+
+        return np.sort(np.concatenate(parts))
+
+    # --------------------------------------------------
+    # CONSULTAS
+    # --------------------------------------------------
+    def rectangle(
+        self,
+        x_range: tuple[float, float],
+        y_range: tuple[float, float],
+        start: int = 0,
+        end: int | None = None
+    ) -> np.ndarray:
+        """Frames com x0 <= x < x1 e y0 <= y < y1."""
+
+        (x0, x1), (y0, y1) = x_range, y_range
+        ix, iy = self._cells_in_box(x_range, y_range)
+
+        ex, ey = self.grid.x_edges, self.grid.y_edges
+        full = (
+            (ex[ix] >= x0) & (ex[ix + 1] < x1)
+            & (ey[iy] >= y0) & (ey[iy + 1] < y1)
+        )
+        cells = ix * self.grid.bins_y + iy
+
+        return self._query(
+            cells[full], cells[~full],
+            lambda x, y: (x >= x0) & (x < x1) & (y >= y0) & (y < y1),
+            start, end
+        )
+
+    def radius(
+        self,
+        center: tuple[float, float],
+        r: float,
+        start: int = 0,
+        end: int | None = None
+    ) -> np.ndarray:
+        """Frames a distância <= r de center."""
+
+        cx, cy = center
+        ix, iy = self._cells_in_box((cx - r, cx + r), (cy - r, cy + r))
+
+        # célula convexa: dentro do círculo se os 4 cantos estiverem
+        ex, ey = self.grid.x_edges, self.grid.y_edges
+        dx = np.maximum(np.abs(ex[ix] - cx), np.abs(ex[ix + 1] - cx))
+        dy = np.maximum(np.abs(ey[iy] - cy), np.abs(ey[iy + 1] - cy))
+        full = dx**2 + dy**2 <= r**2
+        cells = ix * self.grid.bins_y + iy
+
+        return self._query(
+            cells[full], cells[~full],
+            lambda x, y: (x - cx) ** 2 + (y - cy) ** 2 <= r**2,
+            start, end
+        )
+
+    def polygon(
+        self,
+        vertices,
+        start: int = 0,
+        end: int | None = None
+    ) -> np.ndarray:
+        """Frames dentro do polígono (lista de (x, y); regra par-ímpar)."""
+
+        vertices = np.asarray(vertices, dtype=np.float64)
+        if vertices.ndim != 2 or len(vertices) < 3:
+            raise ValueError("O polígono precisa de pelo menos 3 vértices.")
+
+        ix, iy = self._cells_in_box(
+            (vertices[:, 0].min(), vertices[:, 0].max()),
+            (vertices[:, 1].min(), vertices[:, 1].max())
+        )
+        cells = ix * self.grid.bins_y + iy
+
+        # polígono possivelmente não convexo: todas as células filtradas
+        return self._query(
+            cells[:0], cells,
+            lambda x, y: points_in_polygon(x, y, vertices),
+            start, end
+        )
+
+    def heatmap_cell(
+        self,
+        grid: CourtGrid,
+        ix: int,
+        iy: int,
+        start: int = 0,
+        end: int | None = None
+    ) -> np.ndarray:
+        """
+        Frames contados na célula (ix, iy) de um heatmap do PI 3 feito
+        com `grid` (mesma convenção de arestas de CourtGrid.cell_ids).
+        """
+
+        if not (0 <= ix < grid.bins_x and 0 <= iy < grid.bins_y):
+            raise ValueError(f"Célula ({ix}, {iy}) fora da grelha.")
+
+        x_range = grid.x_edges[ix], grid.x_edges[ix + 1]
+        y_range = grid.y_edges[iy], grid.y_edges[iy + 1]
+        cx, cy = self._cells_in_box(x_range, y_range)
+        cells = cx * self.grid.bins_y + cy
+        target = ix * grid.bins_y + iy
+
+        return self._query(
+            cells[:0], cells,
+            lambda x, y: grid.cell_ids(x, y) == target,
+            start, end
+        )
+
+    # --------------------------------------------------
+    # PERSISTÊNCIA
+    # --------------------------------------------------
+    def save(self, index_dir: Path, source: dict | None = None) -> None:
+        """Grava indptr/frames (.npy) e meta.json (escrito por último)."""
+
+        index_dir = Path(index_dir)
+        index_dir.mkdir(parents=True, exist_ok=True)
+
+        # invalidar antes de reescrever os arrays
+        (index_dir / "meta.json").unlink(missing_ok=True)
+
+        np.save(index_dir / "indptr.npy", self.indptr, allow_pickle=False)
+        np.save(index_dir / "frames.npy", self.frames, allow_pickle=False)
+
+        grid = self.grid
+        meta = {
+            "version": ZONE_INDEX_VERSION,
+            "source": source,
+            "n_rows": len(self),
+            "grid": {
+                "x_range": list(grid.x_range),
+                "y_range": list(grid.y_range),
+                "bins_x": grid.bins_x,
+                "bins_y": grid.bins_y,
+            },
+        }
+
+        tmp = index_dir / "meta.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, index_dir / "meta.json")
+
+    @classmethod
+    def load(cls, index_dir: Path, x, y) -> "ZoneIndex":
+        """Abre um índice gravado (memory-map) sobre as colunas x, y."""
+
+        index_dir = Path(index_dir)
+        with open(index_dir / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        grid = meta["grid"]
+        return cls(
+            CourtGrid(
+                tuple(grid["x_range"]),
+                tuple(grid["y_range"]),
+                grid["bins_x"],
+                grid["bins_y"]
+            ),
+            np.load(index_dir / "indptr.npy", mmap_mode="r"),
+            np.load(index_dir / "frames.npy", mmap_mode="r"),
+            x,
+            y
+        )
+
+
+# ==================================================
+# GEOMETRIA E SEQUÊNCIAS
+# ==================================================
+def points_in_polygon(x, y, vertices) -> np.ndarray:
+    """Ponto-em-polígono vetorizado (ray casting, regra par-ímpar)."""
+
+    x, y = np.asarray(x), np.asarray(y)
+    inside = np.zeros(len(x), dtype=bool)
+
+    x0, y0 = vertices[-1]
+    for x1, y1 in vertices:
+        crosses = (y1 > y) != (y0 > y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_cross = x1 + (y - y1) * (x0 - x1) / (y0 - y1)
+        inside ^= crosses & (x < x_cross)
+        x0, y0 = x1, y1
+
+    return inside
+
+
+def frame_sequences(frames, max_gap: int = 1) -> pd.DataFrame:
+    """
+    Agrupa frames ordenados em sequências: um novo troço começa quando
+    o salto para o frame anterior excede max_gap.
+    """
+
+    frames = np.asarray(frames)
+    breaks = np.flatnonzero(np.diff(frames) > max_gap) + 1
+    starts = np.concatenate([[0], breaks]) if len(frames) else breaks
+    ends = np.append(breaks, len(frames))[:len(starts)]
+
+    return pd.DataFrame({
+        "start": frames[starts],
+        "end": frames[ends - 1],
+        "n_frames": ends - starts,
+    })
+
+
+# ==================================================
+# ÍNDICE PERSISTIDO AO LADO DA CACHE COLUNAR
+# ==================================================
+def _index_is_valid(meta, cache_meta, grid) -> bool:
+    if meta.get("version") != ZONE_INDEX_VERSION:
+        return False
+    if meta.get("source") != cache_meta["source"]:
+        return False
+    if meta.get("n_rows") != cache_meta["n_rows"]:
+        return False
+
+    if grid is None:
+        return True
+
+    return meta["grid"] == {
+        "x_range": list(grid.x_range),
+        "y_range": list(grid.y_range),
+        "bins_x": grid.bins_x,
+        "bins_y": grid.bins_y,
+    }
+
+
+def open_zone_index(
+    name: str = "X_train",
+    obj: str = "ball",
+    grid: CourtGrid | None = None,
+    raw_path: Path = DATA_RAW_PATH,
+    cache_root: Path = DATA_CACHE_PATH
+) -> ZoneIndex:
+    """
+    Índice espacial de `obj` ("ball" ou "goalkeeper") num split.
+    Construído na 1.ª utilização (ou quando o CSV muda) e reaberto do
+    disco nas seguintes.
+    """
+
+    if obj not in ZONE_OBJECTS:
+        raise ValueError(f"Objeto desconhecido: {obj!r}")
+
+    cache_dir, cache_meta = ensure_cache(
+        Path(raw_path) / DATASET_FILES[name], cache_root
+    )
+    store = ColumnStore.from_cache(cache_dir, cache_meta)
+    x_column, y_column = ZONE_OBJECTS[obj]
+    x, y = store[x_column], store[y_column]
+
+    index_dir = cache_dir / f"zones_{obj}"
+    try:
+        with open(index_dir / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        meta = {}
+
+    if _index_is_valid(meta, cache_meta, grid):
+        return ZoneIndex.load(index_dir, x, y)
+
+    index = ZoneIndex.build(x, y, grid)
+    index.save(index_dir, cache_meta["source"])
+
+    return index
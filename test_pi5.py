@@ -3,8 +3,8 @@ from src.preprocessing import infer_game_context
 from src.kpis import pi5_threat_progression_channels
 from src.visualizations import plot_pi5_threat_progression_channels
 
-# 1. Carregar dados
-data = load_datasets()
+# 1. Carregar dados (apenas X_train e as colunas do PI 5)
+data = load_datasets(lazy=True, kpis=["pi5"])
 X = data["X_train"]
 
 # 2. Aplicar contexto (igual ao Streamlit)